@@ -0,0 +1,5 @@
+import sys
+
+from backtester.cli import main
+
+sys.exit(main())
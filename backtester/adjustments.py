@@ -0,0 +1,129 @@
+import numpy as np
+
+
+class AdjustmentIndex:
+    """
+    Sparse index of split and dividend events on a raw price array.
+
+    Only the event bars and their factors are stored, O(events) memory; the
+    back-adjusted price of bar t is raw[t] times the product of the factors
+    of all events after t. Adjusted slices are built on request with one
+    searchsorted over the event bars, so no adjusted copy of the full
+    series has to be kept around.
+
+    An event at bar b is effective from bar b on (b is the ex-date): raw
+    prices from b on are post-split / ex-dividend. Its factor is
+    (1 - dividend * split / raw[b-1]) / split.
+
+    Args:
+        bars (np.ndarray): event bars, strictly increasing, >= 1
+        split (np.ndarray): split ratio per event (2.0 for 2-for-1, 1.0 for none)
+        dividend (np.ndarray): cash dividend per post-split share (0.0 for none)
+        factor (np.ndarray): price adjustment factor per event
+
+    Example:
+        adj = AdjustmentIndex.from_actions(raw, splits={250: 2.0}, dividends={400: 0.5})
+        adj.adjust(raw, 0, 300)          # adjusted prices of bars 0..299
+        Backtester(strategy, broker).run_array(raw, adjustments=adj)
+    """
+
+    def __init__(self, bars: np.ndarray, split: np.ndarray, dividend: np.ndarray, factor: np.ndarray):
+        self.bars = np.asarray(bars, dtype=np.int64)
+        self.split = np.asarray(split, dtype=np.float64)
+        self.dividend = np.asarray(dividend, dtype=np.float64)
+        self.factor = np.asarray(factor, dtype=np.float64)
+        if np.any(self.bars < 1) or np.any(np.diff(self.bars) <= 0):
+            raise ValueError("event bars must be >= 1 and strictly increasing")
+        if np.any(self.split <= 0):
+            raise ValueError("split ratios must be > 0")
+        if np.any(self.dividend < 0):
+            raise ValueError("dividends must be >= 0")
+        if np.any(self.factor <= 0):
+            raise ValueError("adjustment factors must be > 0 (dividend >= previous close?)")
+        # cumulative[k] = product of factors of events k..end; cumulative[-1] = 1
+        self.cumulative = np.ones(len(self.bars) + 1)
+        self.cumulative[:-1] = np.cumprod(self.factor[::-1])[::-1]
+
+    @classmethod
+    def from_actions(cls, prices: np.ndarray, splits: dict = None, dividends: dict = None) -> "AdjustmentIndex":
+        """
+        Build the index from corporate actions keyed by ex-date bar.
+
+        Args:
+            prices: raw prices; the close before each dividend sets its factor
+            splits (dict): bar -> split ratio
+            dividends (dict): bar -> cash dividend per (post-split) share
+
+        Returns:
+            AdjustmentIndex
+        """
+        splits = splits or {}
+        dividends = dividends or {}
+        bars = np.array(sorted(set(splits) | set(dividends)), dtype=np.int64)
+        split = np.array([splits.get(bar, 1.0) for bar in bars], dtype=np.float64)
+        dividend = np.array([dividends.get(bar, 0.0) for bar in bars], dtype=np.float64)
+        factor = 1.0 / split
+        if np.any(dividend > 0):
+            if np.any(bars < 1) or np.any(bars >= len(prices)):
+                raise ValueError("event bars must lie within the price series")
+            previous = np.asarray(prices, dtype=np.float64)[bars - 1]
+            factor = (1.0 - dividend * split / previous) / split
+        return cls(bars, split, dividend, factor)
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def factors(self, start: int, stop: int) -> np.ndarray:
+        """Cumulative adjustment factor of bars start..stop-1."""
+        # events strictly after bar t apply to it
+        return self.cumulative[np.searchsorted(self.bars, np.arange(start, stop), side='right')]
+
+    def adjust(self, prices: np.ndarray, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Back-adjusted prices for bars start..stop-1 of a raw price array.
+
+        Only the requested slice is materialized.
+
+        Args:
+            prices: raw prices, shape (n,) or (n, k)
+            start (int): first bar (default 0)
+            stop (int): end bar, exclusive (default len(prices))
+
+        Returns:
+            np.ndarray of float64 adjusted prices
+        """
+        prices = np.asarray(prices)
+        stop = len(prices) if stop is None else stop
+        factors = self.factors(start, stop)
+        return prices[start:stop] * factors.reshape((-1,) + (1,) * (prices.ndim - 1))
+
+    def adjust_returns(self, returns: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """
+        Turn simple returns of raw prices into those of the adjusted prices, in place.
+
+        Adjusted and raw prices differ by a factor that is constant between
+        events, so only the return into an event bar b changes: it becomes
+        raw[b] / (raw[b-1] * factor) - 1. That is O(events) work instead of
+        an adjusted copy of the whole series; the result equals the returns
+        of adjust(prices) up to rounding.
+
+        Args:
+            returns: returns of the raw prices (returns[t] = raw[t] / raw[t-1] - 1),
+                shape (n,) or (n, k)
+            prices: the raw prices, same shape
+
+        Returns:
+            returns, with the event bars replaced
+        """
+        k = self.events(0, len(prices))
+        bars = self.bars[k]
+        factor = self.factor[k].reshape((-1,) + (1,) * (prices.ndim - 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[bars] = prices[bars] / (prices[bars - 1] * factor) - 1.0
+        return returns
+
+    def events(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Positions (into bars/split/dividend) of the events with start <= bar < stop."""
+        lo = np.searchsorted(self.bars, start, side='left')
+        hi = len(self.bars) if stop is None else np.searchsorted(self.bars, stop, side='left')
+        return np.arange(lo, hi)
@@ -0,0 +1,330 @@
+"""
+Compressed, randomly accessible archive of backtest results.
+
+Each run's [equity, cash, position] array is stored with column-specific
+encodings instead of as raw float64/int64 columns:
+
+- position: run-length encoded (run lengths + values), since it only
+  changes on trades
+- cash: delta-coded against the trade flows implied by the positions,
+  cash[t] = cash[t-1] - (position[t] - position[t-1]) * price[t]; only
+  the bars where that does not hold exactly (bar 0, splits, dividends,
+  fills at other prices) store their cash value
+- equity: not stored; rebuilt as cash + position * price, which is how
+  the engine computes it, so it round-trips bit for bit
+- float32 runs (Backtester(dtype=np.float32)) keep their dtype; their
+  cash is the broker's float64 cash rounded per bar, which no running
+  sum replays, so it is stored at every bar where it changes instead
+- timestamp (optional): the first value in the index, then delta-coded
+  (so the deltas stay narrow)
+
+Integer streams are narrowed to the smallest dtype that fits and every
+section is zlib-compressed. Price arrays are stored once per name and
+shared by all runs over them. A footer index holds the byte offsets of
+every section, so load() reads only the requested run.
+
+File layout: MAGIC | price and run sections | footer JSON | footer offset (<Q) | MAGIC
+
+Appending never rewrites what is there: new sections and a new footer go
+after the old trailer, and readers use the last complete footer. A crash
+during an append therefore leaves the archive as it was before it.
+
+Example:
+    with ArchiveWriter("sweep.btar") as archive:
+        archive.add_prices("AAPL", prices)
+        for lookback in range(5, 200):
+            result = Backtester(VolatilityBreakoutStrategy(lookback), Broker()).run_array(prices)
+            archive.add(f"AAPL/lb{lookback}", result, prices="AAPL", meta={'lookback': lookback})
+
+    with ArchiveReader("sweep.btar") as archive:
+        result = archive.load("AAPL/lb20")
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from backtester.result import equity_of, result_dtype
+
+MAGIC = b"BTARCH01"
+_TRAILER = struct.Struct('<Q')
+
+
+class ArchiveWriter:
+    """
+    Write runs to a results archive.
+
+    Args:
+        path (str): archive file
+        append (bool): add to an existing archive instead of replacing it
+        level (int): zlib compression level (default 6)
+    """
+
+    def __init__(self, path: str, append: bool = False, level: int = 6):
+        self.path = path
+        self.level = level
+        if append and os.path.exists(path):
+            footer, _, end = _read_footer(path)
+            self._prices, self._runs = footer['prices'], footer['runs']
+            self._file = open(path, 'r+b')
+            self._file.truncate(end)  # drops only what a crashed append left unindexed
+            self._file.seek(end)
+        else:
+            self._prices, self._runs = {}, {}
+            self._file = open(path, 'wb')
+            self._file.write(MAGIC)
+        self._price_cache = {}
+
+    def add_prices(self, name: str, prices: np.ndarray) -> None:
+        """Store a price array that runs can refer to by name."""
+        if name in self._prices:
+            raise ValueError(f"Prices {name!r} already in archive")
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self._prices[name] = {'n': len(prices), 'section': self._write(prices.tobytes(), '<f8')}
+        self._price_cache[name] = prices
+
+    def add(self, key: str, result: np.ndarray, prices: str, meta: dict = None) -> None:
+        """
+        Encode and append one run.
+
+        Args:
+            key (str): unique run name
+            result: structured array from Backtester.run_array()
+            prices (str): name of the price array (see add_prices) it was run on
+            meta (dict): optional JSON-serializable metadata, e.g. parameters
+
+        Raises:
+            ValueError: on a duplicate key, unknown prices, a length mismatch,
+                cash that is not float32/float64, or equity that is not
+                cash + position * price
+        """
+        if key in self._runs:
+            raise ValueError(f"Run {key!r} already in archive")
+        if prices not in self._prices:
+            raise ValueError(f"Unknown prices {prices!r}; call add_prices() first")
+        price = self._load_prices(prices)
+        if len(result) != len(price):
+            raise ValueError("result and prices differ in length")
+        dtype = result.dtype['cash']
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"cash must be float32 or float64, not {dtype}")
+        position = np.asarray(result['position'], dtype=np.int64)
+        cash = np.ascontiguousarray(result['cash'])
+        if not np.array_equal(_view(equity_of(cash, position, price)), _view(result['equity'])):
+            raise ValueError("equity is not cash + position * price; cannot rebuild it")
+
+        # position: run lengths + values
+        starts = np.flatnonzero(np.diff(position, prepend=position[:1] - 1))
+        sections = {
+            'run_lengths': self._write_ints(np.diff(starts, append=len(position))),
+            'run_values': self._write_ints(position[starts]),
+        }
+        # cash: bars that do not follow from the previous cash and the trade flow
+        flows = _flows(position, price, dtype)
+        predicted = (cash[:-1] + flows[1:]).astype(dtype)
+        anchors = np.flatnonzero(np.concatenate(([True], _view(predicted) != _view(cash[1:]))))
+        sections['cash_anchors'] = self._write_ints(np.diff(anchors, prepend=0))
+        sections['cash_values'] = self._write(cash[anchors].tobytes(), dtype.newbyteorder('<').str)
+        if 'timestamp' in result.dtype.names:
+            timestamps = np.asarray(result['timestamp'], dtype=np.int64)
+            sections['timestamp'] = self._write_ints(np.diff(timestamps))
+        self._runs[key] = {'prices': prices, 'n': len(position), 'dtype': dtype.str, 'meta': meta or {},
+                           'sections': sections}
+        if 'timestamp' in sections:
+            self._runs[key]['timestamp_start'] = int(timestamps[0]) if len(timestamps) else 0
+
+    def close(self) -> None:
+        """Write the footer index and close the file."""
+        if self._file.closed:
+            return
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(json.dumps({'prices': self._prices, 'runs': self._runs}).encode())
+        self._file.write(_TRAILER.pack(offset))
+        self._file.write(MAGIC)
+        self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _load_prices(self, name):
+        if name not in self._price_cache:
+            self._price_cache[name] = _read_section(self._file, self._prices[name]['section'])
+        return self._price_cache[name]
+
+    def _write(self, raw: bytes, dtype: str) -> list:
+        """Compress and append one section; return its [offset, length, dtype] entry."""
+        data = zlib.compress(raw, self.level)
+        offset = self._file.seek(0, os.SEEK_END)  # reads of stored prices may have moved it
+        self._file.write(data)
+        return [offset, len(data), dtype]
+
+    def _write_ints(self, values: np.ndarray) -> list:
+        """Append an integer stream narrowed to the smallest dtype that holds it."""
+        if len(values):
+            dtype = np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max()))
+        else:
+            dtype = np.dtype(np.int8)
+        dtype = dtype.newbyteorder('<')
+        return self._write(values.astype(dtype).tobytes(), dtype.str)
+
+
+class ArchiveReader:
+    """
+    Random-access reader for archives written by ArchiveWriter.
+
+    Only the footer index is read on open; load() reads and decodes the
+    sections of one run (plus its prices, cached per name).
+
+    Args:
+        path (str): archive file
+
+    Raises:
+        ValueError: if the file is not a complete archive
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        footer, _, _ = _read_footer(path)
+        self._prices, self._runs = footer['prices'], footer['runs']
+        self._file = open(path, 'rb')
+        self._price_cache = {}
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._runs
+
+    def keys(self) -> list:
+        """Run keys in insertion order."""
+        return list(self._runs)
+
+    def meta(self, key: str) -> dict:
+        """Metadata stored with a run."""
+        return self._runs[key]['meta']
+
+    def prices(self, name: str) -> np.ndarray:
+        """A stored price array (cached)."""
+        if name not in self._price_cache:
+            self._price_cache[name] = _read_section(self._file, self._prices[name]['section'])
+        return self._price_cache[name]
+
+    def load(self, key: str) -> np.ndarray:
+        """
+        Decode one run.
+
+        Returns:
+            structured np.ndarray identical to what was added (including
+            its float dtype): fields [equity, cash, position], plus a
+            leading 'timestamp' if stored
+        """
+        run = self._runs[key]
+        sections = run['sections']
+        price = self.prices(run['prices'])
+        n = run['n']
+        dtype = np.dtype(run.get('dtype', '<f8'))
+        # a run's sections are contiguous: fetch them with a single read
+        lo = min(offset for offset, _, _ in sections.values())
+        hi = max(offset + length for offset, length, _ in sections.values())
+        self._file.seek(lo)
+        blob = memoryview(self._file.read(hi - lo))
+
+        def section(name):
+            offset, length, dtype = sections[name]
+            return np.frombuffer(zlib.decompress(blob[offset - lo:offset - lo + length]), dtype=dtype)
+
+        position = np.repeat(section('run_values').astype(np.int64), section('run_lengths'))
+        flows = _flows(position, price, dtype)
+        anchors = np.cumsum(section('cash_anchors'), dtype=np.int64)
+        values = section('cash_values')
+        cash = np.empty(n, dtype=dtype)
+        bounds = np.append(anchors, n)
+        for k, value in enumerate(values):
+            # replay the trade flows from each anchor: cumsum adds left to
+            # right, exactly like the broker's running cash
+            segment = flows[bounds[k]:bounds[k + 1]].copy()
+            segment[0] = value
+            np.cumsum(segment, out=cash[bounds[k]:bounds[k + 1]])
+
+        out = np.empty(n, dtype=result_dtype('timestamp' in sections, dtype))
+        out['cash'] = cash
+        out['position'] = position
+        out['equity'] = equity_of(cash, position, price)
+        if 'timestamp' in sections:
+            if 'timestamp_start' in run:
+                out['timestamp'][:1] = run['timestamp_start']
+                np.cumsum(section('timestamp'), dtype=np.int64, out=out['timestamp'][1:])
+                out['timestamp'][1:] += run['timestamp_start']
+            else:  # older archives: deltas from 0
+                out['timestamp'] = np.cumsum(section('timestamp'), dtype=np.int64)
+        return out
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _flows(position, price, dtype=np.float64):
+    """
+    Cash change implied by trading to each bar's position at its price.
+
+    All zero for float32 cash, so every change is an anchor and decoding
+    just carries each stored value forward.
+    """
+    flows = np.zeros(len(position), dtype=dtype)
+    if dtype == np.float64:
+        flows[1:] = -(np.diff(position) * price[1:])
+    return flows
+
+
+def _view(values):
+    """Bit pattern of float values, so comparisons are exact (and NaN-safe)."""
+    values = np.ascontiguousarray(values)
+    return values.view(f'i{values.dtype.itemsize}')
+
+
+def _read_section(file, section) -> np.ndarray:
+    offset, length, dtype = section
+    file.seek(offset)
+    return np.frombuffer(zlib.decompress(file.read(length)), dtype=dtype)
+
+
+def _read_footer(path):
+    """
+    Return (footer dict, footer offset, end of its trailer) of an archive file.
+
+    The last complete footer wins: normally the one at the end of the file,
+    or, after a crashed append, the one that append started from.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 2 * len(MAGIC) + _TRAILER.size:
+            raise ValueError(f"{path} is not a results archive")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a complete results archive")
+            end = size
+            while True:
+                pos = data.rfind(MAGIC, len(MAGIC) + _TRAILER.size, end)
+                if pos < 0:
+                    raise ValueError(f"{path} is not a complete results archive")
+                (offset,) = _TRAILER.unpack(data[pos - _TRAILER.size:pos])
+                if len(MAGIC) <= offset <= pos - _TRAILER.size:
+                    try:
+                        footer = json.loads(data[offset:pos - _TRAILER.size])
+                    except ValueError:
+                        footer = None
+                    if isinstance(footer, dict) and 'runs' in footer:
+                        return footer, offset, pos + len(MAGIC)
+                end = pos + len(MAGIC) - 1  # keep looking before this match
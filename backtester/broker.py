@@ -1,3 +1,8 @@
+import numpy as np
+
+from backtester.orders import OrderBook
+
+
 class Broker:
     """
     A deterministic broker for backtesting. No slippage, no fees.
@@ -5,9 +10,15 @@ class Broker:
     Tracks:
     - cash: available capital
     - position: number of shares held (can be positive or negative)
+    - orders: resting limit/stop orders (see OrderBook)
+
+    Splits and dividends are booked with apply_split()/apply_dividend().
+    With `risk` set, every market order (and order fill) is checked
+    against its pre-trade limits first.
 
     Args:
         cash (float): starting capital (default 1M)
+        risk (RiskLimits): optional pre-trade risk limits
 
     Example:
         broker = Broker(cash=10_000)
@@ -15,9 +26,11 @@ class Broker:
         # broker.cash == 9_500, broker.position == 10
     """
 
-    def __init__(self, cash: float = 1_000_000):
+    def __init__(self, cash: float = 1_000_000, risk=None):
         self.cash = cash
         self.position = 0
+        self.orders = OrderBook()
+        self.risk = risk
 
     def market_order(self, side: str, qty: int, price: float) -> None:
         """
@@ -37,6 +50,7 @@ class Broker:
         Raises:
             ValueError: if side not recognized or qty <= 0
             ValueError: if insufficient cash (BUY) or shares (SELL)
+            RiskLimitError: if the order breaches a risk limit
 
         Example:
             broker.market_order("BUY", 5, 100.0)
@@ -55,13 +69,257 @@ class Broker:
             cost = qty * price
             if cost > self.cash:
                 raise ValueError("Insufficient cash")
+            self._check_risk(qty, price)
             self.cash -= cost
             self.position += qty
         elif side == "SELL":
             # allow short selling
+            self._check_risk(-qty, price)
             self.cash += qty * price
             self.position -= qty
         else:
             raise ValueError(f"Invalid side: {side}")
 
-        # YOUR CODE ENDS HERE
\ No newline at end of file
+        # YOUR CODE ENDS HERE
+
+    def _check_risk(self, qty: int, price: float) -> None:
+        """Run the pre-trade risk check for a signed order, if limits are set."""
+        if self.risk is not None:
+            self.risk.check_order(qty, price, self.position, self.cash)
+
+    def get_state(self) -> dict:
+        """Return cash, position, resting orders and risk state (if any), e.g. for checkpointing."""
+        state = {'cash': self.cash, 'position': self.position, 'orders': self.orders.get_state()}
+        if self.risk is not None:
+            state['risk'] = self.risk.get_state()
+        return state
+
+    def set_state(self, state: dict) -> None:
+        """Restore cash, position and orders saved by get_state()."""
+        self.cash = state['cash']
+        self.position = state['position']
+        if 'orders' in state:
+            self.orders.set_state(state['orders'])
+        if self.risk is not None and 'risk' in state:
+            self.risk.set_state(state['risk'])
+
+    def apply_split(self, ratio: float, price: float) -> None:
+        """
+        Rescale the position for a stock split effective at `price`.
+
+        The new share count is truncated toward zero; the fractional share
+        is settled in cash at the (post-split) price, so equity is unchanged.
+
+        Args:
+            ratio (float): new shares per old share (2.0 for 2-for-1, 0.1 for 1-for-10)
+            price (float): post-split price used for cash in lieu
+
+        Raises:
+            ValueError: if ratio <= 0
+
+        Example:
+            broker.position = 3
+            broker.apply_split(1.5, 40.0)
+            # broker.position == 4, broker.cash += 0.5 * 40.0
+        """
+        if ratio <= 0:
+            raise ValueError("ratio must be > 0")
+        shares = self.position * ratio
+        position = int(shares)
+        self.cash += (shares - position) * price
+        self.position = position
+
+    def apply_dividend(self, amount: float) -> None:
+        """Credit a cash dividend per share held (a short position pays it)."""
+        self.cash += self.position * amount
+
+    def limit_order(self, side: str, qty: int, limit_price: float, start: int = 0) -> int:
+        """Rest a limit order; returns its id. Filled by fill_orders()."""
+        return self.orders.add(side, qty, "LIMIT", limit_price=limit_price, start=start)
+
+    def stop_order(self, side: str, qty: int, stop_price: float, start: int = 0) -> int:
+        """Rest a stop order; returns its id. Filled by fill_orders()."""
+        return self.orders.add(side, qty, "STOP", stop_price=stop_price, start=start)
+
+    def stop_limit_order(self, side: str, qty: int, stop_price: float, limit_price: float,
+                         start: int = 0) -> int:
+        """Rest a stop-limit order; returns its id. Filled by fill_orders()."""
+        return self.orders.add(side, qty, "STOP_LIMIT", limit_price=limit_price,
+                               stop_price=stop_price, start=start)
+
+    def fill_orders(self, high: np.ndarray, low: np.ndarray, open: np.ndarray = None) -> np.ndarray:
+        """
+        Match all resting orders against bar ranges and book the fills.
+
+        Fill bars are found for every order at once (OrderBook.match); only
+        the resulting fills are executed, in (bar, order id) order, with the
+        same cash/position rules as market_order(). Each order leaves the
+        book once its fill is booked: if a fill is rejected, the fills
+        before it stay booked and the rejected order and every later one
+        keep resting.
+
+        Args:
+            high: per-bar highs
+            low: per-bar lows
+            open: optional per-bar opens for gap fills
+
+        Returns:
+            structured np.ndarray of fills (order_id, bar, side, qty, price)
+
+        Raises:
+            ValueError: if a BUY fill needs more cash than available
+            RiskLimitError: if a fill breaches a risk limit
+        """
+        fills = self.orders.match(high, low, open, remove=False)
+        for fill in fills:
+            self.market_order(str(fill['side']), int(fill['qty']), float(fill['price']))
+            self.orders.cancel(int(fill['order_id']))
+        return fills
+
+
+class FixedPointBroker(Broker):
+    """
+    Broker that keeps cash as an exact int64 count of ticks.
+
+    Prices are rounded to the tick grid (half to even) on entry and every
+    fill is booked in integer ticks, so cash never drifts however many
+    fills are booked and reconciles exactly against a ledger kept in
+    cents. `cash` reads (and assigns) in currency units, so the broker is
+    a drop-in replacement for Broker in the engine.
+
+    fill_batch() books a whole array of fills with integer array
+    operations instead of one market_order() call per fill.
+
+    Args:
+        cash (float): starting capital (default 1M), rounded to ticks
+        ticks_per_unit (int): ticks per currency unit (default 100, i.e. cents)
+        risk (RiskLimits): optional pre-trade risk limits (checked per order,
+            not by fill_batch())
+
+    Example:
+        broker = FixedPointBroker(cash=10_000)
+        broker.market_order("BUY", 3, 0.1)
+        # broker.cash_ticks == 999_970, broker.cash == 9_999.7
+    """
+
+    def __init__(self, cash: float = 1_000_000, ticks_per_unit: int = 100, risk=None):
+        if ticks_per_unit <= 0:
+            raise ValueError("ticks_per_unit must be > 0")
+        self.ticks_per_unit = int(ticks_per_unit)
+        self.cash_ticks = 0
+        super().__init__(cash, risk)
+
+    @property
+    def cash(self) -> float:
+        return self.cash_ticks / self.ticks_per_unit
+
+    @cash.setter
+    def cash(self, value: float) -> None:
+        self.cash_ticks = int(self.to_ticks(value))
+
+    def to_ticks(self, price):
+        """Round a price (or array of prices) to int64 ticks, half to even."""
+        if isinstance(price, (float, int, np.floating, np.integer)):
+            # scalar fast path for per-fill calls; round() is half to even too
+            return round(float(price) * self.ticks_per_unit)
+        return np.rint(np.asarray(price, dtype=np.float64) * self.ticks_per_unit).astype(np.int64)
+
+    def get_state(self) -> dict:
+        """Return cash (in ticks), position and resting orders, e.g. for checkpointing."""
+        state = {'cash_ticks': self.cash_ticks, 'position': self.position, 'orders': self.orders.get_state()}
+        if self.risk is not None:
+            state['risk'] = self.risk.get_state()
+        return state
+
+    def set_state(self, state: dict) -> None:
+        """Restore a get_state() snapshot (a float 'cash' is accepted too)."""
+        if 'cash_ticks' in state:
+            self.cash_ticks = int(state['cash_ticks'])
+        else:
+            self.cash = state['cash']
+        self.position = state['position']
+        if 'orders' in state:
+            self.orders.set_state(state['orders'])
+        if self.risk is not None and 'risk' in state:
+            self.risk.set_state(state['risk'])
+
+    def market_order(self, side: str, qty: int, price: float) -> None:
+        """Execute a market order at `price` rounded to ticks (see Broker.market_order)."""
+        self.market_order_ticks(side, qty, round(price * self.ticks_per_unit))
+
+    def market_order_ticks(self, side: str, qty: int, price_ticks: int) -> None:
+        """
+        Execute a market order at a price already in ticks.
+
+        Same validation as Broker.market_order(); cash changes by exactly
+        qty * price_ticks ticks.
+        """
+        if qty <= 0:
+            raise ValueError("qty must be > 0")
+        cost = qty * price_ticks
+        if side == "BUY":
+            if cost > self.cash_ticks:
+                raise ValueError("Insufficient cash")
+            self._check_risk(qty, price_ticks / self.ticks_per_unit)
+            self.cash_ticks -= cost
+            self.position += qty
+        elif side == "SELL":
+            # allow short selling
+            self._check_risk(-qty, price_ticks / self.ticks_per_unit)
+            self.cash_ticks += cost
+            self.position -= qty
+        else:
+            raise ValueError(f"Invalid side: {side}")
+
+    def fill_batch(self, qty: np.ndarray, price_ticks: np.ndarray) -> np.ndarray:
+        """
+        Book a sequence of fills at once.
+
+        Equivalent to calling market_order_ticks() for each fill in order
+        (buys for qty > 0, sells for qty < 0, zeros skipped), but computed
+        as an int64 cumulative sum. The batch is atomic: if any buy would
+        exceed the cash available at that point, nothing is booked.
+
+        Args:
+            qty: signed int fill quantities
+            price_ticks: int fill prices in ticks (see to_ticks())
+
+        Returns:
+            np.ndarray of int64 cash in ticks after each fill
+
+        Raises:
+            ValueError: on mismatched shapes, an insufficient-cash buy, or
+                flows that could overflow int64
+        """
+        qty = np.asarray(qty, dtype=np.int64)
+        price_ticks = np.asarray(price_ticks, dtype=np.int64)
+        if qty.ndim != 1 or qty.shape != price_ticks.shape:
+            raise ValueError("qty and price_ticks must be 1-D arrays of equal length")
+        if len(qty) == 0:
+            return np.empty(0, dtype=np.int64)
+        # |sum of flows| <= n * max|qty| * max|price|; keep it clear of 2**63
+        bound = float(np.abs(qty).max()) * float(np.abs(price_ticks).max()) * len(qty) + abs(self.cash_ticks)
+        if bound >= 2.0 ** 62:
+            raise ValueError("fill flows could overflow int64 ticks")
+        cash = np.cumsum(-qty * price_ticks)
+        cash += self.cash_ticks
+        # a buy needs its cost <= cash before it, i.e. cash after it >= 0
+        short_of_cash = (qty > 0) & (cash < 0)
+        if short_of_cash.any():
+            raise ValueError(f"Insufficient cash at fill {int(np.argmax(short_of_cash))}")
+        self.cash_ticks = int(cash[-1])
+        self.position += int(qty.sum())
+        return cash
+
+    def apply_split(self, ratio: float, price: float) -> None:
+        """Rescale the position (see Broker.apply_split); cash in lieu is rounded to ticks."""
+        if ratio <= 0:
+            raise ValueError("ratio must be > 0")
+        shares = self.position * ratio
+        position = int(shares)
+        self.cash_ticks += self.to_ticks((shares - position) * price)
+        self.position = position
+
+    def apply_dividend(self, amount: float) -> None:
+        """Credit a cash dividend per share held; the total is rounded to ticks."""
+        self.cash_ticks += self.to_ticks(self.position * amount)
@@ -0,0 +1,190 @@
+import io
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+
+# Each record in a checkpoint log: <payload length, crc32> followed by an
+# uncompressed .npz payload holding the flattened state dict.
+_RECORD_HEADER = struct.Struct('<QI')
+_STOP = object()
+
+
+def dumps(state: dict) -> bytes:
+    """
+    Serialize a (possibly nested) state dict of scalars/arrays to bytes.
+
+    Nested keys are flattened with '.', e.g. {'broker': {'cash': 1.0}}
+    is stored as 'broker.cash'. Values round-trip bit for bit.
+
+    Example:
+        blob = dumps(broker.get_state())
+        broker.set_state(loads(blob))
+    """
+    flat = {}
+    _flatten(state, '', flat)
+    buffer = io.BytesIO()
+    np.savez(buffer, **flat)
+    return buffer.getvalue()
+
+
+def loads(blob: bytes) -> dict:
+    """Inverse of dumps(): rebuild the nested state dict."""
+    state = {}
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        for key in data.files:
+            value = data[key]
+            if value.ndim == 0:
+                value = value.item()
+            node = state
+            *parents, leaf = key.split('.')
+            for name in parents:
+                node = node.setdefault(name, {})
+            node[leaf] = value
+    return state
+
+
+def _flatten(state: dict, prefix: str, out: dict) -> None:
+    for key, value in state.items():
+        if isinstance(value, dict):
+            _flatten(value, f"{prefix}{key}.", out)
+        else:
+            out[prefix + key] = value
+
+
+class Checkpointer:
+    """
+    Periodic, append-only snapshots of a running backtest.
+
+    Backtester.run_array(..., checkpoint=cp) hands over a snapshot every
+    `every` bars: the bar cursor, broker state, strategy parameters and the
+    newly finished segment of cash/position history. Strategy signals are
+    not stored; a resumed run recomputes them from the full price series.
+    Records are written by a background thread, so the bar loop only pays
+    for a queue put. History rows are final once written, so they are
+    passed as views, not copied.
+
+    Args:
+        path (str): checkpoint log file (appended to)
+        every (int): bars between snapshots (default 100,000)
+
+    Example:
+        with Checkpointer("run.ckpt", every=50_000) as cp:
+            result = Backtester(strategy, broker).run_array(prices, checkpoint=cp)
+        # after a crash:
+        resume = load_checkpoint("run.ckpt")
+        with Checkpointer("run.ckpt", every=50_000) as cp:
+            result = Backtester(strategy, broker).run_array(prices, checkpoint=cp, resume=resume)
+    """
+
+    def __init__(self, path: str, every: int = 100_000):
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        self.path = path
+        self.every = every
+        self.write_seconds = []
+        self._error = None
+        self._queue = queue.Queue()
+        self._file = open(path, 'ab')
+        self._thread = threading.Thread(target=self._writer, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, state: dict) -> None:
+        """Queue a state dict for writing; returns immediately."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(state)
+
+    def flush(self) -> None:
+        """Block until every submitted snapshot is on disk."""
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """Flush pending snapshots and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "Checkpointer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _writer(self) -> None:
+        while True:
+            state = self._queue.get()
+            try:
+                if state is _STOP:
+                    return
+                if self._error is None:
+                    start = time.perf_counter()
+                    payload = dumps(state)
+                    self._file.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+                    self._file.write(payload)
+                    self._file.flush()
+                    self.write_seconds.append(time.perf_counter() - start)
+            except Exception as exc:  # surfaced to the caller on submit/flush/close
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Read a checkpoint log and return the latest complete snapshot.
+
+    Segments of cash/position history from all records are stitched back
+    into full arrays covering bars 0..cursor. A truncated or corrupted
+    trailing record (e.g. the process died mid-write) is ignored.
+
+    Args:
+        path (str): checkpoint log written by Checkpointer
+
+    Returns:
+        dict with 'cursor', 'broker', 'strategy' state and full 'cash' and
+        'position' history arrays; usable as run_array(resume=...)
+
+    Raises:
+        ValueError: if the file holds no complete snapshot
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    latest = None
+    segments = []
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(data):
+        length, crc = _RECORD_HEADER.unpack_from(data, offset)
+        payload = data[offset + _RECORD_HEADER.size: offset + _RECORD_HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        offset += _RECORD_HEADER.size + length
+        latest = loads(payload)
+        # a record starting at or before earlier segments supersedes them
+        # (a restarted run, or a resumed run appending to the same log)
+        start = latest['start']
+        while segments and segments[-1][0] >= start:
+            segments.pop()
+        if segments:
+            seg_start, seg_cash, seg_pos = segments[-1]
+            keep = start - seg_start
+            segments[-1] = (seg_start, seg_cash[:keep], seg_pos[:keep])
+        segments.append((start, latest.pop('cash'), latest.pop('position')))
+
+    if latest is None:
+        raise ValueError(f"No complete snapshot in {path}")
+    latest['cash'] = np.concatenate([seg[1] for seg in segments])
+    latest['position'] = np.concatenate([seg[2] for seg in segments])
+    if len(latest['cash']) != latest['cursor'] + 1:
+        raise ValueError(f"Incomplete history in {path}")
+    return latest
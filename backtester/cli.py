@@ -0,0 +1,316 @@
+"""
+Command-line batch runner.
+
+Runs every (symbol x strategy x parameter set) job described by a JSON
+config on a process pool, prints progress and throughput while it runs,
+and writes one summary row per run to a columnar output directory.
+
+Config (paths are relative to the config file):
+    {
+      "data": {"dir": "prices", "symbols": ["AAPL", "MSFT"], "format": "npy"},
+      "strategies": [
+        {"class": "VolatilityBreakoutStrategy", "grid": {"lookback": [10, 20, 50]}}
+      ],
+      "broker": {"class": "Broker", "cash": 1000000, "risk": {"max_drawdown": 0.3}},
+      "workers": 4,
+      "batch": 8,
+      "save_runs": false,
+      "output": "results"
+    }
+
+- data.format is "npy" (<dir>/<symbol>.npy, memory-mapped) or "csv"
+  (<dir>/<symbol>.csv, column data.column, default "close"); without
+  data.symbols every file of that format in data.dir is used.
+- strategies[].class is a name from STRATEGIES or "package.module:Class";
+  the grid is expanded with param_grid().
+- broker.class is a name from BROKERS; the other broker keys are
+  constructor arguments, and risk holds RiskLimits arguments.
+- batch is the number of parameter sets per task: a task loads its
+  symbol's prices once and runs them all.
+
+Output directory:
+    summary/<column>.npy   one array per column: symbol, strategy, the
+                           parameter columns, bars, final_equity,
+                           total_return, sharpe, max_drawdown, trades, error
+    summary.json           column order and the config that produced them
+    runs.btar              full per-run results (with save_runs), see archive.py
+
+Usage:
+    python -m backtester CONFIG [-j WORKERS] [-o OUTPUT] [-q]
+"""
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from backtester.archive import ArchiveWriter
+from backtester.broker import Broker, FixedPointBroker
+from backtester.engine import Backtester
+from backtester.risk import RiskLimits
+from backtester.search import param_grid, run_summary
+from backtester.strategy import VolatilityBreakoutStrategy
+
+STRATEGIES = {'VolatilityBreakoutStrategy': VolatilityBreakoutStrategy}
+BROKERS = {'Broker': Broker, 'FixedPointBroker': FixedPointBroker}
+_FORMATS = ('npy', 'csv')
+
+
+def load_config(path: str) -> dict:
+    """
+    Read and validate a config file, resolving paths against its directory.
+
+    Raises:
+        ValueError: on a missing section or an unknown format, strategy or broker
+    """
+    with open(path) as f:
+        config = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    for section in ('data', 'strategies'):
+        if section not in config:
+            raise ValueError(f"config has no {section!r} section")
+    data = dict(config['data'])
+    data.setdefault('format', 'npy')
+    if data['format'] not in _FORMATS:
+        raise ValueError(f"data.format must be one of {_FORMATS}")
+    data['dir'] = os.path.join(base, data.get('dir', '.'))
+    if 'symbols' not in data:
+        suffix = f".{data['format']}"
+        data['symbols'] = sorted(name[:-len(suffix)] for name in os.listdir(data['dir'])
+                                 if name.endswith(suffix))
+    config['data'] = data
+    for spec in config['strategies']:
+        strategy_class(spec['class'])
+    broker = config.setdefault('broker', {})
+    if broker.get('class', 'Broker') not in BROKERS:
+        raise ValueError(f"Unknown broker {broker['class']!r}")
+    config['output'] = os.path.join(base, config.get('output', 'results'))
+    config.setdefault('workers', os.cpu_count() or 1)
+    config.setdefault('batch', 8)
+    config.setdefault('save_runs', False)
+    if config['workers'] < 1 or config['batch'] < 1:
+        raise ValueError("workers and batch must be >= 1")
+    return config
+
+
+def strategy_class(name: str):
+    """Resolve a strategy name from STRATEGIES, or "package.module:Class"."""
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    if ':' not in name:
+        raise ValueError(f"Unknown strategy {name!r}; use one of {sorted(STRATEGIES)} or 'module:Class'")
+    module, _, attr = name.partition(':')
+    return getattr(importlib.import_module(module), attr)
+
+
+def load_prices(data: dict, symbol: str) -> np.ndarray:
+    """Prices of one symbol as described by the config's data section."""
+    path = os.path.join(data['dir'], f"{symbol}.{data['format']}")
+    if data['format'] == 'npy':
+        return np.load(path, mmap_mode='r')
+    column = data.get('column', 'close')
+    return pd.read_csv(path, usecols=[column])[column].to_numpy(dtype=np.float64)
+
+
+def make_tasks(config: dict) -> list:
+    """Split the job grid into tasks of one symbol, one strategy and up to `batch` parameter sets."""
+    batch = config['batch']
+    tasks = []
+    for symbol in config['data']['symbols']:
+        for spec in config['strategies']:
+            grid = param_grid(spec.get('grid', {}))
+            for lo in range(0, len(grid), batch):
+                tasks.append({'symbol': symbol, 'strategy': spec['class'], 'params': grid[lo:lo + batch]})
+    return tasks
+
+
+def run_task(task: dict, config: dict) -> tuple:
+    """
+    Run one task's backtests (in a worker process).
+
+    A failing run (e.g. a RiskLimitError) gives a row with its error
+    message, NaN statistics and trades = -1; the other runs of the task
+    still run.
+
+    Returns:
+        tuple (rows, results, bars): summary rows, run_array() results
+        (None unless save_runs) and the number of bars simulated
+    """
+    prices = np.asarray(load_prices(config['data'], task['symbol']), dtype=np.float64)
+    cls = strategy_class(task['strategy'])
+    rows, results = [], []
+    for params in task['params']:
+        row = {'symbol': task['symbol'], 'strategy': task['strategy'], **params}
+        try:
+            result = Backtester(cls(**params), _make_broker(config['broker'])).run_array(prices)
+        except Exception as exc:  # report it in the output rather than abort the batch
+            rows.append({**row, **_failed(prices, exc)})
+            results.append(None)
+            continue
+        rows.append({**row, **run_summary(result), 'error': ''})
+        results.append(result if config['save_runs'] else None)
+    return rows, results, len(prices) * len(task['params'])
+
+
+def run_batch(config: dict, progress=None) -> pd.DataFrame:
+    """
+    Run every task of a loaded config and write the output directory.
+
+    Args:
+        config (dict): config from load_config()
+        progress (Progress): optional progress reporter
+
+    Returns:
+        pd.DataFrame: the summary, one row per run in grid order
+    """
+    tasks = make_tasks(config)
+    output = config['output']
+    os.makedirs(os.path.join(output, 'summary'), exist_ok=True)
+    archive = ArchiveWriter(os.path.join(output, 'runs.btar')) if config['save_runs'] else None
+    done = [None] * len(tasks)
+    stored = set()
+    try:
+        for i, (rows, results, bars) in _execute(tasks, config):
+            done[i] = rows
+            if archive is not None:
+                _archive(archive, stored, config, tasks[i], results)
+            if progress is not None:
+                progress.update(len(rows), bars)
+    finally:
+        if archive is not None:
+            archive.close()
+        if progress is not None:
+            progress.finish()
+    summary = pd.DataFrame([row for rows in done for row in rows])
+    write_summary(output, summary, config)
+    return summary
+
+
+def write_summary(output: str, summary: pd.DataFrame, config: dict = None) -> None:
+    """Save each summary column as output/summary/<column>.npy, plus summary.json."""
+    directory = os.path.join(output, 'summary')
+    os.makedirs(directory, exist_ok=True)
+    for column in summary.columns:
+        values = summary[column].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        np.save(os.path.join(directory, f"{column}.npy"), values)
+    with open(os.path.join(output, 'summary.json'), 'w') as f:
+        json.dump({'columns': list(summary.columns), 'config': config}, f, indent=2, default=str)
+
+
+def read_summary(output: str, columns: list = None) -> pd.DataFrame:
+    """
+    Load a run's summary, optionally only some columns.
+
+    Example:
+        read_summary("results", ['symbol', 'lookback', 'sharpe'])
+    """
+    with open(os.path.join(output, 'summary.json')) as f:
+        names = json.load(f)['columns']
+    return pd.DataFrame({name: np.load(os.path.join(output, 'summary', f"{name}.npy"))
+                         for name in (columns or names)})
+
+
+class Progress:
+    """
+    Prints completed runs and throughput (runs/sec, bars/sec) to a stream.
+
+    Args:
+        total (int): number of runs in the batch
+        stream: text stream (default sys.stderr)
+        interval (float): minimum seconds between lines (default 1)
+    """
+
+    def __init__(self, total: int, stream=None, interval: float = 1.0):
+        self.total = total
+        self.stream = sys.stderr if stream is None else stream
+        self.interval = interval
+        self.runs = 0
+        self.bars = 0
+        self.start = time.perf_counter()
+        self._last = -math.inf
+
+    def update(self, runs: int, bars: int) -> None:
+        """Count finished runs and the bars they simulated."""
+        self.runs += runs
+        self.bars += bars
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._print(now)
+
+    def finish(self) -> None:
+        self._print(time.perf_counter())
+
+    def _print(self, now):
+        elapsed = max(now - self.start, 1e-9)
+        self.stream.write(f"{self.runs}/{self.total} runs  {self.runs / elapsed:,.1f} runs/s  "
+                          f"{self.bars / elapsed:,.0f} bars/s  {elapsed:.1f}s\n")
+        self.stream.flush()
+
+
+def main(argv: list = None) -> int:
+    """Entry point of `python -m backtester`; returns 1 if any run failed."""
+    parser = argparse.ArgumentParser(prog='python -m backtester', description="Run a batch of backtests.")
+    parser.add_argument('config', help="JSON config file")
+    parser.add_argument('-j', '--workers', type=int, help="worker processes (overrides the config)")
+    parser.add_argument('-o', '--output', help="output directory (overrides the config)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="no progress output")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.workers is not None:
+        if args.workers < 1:
+            parser.error("-j/--workers must be >= 1")
+        config['workers'] = args.workers
+    if args.output is not None:
+        config['output'] = args.output
+    total = sum(len(task['params']) for task in make_tasks(config))
+    summary = run_batch(config, None if args.quiet else Progress(total))
+    failed = int((summary['error'] != '').sum()) if len(summary) else 0
+    if failed:
+        print(f"{failed} of {len(summary)} runs failed; see the error column", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _execute(tasks, config):
+    """Yield (task index, task output) as tasks finish; in-process for one worker."""
+    if config['workers'] == 1:
+        for i, task in enumerate(tasks):
+            yield i, run_task(task, config)
+        return
+    with ProcessPoolExecutor(max_workers=config['workers']) as pool:
+        futures = {pool.submit(run_task, task, config): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _make_broker(spec: dict):
+    kwargs = {key: value for key, value in spec.items() if key not in ('class', 'risk')}
+    if spec.get('risk'):
+        kwargs['risk'] = RiskLimits(**spec['risk'])
+    return BROKERS[spec.get('class', 'Broker')](**kwargs)
+
+
+def _failed(prices, exc) -> dict:
+    return {'bars': len(prices), 'final_equity': math.nan, 'total_return': math.nan, 'sharpe': math.nan,
+            'max_drawdown': math.nan, 'trades': -1, 'error': f"{type(exc).__name__}: {exc}"}
+
+
+def _archive(archive, stored, config, task, results):
+    """Append a task's runs to the archive, storing the symbol's prices on first use."""
+    symbol = task['symbol']
+    if symbol not in stored:
+        archive.add_prices(symbol, load_prices(config['data'], symbol))
+        stored.add(symbol)
+    for params, result in zip(task['params'], results):
+        if result is not None:
+            key = '/'.join([symbol, task['strategy']] + [f"{k}={v}" for k, v in params.items()])
+            archive.add(key, result, prices=symbol, meta={'strategy': task['strategy'], **params})
@@ -0,0 +1,258 @@
+"""
+Differential testing of optimized code paths against the reference oracle.
+
+Every scenario is run through backtester.reference (the original pandas
+loop) and through each optimized backend; the report lists, per scenario
+and backend, whether the results agree and how much faster the backend was.
+
+Agreement rules:
+- positions must match exactly
+- cash and equity must agree within rtol x the largest oracle value
+  (backends that add cash flows in a different order, like
+  UniverseBacktester, may differ in the last bits)
+- a signal may differ only on bars where the oracle's return lies within
+  signal_rtol of +/- its volatility, i.e. where a different but equally
+  valid rolling-std summation order can flip the comparison. Engine
+  results are compared up to the first such bar, since every later bar
+  legitimately depends on it.
+- if the oracle raises ValueError, the backend must raise the same message
+
+Example:
+    report = run_difftest(scenarios(n_bars=5_000, seed=7))
+    assert_equivalent(report)
+    report.groupby('backend')['speedup'].median()
+"""
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.live import LiveTrader
+from backtester.reference import ReferenceBacktester, ReferenceBroker, ReferenceStrategy
+from backtester.strategy import VolatilityBreakoutStrategy
+from backtester.universe import UniverseBacktester
+
+
+class Scenario(NamedTuple):
+    """One differential test case: a named price path and strategy lookback."""
+    name: str
+    prices: np.ndarray
+    lookback: int
+
+
+def scenarios(n_bars: int = 2_000, seed: int = 0, lookbacks=(1, 2, 5, 20)) -> list:
+    """
+    Build a seeded set of randomized scenarios.
+
+    Kinds: random walk, walk with price gaps, constant prices, flat stretches
+    with rare moves, integer (tick-rounded) prices, extreme moves, very short
+    series, a lookback longer than the series, and one long series of
+    10 x n_bars.
+
+    Args:
+        n_bars (int): length of the regular scenarios
+        seed (int): random seed; the same seed gives the same scenarios
+        lookbacks: strategy lookbacks to run each regular kind with
+
+    Returns:
+        list of Scenario
+    """
+    rng = np.random.default_rng(seed)
+    paths = {
+        'random_walk': _walk(rng.normal(0, 0.02, n_bars)),
+        'gaps': _walk(rng.normal(0, 0.01, n_bars) + _jumps(rng, n_bars, 0.01, 0.1, 0.7)),
+        'constant': np.full(n_bars, 100.0),
+        'flat_steps': _walk(_jumps(rng, n_bars, 0.02, 0.001, 0.05)),
+        'integer': np.round(_walk(rng.normal(0, 0.01, n_bars))),
+        # heavy-tailed moves, bounded so prices stay within ~[0.7, 15_000]
+        'extreme': 100 * np.exp(np.clip(np.cumsum(np.clip(rng.standard_t(1.5, n_bars) * 0.05, -2, 2)), -5, 5)),
+    }
+    cases = [Scenario(f"{kind}/lb{lookback}", prices, lookback)
+             for kind, prices in paths.items() for lookback in lookbacks]
+    cases += [Scenario(f"short{n}", _walk(rng.normal(0, 0.05, n)), 2) for n in (1, 2, 3)]
+    cases.append(Scenario("lookback_exceeds_bars", _walk(rng.normal(0, 0.02, 30)), 50))
+    cases.append(Scenario("long", _walk(rng.normal(0, 0.02, 10 * n_bars)), 20))
+    return cases
+
+
+def _walk(log_returns):
+    return 100 * np.exp(np.cumsum(log_returns))
+
+
+def _jumps(rng, n, rate, low, high):
+    """Log-returns that are 0 except for rare moves of +/- U(low, high)."""
+    size = rng.uniform(low, high, n) * rng.choice([-1.0, 1.0], n)
+    return np.where(rng.random(n) < rate, size, 0.0)
+
+
+def _run(prices, lookback, cash):
+    result = Backtester(VolatilityBreakoutStrategy(lookback), Broker(cash)).run(pd.Series(prices))
+    return {name: result[name].to_numpy() for name in ('equity', 'cash', 'position')}
+
+
+def _run_array(prices, lookback, cash):
+    return Backtester(VolatilityBreakoutStrategy(lookback), Broker(cash)).run_array(prices)
+
+
+def _live(prices, lookback, cash):
+    trader = LiveTrader(lookback=lookback)
+    broker = Broker(cash)
+    out = {name: np.empty(len(prices)) for name in ('equity', 'cash')}
+    out['position'] = np.empty(len(prices), dtype=np.int64)
+    for i, price in enumerate(prices.tolist()):
+        order = trader.on_bar(price)
+        if order is not None:
+            broker.market_order(order[0], order[1], price)
+        out['cash'][i] = broker.cash
+        out['position'][i] = broker.position
+        out['equity'][i] = broker.cash + broker.position * price
+    return out
+
+
+def _universe(prices, lookback, cash):
+    ub = UniverseBacktester(VolatilityBreakoutStrategy(lookback), cash=cash)
+    result = ub.run_array(prices[:, None])
+    return {'equity': result['equity'], 'cash': result['cash'], 'position': ub.events.positions()[:, 0]}
+
+
+# name -> fn(prices, lookback, cash) returning equity/cash/position arrays
+ENGINES = {
+    'run': _run,
+    'run_array': _run_array,
+    'live': _live,
+    'universe': _universe,
+}
+
+# name -> fn(prices, lookback) returning one signal per bar
+SIGNALS = {
+    'signals': lambda prices, lookback: VolatilityBreakoutStrategy(lookback).signals(pd.Series(prices)).to_numpy(),
+    'signals_array': lambda prices, lookback: VolatilityBreakoutStrategy(lookback).signals_array(prices),
+}
+
+
+def compare(scenario: Scenario, engines: dict = None, signals: dict = None,
+            cash: float = 1_000_000, rtol: float = 1e-9, signal_rtol: float = 1e-9) -> list:
+    """
+    Run one scenario through the oracle and every backend.
+
+    Args:
+        scenario (Scenario): prices and lookback
+        engines (dict): engine backends (default ENGINES)
+        signals (dict): signal backends (default SIGNALS)
+        cash (float): starting cash for every run
+        rtol (float): relative tolerance for cash and equity
+        signal_rtol (float): relative width of the ambiguous band around +/- vol
+
+    Returns:
+        list of dict report rows, one per backend
+    """
+    engines = ENGINES if engines is None else engines
+    signals = SIGNALS if signals is None else signals
+    prices = np.asarray(scenario.prices, dtype=np.float64)
+    series = pd.Series(prices)
+    strategy = ReferenceStrategy(scenario.lookback)
+
+    ret, vol = (s.to_numpy() for s in strategy.returns_and_vol(series))
+    margin = np.minimum(np.abs(ret - vol), np.abs(ret + vol))
+    # a zero return gives signal 0 against any vol >= 0, so it is never ambiguous
+    ambiguous = (ret != 0) & (margin <= signal_rtol * vol)
+    # rows 0..t only depend on signals before t
+    ambiguous_bars = np.flatnonzero(ambiguous)
+    n_compared = len(prices) if len(ambiguous_bars) == 0 else int(ambiguous_bars[0]) + 1
+
+    rows = []
+    expected_signals, oracle_seconds = _timed(strategy.signals, series)
+    for name, fn in signals.items():
+        actual, seconds = _timed(fn, prices, scenario.lookback)
+        row = _row(scenario, name, len(prices), expected_signals, actual, oracle_seconds, seconds)
+        if row['error'] is None:
+            mismatch = np.asarray(expected_signals) != np.asarray(actual)
+            row['position_mismatches'] = int(mismatch.sum())
+            row['exact'] = row['position_mismatches'] == 0
+            row['passed'] = not np.any(mismatch & ~ambiguous)
+        rows.append(row)
+
+    expected, oracle_seconds = _timed(
+        lambda: ReferenceBacktester(ReferenceStrategy(scenario.lookback), ReferenceBroker(cash)).run(series))
+    for name, fn in engines.items():
+        actual, seconds = _timed(fn, prices, scenario.lookback, cash)
+        row = _row(scenario, name, n_compared, expected, actual, oracle_seconds, seconds)
+        if row['error'] is None:
+            rows_ = slice(0, n_compared)
+            position_mismatches = int(np.sum(
+                expected['position'].to_numpy()[rows_] != np.asarray(actual['position'])[rows_]))
+            diff, scale = 0.0, 0.0
+            for field in ('equity', 'cash'):
+                want = expected[field].to_numpy()[rows_]
+                diff = max(diff, float(np.max(np.abs(want - np.asarray(actual[field])[rows_]))))
+                scale = max(scale, float(np.max(np.abs(want))))
+            row.update(position_mismatches=position_mismatches, max_abs_diff=diff,
+                       exact=position_mismatches == 0 and diff == 0.0,
+                       passed=position_mismatches == 0 and diff <= rtol * scale)
+        rows.append(row)
+    return rows
+
+
+def _timed(fn, *args):
+    """Call fn(*args); return (result or the ValueError raised, seconds)."""
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except ValueError as exc:
+        result = exc
+    return result, time.perf_counter() - start
+
+
+def _row(scenario, backend, n_compared, expected, actual, oracle_seconds, seconds) -> dict:
+    """Report row skeleton; settles the outcome when either side raised."""
+    row = {
+        'scenario': scenario.name, 'backend': backend, 'bars': len(scenario.prices),
+        'bars_compared': n_compared, 'passed': False, 'exact': False,
+        'position_mismatches': 0, 'max_abs_diff': np.nan, 'error': None,
+        'oracle_seconds': oracle_seconds, 'seconds': seconds,
+        'speedup': oracle_seconds / seconds if seconds > 0 else np.inf,
+    }
+    expected_error = isinstance(expected, ValueError)
+    actual_error = isinstance(actual, ValueError)
+    if expected_error or actual_error:
+        row['error'] = f"oracle: {expected if expected_error else None!r}, backend: {actual if actual_error else None!r}"
+        row['passed'] = row['exact'] = expected_error and actual_error and str(expected) == str(actual)
+    return row
+
+
+def run_difftest(cases: list = None, engines: dict = None, signals: dict = None,
+                 cash: float = 1_000_000, rtol: float = 1e-9, signal_rtol: float = 1e-9) -> pd.DataFrame:
+    """
+    Run compare() over many scenarios.
+
+    Args:
+        cases: list of Scenario (default scenarios())
+        engines, signals, cash, rtol, signal_rtol: as in compare()
+
+    Returns:
+        pd.DataFrame with one row per (scenario, backend): bars, bars_compared,
+        passed, exact, position_mismatches, max_abs_diff, error,
+        oracle_seconds, seconds, speedup
+    """
+    cases = scenarios() if cases is None else cases
+    rows = []
+    for case in cases:
+        rows.extend(compare(case, engines, signals, cash, rtol, signal_rtol))
+    return pd.DataFrame(rows)
+
+
+def assert_equivalent(report: pd.DataFrame) -> None:
+    """
+    Raise if any backend disagreed with the oracle.
+
+    Raises:
+        AssertionError: listing every failing (scenario, backend) row
+    """
+    failed = report[~report['passed']]
+    if len(failed):
+        columns = ['scenario', 'backend', 'position_mismatches', 'max_abs_diff', 'error']
+        raise AssertionError(f"{len(failed)} backend(s) disagree with the oracle:\n"
+                             f"{failed[columns].to_string(index=False)}")
@@ -0,0 +1,335 @@
+"""
+Multi-host parameter sweeps over a shared-filesystem job queue.
+
+A SweepCoordinator splits a (symbols x parameters) grid into work units and
+writes them as small JSON files under a sweep directory; SweepWorker
+processes on any host that can see the directory (local disk, NFS, ...)
+claim units, run Backtester jobs and write compact per-run summaries back.
+
+Layout of a sweep directory:
+    manifest.json      the grid that was submitted
+    pending/<id>.json  units waiting for a worker
+    leases/<id>.json   units claimed by a worker (mtime = lease start)
+    results/<id>.json  finished units, one summary row per (symbol, params)
+    failed/<id>.json   units that failed max_attempts times
+
+Claiming a unit is an atomic rename from pending/ to leases/, so exactly one
+worker wins it. Results and unit files are written to a temporary name and
+os.replace()d into place, so readers never see partial files and running a
+unit twice (e.g. after its lease expired on a slow node) just rewrites the
+same result. A crashed worker's leases expire and requeue_expired() puts
+them back in pending/ without touching finished units; an expiry counts
+as a failed attempt, so a unit that keeps killing its workers is parked
+in failed/ after max_attempts.
+
+Example:
+    coordinator = SweepCoordinator("/shared/sweep", lease_seconds=600)
+    coordinator.submit(["AAPL", "MSFT"], {'lookback': [10, 20, 50]})
+    # on each host:  python -m backtester.distributed /shared/sweep /shared/prices
+    coordinator.requeue_expired()
+    coordinator.results()
+"""
+import itertools
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.search import run_summary
+from backtester.strategy import VolatilityBreakoutStrategy
+
+logger = logging.getLogger(__name__)
+
+_STATES = ('pending', 'leases', 'results', 'failed')
+
+
+class SweepCoordinator:
+    """
+    Owns a sweep directory: submits the grid, requeues expired leases and
+    collects results.
+
+    Args:
+        root (str): sweep directory (created if missing)
+        lease_seconds (float): time after which a claimed unit is considered
+            abandoned by its worker (default 600)
+        max_attempts (int): failed runs (errors or expired leases) of a
+            unit before it is parked in failed/ (default 3)
+    """
+
+    def __init__(self, root: str, lease_seconds: float = 600, max_attempts: int = 3):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for state in _STATES:
+            os.makedirs(os.path.join(root, state), exist_ok=True)
+
+    def submit(self, symbols: list, params: dict, batch: int = 1) -> int:
+        """
+        Split the grid into work units and queue them.
+
+        Each unit holds one symbol and up to `batch` parameter sets, so a
+        worker loads the symbol's prices once per unit. Submitting the same
+        grid again is a no-op for units that already exist in any state,
+        which makes it safe to re-run a coordinator after a crash.
+
+        Args:
+            symbols (list): symbol names, passed to the workers' loader
+            params (dict): parameter name -> list of values; the grid is
+                their cartesian product, e.g. {'lookback': [10, 20]}
+            batch (int): parameter sets per unit (default 1)
+
+        Returns:
+            int: number of newly queued units
+
+        Raises:
+            ValueError: if the directory already holds a different grid
+        """
+        if batch < 1:
+            raise ValueError("batch must be >= 1")
+        manifest = {'symbols': list(symbols), 'params': {k: list(v) for k, v in params.items()},
+                    'batch': batch, 'max_attempts': self.max_attempts}
+        path = os.path.join(self.root, 'manifest.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                if json.load(f) != manifest:
+                    raise ValueError(f"{self.root} already holds a different sweep")
+        else:
+            _write_json(path, manifest)
+
+        names = list(params)
+        combos = [dict(zip(names, values)) for values in itertools.product(*params.values())]
+        queued = 0
+        for unit_id, unit in enumerate(
+                {'symbol': symbol, 'params': combos[lo:lo + batch]}
+                for symbol in symbols for lo in range(0, len(combos), batch)):
+            name = f"{unit_id:06d}.json"
+            if any(os.path.exists(os.path.join(self.root, state, name)) for state in _STATES):
+                continue
+            unit.update(unit_id=unit_id, attempts=0, errors=[])
+            _write_json(os.path.join(self.root, 'pending', name), unit)
+            queued += 1
+        return queued
+
+    def requeue_expired(self, now: float = None) -> int:
+        """
+        Return units whose lease is older than lease_seconds to pending/.
+
+        The expiry counts as a failed attempt: a unit that has used up
+        max_attempts is moved to failed/ instead (and not counted).
+
+        Args:
+            now (float): current epoch seconds (default time.time())
+
+        Returns:
+            int: number of requeued units
+        """
+        now = time.time() if now is None else now
+        leases = os.path.join(self.root, 'leases')
+        requeued = 0
+        for name in _json_files(leases):
+            path = os.path.join(leases, name)
+            try:
+                if now - os.path.getmtime(path) < self.lease_seconds:
+                    continue
+                if os.path.exists(os.path.join(self.root, 'results', name)):
+                    os.remove(path)  # finished after all; only the cleanup was lost
+                    continue
+                # take the lease over atomically, out of sight of workers and listings
+                taken = f"{path}.expired"
+                os.rename(path, taken)
+            except FileNotFoundError:
+                continue  # the worker finished or released it meanwhile
+            with open(taken) as f:
+                unit = json.load(f)
+            unit['attempts'] += 1
+            unit['errors'].append(f"lease expired after {self.lease_seconds:g}s")
+            state = 'failed' if unit['attempts'] >= self.max_attempts else 'pending'
+            _write_json(os.path.join(self.root, state, name), unit)
+            _remove(taken)
+            if state == 'pending':
+                requeued += 1
+            else:
+                logger.warning("Unit %s parked after %d attempts", unit['unit_id'], unit['attempts'])
+        if requeued:
+            logger.info("Requeued %d expired unit(s)", requeued)
+        return requeued
+
+    def status(self) -> dict:
+        """Number of units in each state: pending, leases, results, failed."""
+        return {state: len(_json_files(os.path.join(self.root, state))) for state in _STATES}
+
+    def done(self) -> bool:
+        """True once every unit has either a result or has failed for good."""
+        status = self.status()
+        return status['pending'] == 0 and status['leases'] == 0
+
+    def results(self) -> pd.DataFrame:
+        """
+        Collect finished units.
+
+        Returns:
+            pd.DataFrame with one row per (symbol, params): symbol, the
+            parameter columns and the run_summary() statistics (bars,
+            final_equity, total_return, sharpe, max_drawdown, trades),
+            sorted by unit
+        """
+        directory = os.path.join(self.root, 'results')
+        rows = []
+        for name in sorted(_json_files(directory)):
+            with open(os.path.join(directory, name)) as f:
+                rows.extend(json.load(f))
+        return pd.DataFrame(rows)
+
+    def failures(self) -> list:
+        """Units parked in failed/, each with its list of error messages."""
+        directory = os.path.join(self.root, 'failed')
+        units = []
+        for name in sorted(_json_files(directory)):
+            with open(os.path.join(directory, name)) as f:
+                units.append(json.load(f))
+        return units
+
+
+class SweepWorker:
+    """
+    Claims units from a sweep directory and runs them until none are left.
+
+    Args:
+        root (str): sweep directory created by SweepCoordinator
+        loader: callable symbol -> 1-D price array (e.g. NpyLoader)
+        cash (float): starting cash of every run (default 1M)
+        strategy_cls: strategy class built as strategy_cls(**params)
+            (default VolatilityBreakoutStrategy)
+        worker_id (str): name used in logs (default host:pid)
+
+    Example:
+        SweepWorker("/shared/sweep", NpyLoader("/shared/prices")).run()
+    """
+
+    def __init__(self, root: str, loader, cash: float = 1_000_000,
+                 strategy_cls=VolatilityBreakoutStrategy, worker_id: str = None):
+        self.root = root
+        self.loader = loader
+        self.cash = cash
+        self.strategy_cls = strategy_cls
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        with open(os.path.join(root, 'manifest.json')) as f:
+            self.max_attempts = json.load(f)['max_attempts']
+
+    def claim(self):
+        """
+        Atomically take the next pending unit.
+
+        Returns:
+            dict unit, or None if nothing is pending
+        """
+        pending = os.path.join(self.root, 'pending')
+        for name in sorted(_json_files(pending)):
+            lease = os.path.join(self.root, 'leases', name)
+            try:
+                os.rename(os.path.join(pending, name), lease)
+            except FileNotFoundError:
+                continue  # another worker won this one
+            try:
+                os.utime(lease)  # the lease starts now
+                with open(lease) as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue  # expired and requeued already
+        return None
+
+    def run(self, max_units: int = None) -> int:
+        """
+        Claim and run units until none are pending (or max_units are done).
+
+        Returns:
+            int: number of units this worker completed
+        """
+        completed = 0
+        while max_units is None or completed < max_units:
+            unit = self.claim()
+            if unit is None:
+                break
+            completed += self.run_unit(unit)
+        return completed
+
+    def run_unit(self, unit: dict) -> bool:
+        """
+        Run one claimed unit and publish its result, or release it on error.
+
+        Returns:
+            bool: True if the result was written
+        """
+        name = f"{unit['unit_id']:06d}.json"
+        lease = os.path.join(self.root, 'leases', name)
+        try:
+            prices = np.asarray(self.loader(unit['symbol']), dtype=np.float64)
+            rows = [self._summarize(unit['symbol'], params, prices) for params in unit['params']]
+        except Exception as exc:  # any failure is retried, then parked in failed/
+            unit['attempts'] += 1
+            unit['errors'].append(f"{self.worker_id}: {type(exc).__name__}: {exc}")
+            state = 'failed' if unit['attempts'] >= self.max_attempts else 'pending'
+            _write_json(os.path.join(self.root, state, name), unit)
+            _remove(lease)
+            logger.warning("Unit %s failed on %s (attempt %d): %s",
+                           unit['unit_id'], self.worker_id, unit['attempts'], exc)
+            return False
+        _write_json(os.path.join(self.root, 'results', name), rows)
+        _remove(lease)
+        return True
+
+    def _summarize(self, symbol, params, prices) -> dict:
+        """Run one backtest and reduce it to a compact summary row."""
+        result = Backtester(self.strategy_cls(**params), Broker(self.cash)).run_array(prices)
+        return {'symbol': symbol, **params, **run_summary(result)}
+
+
+class NpyLoader:
+    """
+    Load prices from <directory>/<symbol>.npy, memory-mapped.
+
+    Args:
+        directory (str): directory holding one 1-D .npy array per symbol
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def __call__(self, symbol: str) -> np.ndarray:
+        return np.load(os.path.join(self.directory, f"{symbol}.npy"), mmap_mode='r')
+
+
+def _json_files(directory: str) -> list:
+    return [name for name in os.listdir(directory) if name.endswith('.json')]
+
+
+def _write_json(path: str, obj) -> None:
+    """Write obj to path atomically: temp file in the same directory, then os.replace()."""
+    tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+if __name__ == "__main__":
+    # python -m backtester.distributed SWEEP_DIR PRICES_DIR
+    SweepWorker(sys.argv[1], NpyLoader(sys.argv[2])).run()
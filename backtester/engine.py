@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 import logging
 
+from backtester.result import BacktestResult, equity_of, result_dtype
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
@@ -16,14 +19,25 @@ class Backtester:
     Args:
         strategy: object with .signals(prices) -> pd.Series method
         broker: Broker object with .market_order() method
+        sizer: optional VolTargetSizer turning signals into share targets;
+            needs a strategy with .signals_with_vol(prices). Without it the
+            signal itself is the target position.
+        dtype: float dtype of the equity and cash outputs (default float64);
+            np.float32 halves their memory. The broker still keeps cash in
+            full precision, so only the stored values are rounded (equity
+            is derived from the stored cash).
 
     Returns:
         pd.DataFrame with columns [equity, cash, position] indexed by date
     """
 
-    def __init__(self, strategy, broker):
+    def __init__(self, strategy, broker, sizer=None, dtype=np.float64):
         self.strategy = strategy
         self.broker = broker
+        self.sizer = sizer
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64")
+        self.dtype = np.dtype(dtype)
 
     def run(self, prices: pd.Series) -> pd.DataFrame:
         """
@@ -63,30 +77,225 @@ class Backtester:
         #   - Calculate equity = cash + position * current_price
         #   - Store results
         # Step 4: Return as DataFrame
-        signals = self.strategy.signals(prices)
-        equity = [self.broker.cash + self.broker.position * prices.iloc[0], ]
-        cash = [self.broker.cash,]
-        position = [self.broker.position,]
-        for i in range(1, len(prices)):
-            target_position = signals.iloc[i-1]
-            curr_position = self.broker.position
-            qty = target_position - curr_position
-            abs_qty = abs(qty)
-
-            if qty != 0:
-                side = "BUY" if qty > 0 else "SELL"
-                # execute trade
-                self.broker.market_order(side, abs_qty, prices.iloc[i])
-
-            cash.append(self.broker.cash)
-            position.append(self.broker.position)
-            equity.append(cash[-1] + position[-1] * prices.iloc[i])
+        values = prices.to_numpy()
+        if self.sizer is None:
+            signals = np.asarray(self.strategy.signals(prices))
+        else:
+            signals = self._targets(values, self.broker.cash)
+        cash = np.empty(len(values), dtype=self.dtype)
+        position = np.empty(len(values), dtype=np.int64)
+        self._initial_row(cash, position)
+        self._simulate(values, signals, cash, position, 1, len(values))
 
         result = pd.DataFrame({
-            'equity': equity,
+            'equity': equity_of(cash, position, values),
             'cash': cash,
             'position': position
         }, index=prices.index)
 
         return result
-        # YOUR CODE ENDS HERE
\ No newline at end of file
+        # YOUR CODE ENDS HERE
+
+    def run_array(self, prices: np.ndarray, timestamps: np.ndarray = None,
+                  checkpoint=None, resume: dict = None, adjustments=None,
+                  signals: np.ndarray = None) -> np.ndarray:
+        """
+        Run the backtest over a plain price array.
+
+        Same execution rules as run(), without any pandas objects: prices
+        are used in place (no copy, no index) and signals come from the
+        strategy's .signals_array(prices) method (or .signals_with_vol()
+        when a sizer is set).
+
+        Args:
+            prices: 1-D np.ndarray of daily prices
+            timestamps: optional 1-D int64 array (e.g. epoch ns), same length
+            checkpoint: optional Checkpointer; a snapshot is submitted every
+                checkpoint.every bars and once at the end
+            resume: optional snapshot from load_checkpoint(); restores broker
+                state and strategy parameters and continues after the saved
+                bar cursor. Snapshots hold no rolling-window state: signals
+                are recomputed over the whole of `prices`, which must be the
+                same full series the checkpointed run was given
+            adjustments: optional AdjustmentIndex for raw (unadjusted)
+                prices; signals are computed on adjusted prices, while trades
+                and equity use the raw prices and the broker books each
+                split/dividend at its ex-date bar, before that bar's trade.
+                It is passed to the strategy as signals_array(prices,
+                adjustments=...), which adjusts lazily (no adjusted copy)
+            signals: optional precomputed signals, one per bar (e.g. a
+                memory-mapped array from SignalStore); used as the target
+                positions instead of calling the strategy. Not combinable
+                with a sizer.
+
+        Returns:
+            structured np.ndarray with fields [equity, cash, position], plus
+            a leading 'timestamp' field when timestamps are given
+
+        Example:
+            result = backtester.run_array(np.array([100.0, 101.0, 102.0]))
+            result['equity'][-1]
+        """
+        prices, timestamps = _check_inputs(prices, timestamps)
+        out = np.empty(len(prices), dtype=result_dtype(timestamps is not None, self.dtype))
+        cash, position = out['cash'], out['position']
+        if resume is None:
+            start = 1
+            self._initial_row(cash, position)
+        else:
+            start = self._restore(resume, cash, position)
+        signals = self._signals(prices, cash[0], adjustments, signals)
+
+        if checkpoint is None:
+            self._advance(prices, signals, cash, position, start, len(prices), adjustments)
+        else:
+            # run in segments so the hot loop itself carries no checkpoint logic
+            segment_start = 0 if resume is None else start
+            for lo in range(start, len(prices), checkpoint.every):
+                hi = min(lo + checkpoint.every, len(prices))
+                self._advance(prices, signals, cash, position, lo, hi, adjustments)
+                checkpoint.submit(self._snapshot(hi - 1, segment_start, cash, position))
+                segment_start = hi
+            if segment_start == 0:
+                checkpoint.submit(self._snapshot(0, 0, cash, position))
+
+        out['equity'] = equity_of(cash, position, prices)
+        if timestamps is not None:
+            out['timestamp'] = timestamps
+        return out
+
+    def run_result(self, prices, timestamps: np.ndarray = None, adjustments=None,
+                   signals: np.ndarray = None) -> BacktestResult:
+        """
+        Run the backtest and return a lazy BacktestResult.
+
+        Same execution as run_array(), but only cash and position are
+        stored: equity is derived from them on access and a DataFrame is
+        built only by to_frame(). Suited to sweeps that need little more
+        than final_equity.
+
+        Args:
+            prices: 1-D np.ndarray or pd.Series of daily prices (a Series
+                index is kept for to_frame())
+            timestamps: optional 1-D int64 array, same length
+            adjustments: optional AdjustmentIndex (see run_array())
+            signals: optional precomputed signals (see run_array())
+
+        Returns:
+            BacktestResult
+
+        Example:
+            result = backtester.run_result(prices)
+            result.final_equity
+        """
+        index = prices.index if isinstance(prices, pd.Series) else None
+        prices, timestamps = _check_inputs(prices, timestamps)
+        cash = np.empty(len(prices), dtype=self.dtype)
+        position = np.empty(len(prices), dtype=np.int64)
+        self._initial_row(cash, position)
+        signals = self._signals(prices, cash[0], adjustments, signals)
+        self._advance(prices, signals, cash, position, 1, len(prices), adjustments)
+        return BacktestResult(cash, position, prices, timestamps=timestamps, index=index)
+
+    def _signals(self, prices, capital, adjustments, signals):
+        """Target positions: precomputed signals if given, else from the strategy."""
+        if signals is not None:
+            if self.sizer is not None:
+                raise ValueError("Precomputed signals cannot be combined with a sizer")
+            if len(signals) != len(prices):
+                raise ValueError("signals must match prices in length")
+            return signals
+        return self._targets(prices, capital, adjustments)
+
+    def _targets(self, prices, capital, adjustments=None):
+        """Target position per bar: the signal itself, or its size from the sizer."""
+        extra = {} if adjustments is None else {'adjustments': adjustments}
+        if self.sizer is None:
+            return self.strategy.signals_array(prices, **extra)
+        signals, vol = self.strategy.signals_with_vol(prices, **extra)
+        return self.sizer.size(signals, prices, vol, capital)
+
+    def get_state(self) -> dict:
+        """Broker and strategy state, as stored in checkpoints."""
+        return {'broker': self.broker.get_state(), 'strategy': self.strategy.get_state()}
+
+    def set_state(self, state: dict) -> None:
+        """Restore broker and strategy state saved by get_state()."""
+        self.broker.set_state(state['broker'])
+        self.strategy.set_state(state['strategy'])
+
+    def _snapshot(self, cursor, start, cash, position) -> dict:
+        """State after bar `cursor`, plus history rows start..cursor (views, not copies)."""
+        state = self.get_state()
+        state.update(cursor=cursor, start=start,
+                     cash=cash[start:cursor + 1], position=position[start:cursor + 1])
+        return state
+
+    def _restore(self, resume, cash, position) -> int:
+        """Load a snapshot into the broker/strategy and output rows; return the next bar."""
+        cursor = resume['cursor']
+        if cursor >= len(cash):
+            raise ValueError("Checkpoint is beyond the end of prices")
+        self.set_state(resume)
+        cash[:cursor + 1] = resume['cash']
+        position[:cursor + 1] = resume['position']
+        return cursor + 1
+
+    def _initial_row(self, cash, position) -> None:
+        """Record the broker's starting state at bar 0."""
+        cash[0] = self.broker.cash
+        position[0] = self.broker.position
+
+    def _advance(self, prices, signals, cash, position, start, stop, adjustments) -> None:
+        """_simulate() over [start, stop), booking corporate actions at their ex-date bars."""
+        if adjustments is not None:
+            broker = self.broker
+            for k in adjustments.events(start, stop):
+                bar = int(adjustments.bars[k])
+                self._simulate(prices, signals, cash, position, start, bar)
+                if adjustments.split[k] != 1.0:
+                    broker.apply_split(adjustments.split[k], prices[bar])
+                if adjustments.dividend[k] != 0.0:
+                    broker.apply_dividend(adjustments.dividend[k])
+                start = bar
+        self._simulate(prices, signals, cash, position, start, stop)
+
+    def _simulate(self, prices, signals, cash, position, start, stop) -> None:
+        """
+        Core bar loop shared by run(), run_array() and run_result().
+
+        For each bar in [start, stop), trades at the close toward the signal
+        of the previous bar and writes cash and position into the
+        preallocated outputs (equity follows from them, see equity_of()).
+        A broker with risk limits is marked to market at every bar (one bar
+        = one day for the turnover limit).
+        """
+        broker = self.broker
+        risk = getattr(broker, 'risk', None)
+        for i in range(start, stop):
+            if risk is not None:
+                risk.mark(broker.cash + broker.position * prices[i], day=i)
+            target_position = int(signals[i-1])
+            qty = target_position - broker.position
+
+            if qty != 0:
+                side = "BUY" if qty > 0 else "SELL"
+                # execute trade
+                broker.market_order(side, abs(qty), prices[i])
+
+            cash[i] = broker.cash
+            position[i] = broker.position
+
+
+def _check_inputs(prices, timestamps):
+    """Validate run inputs; return prices as an array and timestamps as int64 (or None)."""
+    prices = np.asarray(prices)
+    if prices.ndim != 1:
+        raise ValueError("prices must be 1-D")
+    if len(prices) == 0:
+        raise ValueError("Prices cannot be empty")
+    if timestamps is not None:
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if timestamps.shape != prices.shape:
+            raise ValueError("timestamps must match prices in length")
+    return prices, timestamps
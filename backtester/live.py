@@ -0,0 +1,160 @@
+import math
+
+
+# Orders are immutable, so the handful a ±1 strategy can emit are built once
+# and returned by reference instead of allocating a tuple on every bar.
+_ORDERS = {
+    1: ("BUY", 1),
+    2: ("BUY", 2),
+    -1: ("SELL", 1),
+    -2: ("SELL", 2),
+}
+
+
+class LiveTrader:
+    """
+    Single-bar decision path for live trading.
+
+    Applies the same rules as Backtester.run with VolatilityBreakoutStrategy,
+    one price at a time and in O(1) per bar:
+    1. On each new price, trade toward the signal of the previous bar
+    2. Update the rolling return window and compute this bar's signal
+    3. Remember the signal as the target for the next bar
+
+    State lives in __slots__ and a fixed-size ring buffer, so on_bar()
+    allocates no pandas/NumPy objects. Orders are assumed to fill at the
+    bar's price, exactly as in the backtest.
+
+    Args:
+        lookback (int): rolling volatility window (default 20)
+        position (int): starting position (default 0)
+
+    Example:
+        trader = LiveTrader(lookback=20)
+        for price in feed:
+            order = trader.on_bar(price)   # None or ("BUY"/"SELL", qty)
+            if order is not None:
+                broker.market_order(order[0], order[1], price)
+    """
+
+    __slots__ = (
+        'lookback', 'position', 'target', 'bars',
+        '_last_price', '_window', '_head', '_count', '_mean', '_m2',
+    )
+
+    def __init__(self, lookback: int = 20, position: int = 0):
+        if lookback < 1:
+            raise ValueError("lookback must be >= 1")
+        self.lookback = lookback
+        self.position = position
+        self.target = position
+        self.bars = 0
+        self._last_price = 0.0
+        self._window = [0.0] * lookback
+        self._head = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @classmethod
+    def from_strategy(cls, strategy, position: int = 0) -> "LiveTrader":
+        """Build a trader with the same lookback as a VolatilityBreakoutStrategy."""
+        return cls(lookback=strategy.lookback, position=position)
+
+    def get_state(self) -> dict:
+        """Return the full decision state, including the rolling window buffer."""
+        return {
+            'lookback': self.lookback, 'position': self.position, 'target': self.target,
+            'bars': self.bars, 'last_price': self._last_price, 'window': list(self._window),
+            'head': self._head, 'count': self._count, 'mean': self._mean, 'm2': self._m2,
+        }
+
+    def set_state(self, state: dict) -> None:
+        """Restore state saved by get_state(); later decisions are bit-identical."""
+        self.lookback = int(state['lookback'])
+        self.position = int(state['position'])
+        self.target = int(state['target'])
+        self.bars = int(state['bars'])
+        self._last_price = float(state['last_price'])
+        self._window = [float(x) for x in state['window']]
+        self._head = int(state['head'])
+        self._count = int(state['count'])
+        self._mean = float(state['mean'])
+        self._m2 = float(state['m2'])
+
+    def on_bar(self, price: float):
+        """
+        Consume one new price and decide the order for this bar.
+
+        Args:
+            price (float): latest close
+
+        Returns:
+            None if no trade is needed, else a (side, qty) tuple
+
+        Example:
+            trader.on_bar(101.5)
+            # ("BUY", 1)
+        """
+        order = None
+        if self.bars == 0:
+            ret = 0.0
+        else:
+            qty = self.target - self.position
+            if qty != 0:
+                order = _ORDERS.get(qty)
+                if order is None:
+                    order = ("BUY", qty) if qty > 0 else ("SELL", -qty)
+                self.position = self.target
+            try:
+                ret = price / self._last_price - 1.0
+            except ZeroDivisionError:
+                ret = math.nan
+            if ret != ret:
+                ret = 0.0
+        self._last_price = price
+        self.bars += 1
+        self.target = self._signal(ret)
+        return order
+
+    def _signal(self, ret: float) -> int:
+        """Push one return into the window and compare it to the rolling std."""
+        window = self._window
+        head = self._head
+        if self._count == self.lookback:
+            # sliding Welford update: replace the oldest return with the new one
+            old = window[head]
+            delta = ret - old
+            mean = self._mean
+            new_mean = mean + delta / self.lookback
+            self._m2 += delta * (ret - new_mean + old - mean)
+            self._mean = new_mean
+        else:
+            self._count += 1
+            delta = ret - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (ret - self._mean)
+        window[head] = ret
+        head += 1
+        if head == self.lookback:
+            head = 0
+            if self._count == self.lookback:
+                # once per full turn of the ring, recompute exactly so that
+                # rounding from the incremental updates cannot accumulate
+                mean = sum(window) / self.lookback
+                self._mean = mean
+                self._m2 = sum((x - mean) * (x - mean) for x in window)
+        self._head = head
+
+        if self._count < self.lookback or self.lookback < 2:
+            vol = 0.0
+        else:
+            var = self._m2 / (self.lookback - 1)
+            vol = math.sqrt(var) if var > 0.0 else 0.0
+            if vol != vol:
+                vol = 0.0
+        if ret > vol:
+            return 1
+        if ret < -vol:
+            return -1
+        return 0
@@ -0,0 +1,169 @@
+import math
+
+import numpy as np
+
+
+class OnlineMetrics:
+    """
+    Streaming performance statistics, O(1) per bar.
+
+    Consumes each bar's equity and position (as written by
+    Backtester.run / run_array, or produced live) and keeps running
+    aggregates: return mean and variance (Welford), peak equity and max
+    drawdown, time in the market, turnover and trade count. snapshot()
+    reads them at any time without rescanning history.
+
+    Returns are per-bar simple returns of equity; the first bar only sets
+    the starting equity. Turnover counts shares traded (|change in
+    position|), trades count the bars on which the position changed.
+
+    Args:
+        periods_per_year (int): annualization factor for volatility and
+            Sharpe (default 252)
+
+    Example:
+        metrics = OnlineMetrics()
+        for price in feed:
+            ...                                  # trade this bar
+            metrics.update(broker.cash + broker.position * price, broker.position)
+        metrics.snapshot()['sharpe']
+    """
+
+    __slots__ = (
+        'periods_per_year', 'bars', 'first_equity', 'equity', 'peak', 'max_drawdown',
+        'position', 'exposed_bars', 'turnover', 'trades', '_count', '_mean', '_m2',
+    )
+
+    def __init__(self, periods_per_year: int = 252):
+        self.periods_per_year = periods_per_year
+        self.bars = 0
+        self.first_equity = math.nan
+        self.equity = math.nan
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+        self.position = 0
+        self.exposed_bars = 0
+        self.turnover = 0
+        self.trades = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, equity: float, position: int) -> None:
+        """Add one bar."""
+        if self.bars:
+            previous = self.equity
+            if previous != 0:
+                # Welford: running mean and sum of squared deviations
+                r = equity / previous - 1.0
+                self._count += 1
+                delta = r - self._mean
+                self._mean += delta / self._count
+                self._m2 += delta * (r - self._mean)
+        else:
+            self.first_equity = equity
+        change = position - self.position
+        if change:
+            self.turnover += abs(change)
+            self.trades += 1
+        if position:
+            self.exposed_bars += 1
+        if equity > self.peak:
+            self.peak = equity
+        elif self.peak > 0:
+            drawdown = 1.0 - equity / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+        self.equity = equity
+        self.position = position
+        self.bars += 1
+
+    def update_many(self, equity: np.ndarray, position: np.ndarray) -> None:
+        """
+        Add a chunk of bars at once (e.g. one chunk of a chunked run).
+
+        Same result as calling update() per bar, up to float rounding: the
+        chunk's return moments are computed with array operations and
+        merged into the running ones (Chan et al. pairwise update).
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        position = np.asarray(position, dtype=np.int64)
+        if len(equity) != len(position):
+            raise ValueError("equity and position must have the same length")
+        if len(equity) == 0:
+            return
+        if not self.bars:
+            self.first_equity = float(equity[0])
+            previous = equity[:-1]
+            current = equity[1:]
+        else:
+            previous = np.concatenate(([self.equity], equity[:-1]))
+            current = equity
+        valid = previous != 0
+        returns = current[valid] / previous[valid] - 1.0
+        if len(returns):
+            count = len(returns)
+            mean = float(returns.mean())
+            m2 = float(((returns - mean) ** 2).sum())
+            total = self._count + count
+            delta = mean - self._mean
+            self._m2 += m2 + delta * delta * self._count * count / total
+            self._mean += delta * count / total
+            self._count = total
+
+        changes = np.diff(position, prepend=self.position)
+        self.turnover += int(np.abs(changes).sum())
+        self.trades += int(np.count_nonzero(changes))
+        self.exposed_bars += int(np.count_nonzero(position))
+        peaks = np.maximum.accumulate(np.maximum(equity, self.peak))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks > 0, 1.0 - equity / peaks, 0.0)
+        self.max_drawdown = max(self.max_drawdown, float(drawdowns.max()))
+        self.peak = float(peaks[-1])
+        self.equity = float(equity[-1])
+        self.position = int(position[-1])
+        self.bars += len(equity)
+
+    @property
+    def mean_return(self) -> float:
+        return self._mean if self._count else math.nan
+
+    @property
+    def volatility(self) -> float:
+        """Sample standard deviation of per-bar returns (NaN with < 2 returns)."""
+        return math.sqrt(self._m2 / (self._count - 1)) if self._count > 1 else math.nan
+
+    def snapshot(self) -> dict:
+        """
+        Current statistics.
+
+        Returns:
+            dict with bars, equity, total_return, mean_return, volatility
+            and sharpe (annualized), drawdown (current, from peak),
+            max_drawdown, exposure (fraction of bars with a position),
+            turnover and trades
+        """
+        vol = self.volatility
+        scale = math.sqrt(self.periods_per_year)
+        return {
+            'bars': self.bars,
+            'equity': self.equity,
+            'total_return': self.equity / self.first_equity - 1.0 if self.first_equity else math.nan,
+            'mean_return': self.mean_return,
+            'volatility': vol * scale,
+            'sharpe': self._mean / vol * scale if vol > 0 else math.nan,
+            'drawdown': 1.0 - self.equity / self.peak if self.peak > 0 else 0.0,
+            'max_drawdown': self.max_drawdown,
+            'exposure': self.exposed_bars / self.bars if self.bars else math.nan,
+            'turnover': self.turnover,
+            'trades': self.trades,
+        }
+
+    def get_state(self) -> dict:
+        """Return the accumulator state, e.g. for checkpointing."""
+        return {name.lstrip('_'): getattr(self, name) for name in self.__slots__}
+
+    def set_state(self, state: dict) -> None:
+        """Restore state saved by get_state()."""
+        for name in self.__slots__:
+            setattr(self, name, state[name.lstrip('_')])
@@ -0,0 +1,174 @@
+"""
+Cross-strategy order netting.
+
+When several strategies trade the same symbols, sending each strategy's
+orders separately executes offsetting buys and sells twice and pays costs
+on both. OrderNetter takes every strategy's target positions for a bar as
+one (strategies x symbols) matrix, sums the changes into one net order per
+symbol, and attributes the result back to per-strategy virtual books:
+
+- each strategy's book fills its own position change at the bar's price,
+  so its P&L is the same as trading alone apart from costs
+- only the net order reaches the market, so only it pays costs; they are
+  split across strategies in proportion to their share of the gross
+  (sum of |change|) traded in that symbol on that bar
+
+Costs are modeled per share and in basis points of notional.
+
+Example:
+    netter = OrderNetter(n_strategies=2, n_symbols=3, cash=[500_000, 500_000], cost_bps=1.0)
+    netted = netter.run(targets, prices)       # targets: (bars, strategies, symbols)
+    netted.trades                              # (bars, symbols) net shares sent to the market
+    netted.equity[:, 0]                        # strategy 0's virtual book
+    netted.net_orders, netted.gross_orders     # orders sent vs orders without netting
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Netted(NamedTuple):
+    """Output of OrderNetter.run()."""
+    trades: np.ndarray       # (bars, symbols) int64 net shares traded at each bar's close
+    fills: np.ndarray        # (bars, strategies, symbols) int64 shares attributed to each book
+    costs: np.ndarray        # (bars, strategies) costs attributed to each book
+    cash: np.ndarray         # (bars, strategies) book cash after each bar
+    equity: np.ndarray       # (bars, strategies) book equity after each bar
+    net_orders: int          # orders sent after netting
+    gross_orders: int        # orders the strategies would have sent on their own
+    net_cost: float          # total modeled cost after netting
+    gross_cost: float        # total modeled cost without netting
+
+
+class OrderNetter:
+    """
+    Nets strategy target positions into one order per symbol and keeps each
+    strategy's virtual book.
+
+    Targets are positions to hold after each bar's close, as in
+    SignalEvents.from_targets; orders fill at that close. run() covers a
+    whole path with array operations over the (bars, strategies, symbols)
+    cube; step() does one bar, for live use. Both continue from the books'
+    current state, so a path can be fed in chunks.
+
+    Args:
+        n_strategies (int): number of strategies (books)
+        n_symbols (int): number of symbols
+        cash (float or array): starting cash of each book; a scalar is
+            given to every book (default 1M)
+        cost_per_share (float): modeled cost per share traded (default 0)
+        cost_bps (float): modeled cost in basis points of notional (default 0)
+    """
+
+    def __init__(self, n_strategies: int, n_symbols: int, cash=1_000_000,
+                 cost_per_share: float = 0.0, cost_bps: float = 0.0):
+        if n_strategies < 1 or n_symbols < 1:
+            raise ValueError("n_strategies and n_symbols must be >= 1")
+        if cost_per_share < 0 or cost_bps < 0:
+            raise ValueError("costs must be >= 0")
+        self.n_strategies = n_strategies
+        self.n_symbols = n_symbols
+        self.cost_per_share = cost_per_share
+        self.cost_bps = cost_bps
+        self.cash = np.broadcast_to(np.asarray(cash, dtype=np.float64), (n_strategies,)).copy()
+        self.positions = np.zeros((n_strategies, n_symbols), dtype=np.int64)
+
+    def run(self, targets: np.ndarray, prices: np.ndarray) -> Netted:
+        """
+        Net a whole path of targets.
+
+        Args:
+            targets: (bars, strategies, symbols) integer target positions
+            prices: (bars, symbols) prices
+
+        Returns:
+            Netted
+
+        Raises:
+            ValueError: on mismatched shapes, or if the combined cash of the
+                books goes negative on a bar with a net buy
+        """
+        targets = np.asarray(targets)
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(targets)
+        if targets.shape[1:] != self.positions.shape or prices.shape != (n, self.n_symbols):
+            raise ValueError("targets must be (bars, strategies, symbols) and prices (bars, symbols)")
+        targets = targets.astype(np.int64, copy=False)
+
+        fills = np.diff(targets, axis=0, prepend=self.positions[None])
+        trades = fills.sum(axis=1)
+        gross = np.abs(fills)
+        traded = gross.sum(axis=1)
+        net_cost = self._cost(np.abs(trades), prices)
+        # cost shares: each book's |fill| over the symbol's gross traded on that bar
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_share = np.where(traded > 0, net_cost / traded, 0.0)
+        costs = np.einsum('nsk,nk->ns', gross, per_share)
+        flows = -np.einsum('nsk,nk->ns', fills, prices) - costs
+        cash = self.cash + np.cumsum(flows, axis=0)
+        buying = (trades > 0).any(axis=1)
+        if np.any(buying & (cash.sum(axis=1) < 0)):
+            raise ValueError("Insufficient cash")
+        equity = cash + np.einsum('nsk,nk->ns', targets, prices)
+
+        result = Netted(
+            trades=trades, fills=fills, costs=costs, cash=cash, equity=equity,
+            net_orders=int(np.count_nonzero(trades)), gross_orders=int(np.count_nonzero(fills)),
+            net_cost=float(net_cost.sum()), gross_cost=float(self._cost(gross, prices[:, None, :]).sum()),
+        )
+        if n:
+            self.positions = targets[-1].copy()
+            self.cash = cash[-1].copy()
+        return result
+
+    def step(self, targets: np.ndarray, prices: np.ndarray, brokers: list = None) -> np.ndarray:
+        """
+        Net one bar's targets and update the books.
+
+        The bar is netted and checked (as in run()) before any order is
+        sent, so a bar the books cannot afford reaches no broker.
+
+        Args:
+            targets: (strategies, symbols) target positions after this bar
+            prices: (symbols,) prices of this bar
+            brokers (list): optional Broker per symbol; each nonzero net
+                order is sent to its symbol's broker as one market order,
+                in symbol order
+
+        Returns:
+            np.ndarray: (symbols,) int64 net shares traded
+
+        Raises:
+            ValueError: as run(), or if brokers is not one per symbol
+            Exception: whatever a broker raises on rejecting an order; the
+                books are restored to before the bar, but orders already
+                sent for earlier symbols stay filled at their brokers
+        """
+        targets = np.asarray(targets, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if brokers is not None and len(brokers) != self.n_symbols:
+            raise ValueError("need one broker per symbol")
+        before = self.get_state()
+        trades = self.run(targets[None], prices[None]).trades[0]
+        if brokers is not None:
+            try:
+                for k in np.flatnonzero(trades):
+                    brokers[k].market_order('BUY' if trades[k] > 0 else 'SELL', int(abs(trades[k])),
+                                            float(prices[k]))
+            except Exception:
+                self.set_state(before)
+                raise
+        return trades
+
+    def get_state(self) -> dict:
+        """Return the books' state, e.g. for checkpointing."""
+        return {'cash': self.cash.copy(), 'positions': self.positions.copy()}
+
+    def set_state(self, state: dict) -> None:
+        """Restore state saved by get_state()."""
+        self.cash = np.array(state['cash'], dtype=np.float64)
+        self.positions = np.array(state['positions'], dtype=np.int64)
+
+    def _cost(self, shares, prices):
+        """Modeled cost of trading |shares| at prices (element-wise)."""
+        return shares * (self.cost_per_share + prices * (self.cost_bps * 1e-4))
@@ -0,0 +1,288 @@
+import numpy as np
+
+
+ORDER_TYPES = ("LIMIT", "STOP", "STOP_LIMIT")
+
+FILL_DTYPE = np.dtype([
+    ('order_id', np.int64),
+    ('bar', np.int64),
+    ('side', 'U4'),
+    ('qty', np.int64),
+    ('price', np.float64),
+])
+
+
+class OrderBook:
+    """
+    Resting limit, stop and stop-limit orders, matched against bar ranges.
+
+    Orders are stored column-wise; match() finds the fill bar of every
+    resting order at once with vectorized first-crossing searches over the
+    high/low arrays, so matching costs O(orders x log(bars)) array work
+    instead of a Python check of every order on every bar.
+
+    Fill rules (no look-ahead; an order can fill from its `start` bar on):
+    - BUY LIMIT L fills when low <= L, at L (or the open, if it gaps below L)
+    - SELL LIMIT L fills when high >= L, at L (or the open, if above L)
+    - BUY STOP S fills when high >= S, at S (or the open, if it gaps above S)
+    - SELL STOP S fills when low <= S, at S (or the open, if below S)
+    - STOP_LIMIT triggers like a stop; if the trigger price is within the
+      limit it fills there, otherwise it rests as a limit from the next bar
+
+    Example:
+        book = OrderBook()
+        book.add("BUY", 10, "LIMIT", limit_price=95.0, start=1)
+        fills = book.match(high, low)   # structured array, one row per fill
+    """
+
+    def __init__(self):
+        self._side = []
+        self._qty = []
+        self._type = []
+        self._limit = []
+        self._stop = []
+        self._start = []
+        self._active = []
+
+    def __len__(self) -> int:
+        """Number of resting (unfilled) orders."""
+        return sum(self._active)
+
+    def add(self, side: str, qty: int, order_type: str, limit_price: float = None,
+            stop_price: float = None, start: int = 0) -> int:
+        """
+        Place a resting order.
+
+        Args:
+            side (str): "BUY" or "SELL"
+            qty (int): number of shares (must be > 0)
+            order_type (str): "LIMIT", "STOP" or "STOP_LIMIT"
+            limit_price (float): required for LIMIT and STOP_LIMIT
+            stop_price (float): required for STOP and STOP_LIMIT
+            start (int): first bar on which the order may fill
+
+        Returns:
+            int: order id
+
+        Raises:
+            ValueError: on invalid side, qty, order type or missing prices
+        """
+        if side not in ("BUY", "SELL"):
+            raise ValueError(f"Invalid side: {side}")
+        if qty <= 0:
+            raise ValueError("qty must be > 0")
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Invalid order type: {order_type}")
+        if order_type != "STOP" and limit_price is None:
+            raise ValueError(f"{order_type} order requires limit_price")
+        if order_type != "LIMIT" and stop_price is None:
+            raise ValueError(f"{order_type} order requires stop_price")
+
+        self._side.append(side)
+        self._qty.append(qty)
+        self._type.append(order_type)
+        self._limit.append(np.nan if limit_price is None else limit_price)
+        self._stop.append(np.nan if stop_price is None else stop_price)
+        self._start.append(start)
+        self._active.append(True)
+        return len(self._side) - 1
+
+    def cancel(self, order_id: int) -> None:
+        """Remove a resting order from matching."""
+        self._active[order_id] = False
+
+    def get_state(self) -> dict:
+        """Return every order (filled/cancelled ones as inactive), e.g. for checkpointing."""
+        return {'side': list(self._side), 'qty': list(self._qty), 'type': list(self._type),
+                'limit': list(self._limit), 'stop': list(self._stop), 'start': list(self._start),
+                'active': list(self._active)}
+
+    def set_state(self, state: dict) -> None:
+        """Restore orders saved by get_state(); order ids are kept."""
+        self._side = np.asarray(state['side'], dtype=str).tolist()
+        self._qty = np.asarray(state['qty'], dtype=np.int64).tolist()
+        self._type = np.asarray(state['type'], dtype=str).tolist()
+        self._limit = np.asarray(state['limit'], dtype=np.float64).tolist()
+        self._stop = np.asarray(state['stop'], dtype=np.float64).tolist()
+        self._start = np.asarray(state['start'], dtype=np.int64).tolist()
+        self._active = np.asarray(state['active'], dtype=bool).tolist()
+
+    def match(self, high: np.ndarray, low: np.ndarray, open: np.ndarray = None,
+              remove: bool = True) -> np.ndarray:
+        """
+        Find fills for all resting orders over the given bars.
+
+        Filled orders are removed from the book (unless `remove` is False,
+        for a caller that cancels each fill once it is booked); unfilled
+        ones keep resting.
+
+        Args:
+            high: per-bar highs
+            low: per-bar lows
+            open: optional per-bar opens, used for gap fills
+            remove (bool): drop filled orders from the book (default True)
+
+        Returns:
+            structured np.ndarray (FILL_DTYPE) sorted by (bar, order_id)
+        """
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        if open is not None:
+            open = np.asarray(open, dtype=np.float64)
+        ids = np.flatnonzero(self._active)
+        side = np.asarray(self._side, dtype='U4')[ids]
+        order_type = np.asarray(self._type, dtype='U10')[ids]
+        limit = np.asarray(self._limit, dtype=np.float64)[ids]
+        stop = np.asarray(self._stop, dtype=np.float64)[ids]
+        start = np.asarray(self._start, dtype=np.int64)[ids]
+        buy = side == "BUY"
+
+        fill_bar = np.full(len(ids), -1, dtype=np.int64)
+        fill_price = np.full(len(ids), np.nan)
+        highs = _Crossings(high, above=True)
+        lows = _Crossings(low, above=False)
+
+        # plain limits: buy on low <= L, sell on high >= L
+        is_limit = order_type == "LIMIT"
+        _fill_limits(is_limit, buy, limit, start, highs, lows, open, fill_bar, fill_price)
+
+        # stops (and the stop leg of stop-limits): buy on high >= S, sell on low <= S
+        has_stop = order_type != "LIMIT"
+        trigger = np.full(len(ids), -1, dtype=np.int64)
+        for leg, crossings in ((has_stop & buy, highs), (has_stop & ~buy, lows)):
+            trigger[leg] = crossings.first(start[leg], stop[leg])
+        triggered = trigger >= 0
+        trigger_price = np.full(len(ids), np.nan)
+        trigger_price[triggered] = stop[triggered]
+        if open is not None:
+            # a gap through the stop fills at the (worse) open
+            gap_open = open[trigger[triggered]]
+            trigger_price[triggered] = np.where(
+                buy[triggered], np.fmax(gap_open, stop[triggered]), np.fmin(gap_open, stop[triggered]))
+
+        is_stop = triggered & (order_type == "STOP")
+        fill_bar[is_stop] = trigger[is_stop]
+        fill_price[is_stop] = trigger_price[is_stop]
+
+        # stop-limits: fill at the trigger if it is within the limit, else rest as a limit
+        is_stop_limit = triggered & (order_type == "STOP_LIMIT")
+        within = np.where(buy, trigger_price <= limit, trigger_price >= limit)
+        now = is_stop_limit & within
+        fill_bar[now] = trigger[now]
+        fill_price[now] = trigger_price[now]
+        later = is_stop_limit & ~within
+        _fill_limits(later, buy, limit, trigger + 1, highs, lows, open, fill_bar, fill_price)
+
+        filled = fill_bar >= 0
+        fills = np.empty(int(filled.sum()), dtype=FILL_DTYPE)
+        fills['order_id'] = ids[filled]
+        fills['bar'] = fill_bar[filled]
+        fills['side'] = side[filled]
+        fills['qty'] = np.asarray(self._qty, dtype=np.int64)[ids][filled]
+        fills['price'] = fill_price[filled]
+        if remove:
+            for order_id in fills['order_id']:
+                self._active[order_id] = False
+        return np.sort(fills, order=['bar', 'order_id'])
+
+
+def _fill_limits(mask, buy, limit, start, highs, lows, open, fill_bar, fill_price) -> None:
+    """Resolve limit legs selected by `mask` in place (buy: low <= L, sell: high >= L)."""
+    for leg, crossings in ((mask & buy, lows), (mask & ~buy, highs)):
+        bars = crossings.first(start[leg], limit[leg])
+        hit = bars >= 0
+        rows = np.flatnonzero(leg)[hit]
+        fill_bar[rows] = bars[hit]
+        price = limit[rows]
+        if open is not None:
+            # a gap through the limit fills at the (better) open
+            price = np.where(buy[rows], np.fmin(open[bars[hit]], price), np.fmax(open[bars[hit]], price))
+        fill_price[rows] = price
+
+
+class _Crossings:
+    """
+    First-crossing search over one price array.
+
+    first(starts, levels) returns, per query, the first bar t >= start with
+    values[t] >= level (above=True) or values[t] <= level (above=False),
+    or -1. The array is split into blocks of BLOCK bars; a sparse table of
+    block extremes finds the first candidate block in O(log(n / BLOCK))
+    vectorized steps, and only two blocks per query are scanned directly.
+    """
+
+    BLOCK = 64
+    QUERIES = 1 << 14
+
+    def __init__(self, values: np.ndarray, above: bool):
+        self.values = values
+        self.above = above
+        n = len(values)
+        n_blocks = -(-n // self.BLOCK)
+        pad = -np.inf if above else np.inf
+        padded = np.full(n_blocks * self.BLOCK, pad)
+        padded[:n] = np.where(np.isnan(values), pad, values)
+        self._padded = padded
+        reduce = np.max if above else np.min
+        combine = np.maximum if above else np.minimum
+        level = reduce(padded.reshape(n_blocks, self.BLOCK), axis=1)
+        self._levels = [level]
+        width = 1
+        while 2 * width <= n_blocks:
+            level = combine(level[:-width], level[width:])
+            self._levels.append(level)
+            width *= 2
+
+    def _hits(self, values, levels):
+        return values >= levels if self.above else values <= levels
+
+    def first(self, starts: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        starts = np.asarray(starts, dtype=np.int64)
+        levels = np.asarray(levels, dtype=np.float64)
+        result = np.full(len(starts), -1, dtype=np.int64)
+        # bound the (queries x BLOCK) scratch arrays
+        for lo in range(0, len(starts), self.QUERIES):
+            hi = lo + self.QUERIES
+            result[lo:hi] = self._first(starts[lo:hi], levels[lo:hi])
+        return result
+
+    def _first(self, starts, levels):
+        result = np.full(len(starts), -1, dtype=np.int64)
+        n = len(self.values)
+        live = starts < n
+        if not live.any():
+            return result
+        block = self.BLOCK
+        offsets = np.arange(block)
+
+        # 1. the rest of each query's starting block
+        rows = np.flatnonzero(live)
+        first_block = starts[rows] // block
+        idx = starts[rows, None] + offsets
+        in_block = idx < (first_block[:, None] + 1) * block
+        hits = self._hits(self._padded[np.minimum(idx, len(self._padded) - 1)], levels[rows, None]) & in_block
+        found = hits.any(axis=1)
+        result[rows[found]] = starts[rows[found]] + hits[found].argmax(axis=1)
+
+        # 2. first later block whose extreme crosses the level (binary lifting)
+        rows = rows[~found]
+        pos = first_block[~found] + 1
+        lvl = levels[rows]
+        n_blocks = len(self._levels[0])
+        for k in range(len(self._levels) - 1, -1, -1):
+            width = 1 << k
+            table = self._levels[k]
+            can_jump = pos + width <= n_blocks
+            safe = np.where(can_jump, pos, 0)
+            skip = can_jump & ~self._hits(table[safe], lvl)
+            pos = pos + np.where(skip, width, 0)
+        in_range = pos < n_blocks
+        rows, pos, lvl = rows[in_range], pos[in_range], lvl[in_range]
+        crossed = self._hits(self._levels[0][pos], lvl)
+        rows, pos, lvl = rows[crossed], pos[crossed], lvl[crossed]
+
+        # 3. the exact bar inside that block
+        idx = pos[:, None] * block + offsets
+        hits = self._hits(self._padded[idx], lvl[:, None])
+        result[rows] = pos * block + hits.argmax(axis=1)
+        return result
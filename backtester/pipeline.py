@@ -0,0 +1,266 @@
+"""
+Background prefetching of price chunks.
+
+In a chunked or multi-file run the engine would otherwise wait while the
+next block of prices is read and decoded. A Prefetcher runs the loader in
+a background thread, one chunk ahead (or `depth` chunks), into a fixed
+pool of preallocated buffers:
+
+- the loader fills a free buffer in place and hands it over through a
+  bounded queue
+- the consumer works on one buffer; asking for the next chunk returns the
+  previous buffer to the pool
+
+So I/O overlaps with compute, and memory stays at depth + 1 buffers
+however many chunks or files pass through. Reads into the buffers use
+readinto() on the raw .npy payload, which releases the GIL.
+
+run_chunks() drives a Backtester over such a stream, carrying broker
+state and a warm-up tail of prices across chunk boundaries.
+
+Example:
+    source = NpyChunks("prices.npy", chunk=1_000_000)
+    metrics = OnlineMetrics()
+    with Prefetcher(source, source.items, source.capacity, dtype=source.dtype) as chunks:
+        for result in run_chunks(backtester, (chunk.data for chunk in chunks)):
+            metrics.update_many(result['equity'], result['position'])
+"""
+import queue
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+_STOP = object()
+
+
+class Chunk(NamedTuple):
+    """One loaded chunk: the loader's item and a view of the filled buffer."""
+    item: object
+    data: np.ndarray
+
+
+class Prefetcher:
+    """
+    Iterate over loaded chunks while a background thread loads the next ones.
+
+    The yielded Chunk.data is a view of a pooled buffer and is only valid
+    until the next chunk is requested; copy it to keep it.
+
+    Args:
+        load: callable load(item, out) -> int that fills out[:n] in place
+            and returns n (e.g. NpyChunks, NpyFiles)
+        items: iterable of items to load, in order
+        capacity (int): rows per buffer (the largest chunk)
+        depth (int): chunks loaded ahead of the consumer (default 1, i.e.
+            double buffering)
+        dtype: buffer dtype (default float64)
+
+    Example:
+        with Prefetcher(NpyFiles(paths), paths, NpyFiles(paths).capacity) as chunks:
+            for chunk in chunks:
+                backtester.run_array(chunk.data)
+    """
+
+    def __init__(self, load, items, capacity: int, depth: int = 1, dtype=np.float64):
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self.load = load
+        self.buffers = [np.empty(capacity, dtype=dtype) for _ in range(depth + 1)]
+        self.load_seconds = 0.0   # time the background thread spent loading
+        self.wait_seconds = 0.0   # time the consumer spent waiting for chunks
+        self._items = iter(items)
+        self._free = queue.Queue()
+        for index in range(len(self.buffers)):
+            self._free.put(index)
+        self._ready = queue.Queue(maxsize=depth)
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._loader, name="prefetch-loader", daemon=True)
+        self._thread.start()
+
+    def __iter__(self):
+        held = None
+        try:
+            while True:
+                if held is not None:
+                    self._free.put(held)
+                    held = None
+                start = time.perf_counter()
+                entry = self._ready.get()
+                self.wait_seconds += time.perf_counter() - start
+                if entry is _STOP:
+                    return
+                if isinstance(entry, BaseException):
+                    raise entry
+                item, held, n = entry
+                yield Chunk(item, self.buffers[held][:n])
+        finally:
+            if held is not None:
+                self._free.put(held)
+
+    def close(self) -> None:
+        """Stop the loader thread (e.g. when leaving the loop early)."""
+        self._stopping.set()
+        for index in range(len(self.buffers)):
+            self._free.put(index)  # wake a loader waiting for a buffer
+        while self._thread.is_alive():
+            try:
+                self._ready.get(timeout=0.01)  # unblock a loader waiting to hand over
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _loader(self) -> None:
+        try:
+            for item in self._items:
+                index = self._free.get()
+                if self._stopping.is_set():
+                    return
+                start = time.perf_counter()
+                n = self.load(item, self.buffers[index])
+                self.load_seconds += time.perf_counter() - start
+                self._ready.put((item, index, n))
+            self._ready.put(_STOP)
+        except Exception as exc:  # re-raised in the consumer
+            self._ready.put(exc)
+
+
+class NpyChunks:
+    """
+    Loader for consecutive row ranges of one 1-D .npy file.
+
+    Args:
+        path (str): .npy file
+        chunk (int): rows per chunk
+
+    Attributes:
+        items: list of (lo, hi) row ranges covering the file
+        capacity: rows of the largest chunk
+        dtype: the file's dtype
+    """
+
+    def __init__(self, path: str, chunk: int):
+        if chunk < 1:
+            raise ValueError("chunk must be >= 1")
+        self.path = path
+        n, self.dtype, self._offset = _npy_header(path)
+        self.items = [(lo, min(lo + chunk, n)) for lo in range(0, n, chunk)]
+        self.capacity = min(chunk, n)
+
+    def __call__(self, item, out: np.ndarray) -> int:
+        lo, hi = item
+        _check_buffer(out, self.dtype)
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset + lo * self.dtype.itemsize)
+            _read_into(f, out[:hi - lo])
+        return hi - lo
+
+
+class NpyFiles:
+    """
+    Loader for whole 1-D .npy files (one item per path), e.g. one per symbol.
+
+    Args:
+        paths (list): .npy files, all of the same dtype
+
+    Attributes:
+        capacity: rows of the longest file
+        dtype: the files' dtype
+    """
+
+    def __init__(self, paths: list):
+        self._headers = {path: _npy_header(path) for path in paths}
+        dtypes = {dtype for _, dtype, _ in self._headers.values()}
+        if len(dtypes) > 1:
+            raise ValueError("all files must have the same dtype")
+        self.dtype = dtypes.pop() if dtypes else np.dtype(np.float64)
+        self.capacity = max((n for n, _, _ in self._headers.values()), default=0)
+
+    def __call__(self, path: str, out: np.ndarray) -> int:
+        n, _, offset = self._headers[path]
+        _check_buffer(out, self.dtype)
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            _read_into(f, out[:n])
+        return n
+
+
+def run_chunks(backtester, chunks, warmup: int = None):
+    """
+    Run a Backtester over a stream of consecutive price chunks.
+
+    Each chunk is run with the last `warmup` bars of the previous one
+    prepended, resuming broker state and history from them (as
+    SuccessiveHalving does when extending a run), so signals and trades
+    across boundaries are those of one run over the whole series.
+
+    Args:
+        backtester: Backtester (without a sizer)
+        chunks: iterable of 1-D price arrays, e.g. Chunk.data from a
+            Prefetcher (buffers may be reused: nothing is kept by reference)
+        warmup (int): bars of history the strategy needs for the first
+            signal of a chunk (default strategy.lookback + 1)
+
+    Yields:
+        run_array() result rows of each chunk's bars
+
+    Raises:
+        ValueError: if the backtester has a sizer
+    """
+    if backtester.sizer is not None:
+        raise ValueError("run_chunks() does not support sizers (sizing capital would change per chunk)")
+    warmup = backtester.strategy.lookback + 1 if warmup is None else warmup
+    if warmup < 1:
+        raise ValueError("warmup must be >= 1")
+    tail = None
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        if tail is None:
+            window = np.asarray(chunk, dtype=np.float64)
+            out = backtester.run_array(window)
+            new = out
+        else:
+            prices, cash, position = tail
+            window = np.concatenate((prices, chunk))
+            resume = backtester.get_state()
+            resume.update(cursor=len(prices) - 1, cash=cash, position=position)
+            out = backtester.run_array(window, resume=resume)
+            new = out[len(prices):]
+        keep = slice(max(len(window) - warmup, 0), None)
+        tail = (window[keep].copy(), out['cash'][keep].copy(), out['position'][keep].copy())
+        yield new
+
+
+def _npy_header(path):
+    """Length, dtype and payload offset of a 1-D .npy file."""
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        if len(shape) != 1 or dtype.hasobject:
+            raise ValueError(f"{path}: expected a 1-D numeric array")
+        return shape[0], dtype, f.tell()
+
+
+def _check_buffer(out, dtype):
+    if out.dtype != dtype:
+        raise ValueError(f"buffer dtype {out.dtype} does not match the file's {dtype}")
+
+
+def _read_into(f, out):
+    view = memoryview(out).cast('B')
+    while view.nbytes:
+        n = f.readinto(view)
+        if not n:
+            raise ValueError(f"{f.name}: file is shorter than its header says")
+        view = view[n:]
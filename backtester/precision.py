@@ -0,0 +1,79 @@
+"""
+Precision cost of the float32 computation mode.
+
+precision_report() runs the same prices through the float64 and float32
+array paths and reports how far float32 moves returns, volatility, signals
+and (for a single series) the backtest itself, so a float32 sweep can be
+trusted, or re-run in float64 where it matters.
+
+Example:
+    report = precision_report(prices, lookback=20)
+    if report['signal_flips']:
+        print("float32 changed", report['signal_flips'], "signals; first at bar", report['first_flip'])
+"""
+import numpy as np
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def precision_report(prices: np.ndarray, lookback: int = 20, cash: float = 1_000_000) -> dict:
+    """
+    Compare float32 against float64 on one price series or panel.
+
+    Args:
+        prices: np.ndarray of prices, shape (n,) or (n, k)
+        lookback (int): strategy lookback
+        cash (float): starting cash for the backtest comparison
+
+    Returns:
+        dict with
+        - max_abs_return_error, max_abs_vol_error: largest absolute deviation
+        - max_rel_vol_error: largest deviation relative to the float64 vol
+        - signal_flips: number of bars (x series) whose signal differs
+        - first_flip: first bar with a differing signal, -1 if none
+        - near_threshold: bars where the float64 return is closer to +/- vol
+          than the float32 error, i.e. where float32 could flip the signal
+        - position_mismatches, max_abs_equity_error, max_rel_equity_error:
+          backtest deviations (1-D prices only; NaN for a panel)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    exact = VolatilityBreakoutStrategy(lookback)
+    fast = VolatilityBreakoutStrategy(lookback, dtype=np.float32)
+    signals64, vol64 = exact.signals_with_vol(prices)
+    signals32, vol32 = fast.signals_with_vol(prices)
+    ret64 = exact.returns(prices)
+    ret32 = fast.returns(prices)
+
+    ret_error = np.abs(ret32 - ret64)
+    vol_error = np.abs(vol32 - vol64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel_vol_error = np.where(vol64 > 0, vol_error / vol64, 0.0)
+    margin = np.minimum(np.abs(ret64 - vol64), np.abs(ret64 + vol64))
+    # a zero return is signal 0 against any vol, in either precision
+    near = (ret64 != 0) & (margin <= ret_error + vol_error)
+    flips = signals32 != signals64
+    flip_bars = np.flatnonzero(flips.reshape(len(prices), -1).any(axis=1))
+
+    report = {
+        'max_abs_return_error': float(ret_error.max()),
+        'max_abs_vol_error': float(vol_error.max()),
+        'max_rel_vol_error': float(rel_vol_error.max()),
+        'signal_flips': int(flips.sum()),
+        'first_flip': int(flip_bars[0]) if len(flip_bars) else -1,
+        'near_threshold': int(near.sum()),
+        'position_mismatches': np.nan,
+        'max_abs_equity_error': np.nan,
+        'max_rel_equity_error': np.nan,
+    }
+    if prices.ndim == 1:
+        result64 = Backtester(exact, Broker(cash)).run_array(prices)
+        result32 = Backtester(fast, Broker(cash), dtype=np.float32).run_array(prices)
+        equity_error = np.abs(result32['equity'].astype(np.float64) - result64['equity'])
+        report.update(
+            position_mismatches=int(np.sum(result32['position'] != result64['position'])),
+            max_abs_equity_error=float(equity_error.max()),
+            max_rel_equity_error=float((equity_error / np.abs(result64['equity'])).max()),
+        )
+    return report
@@ -0,0 +1,115 @@
+"""
+Frozen reference implementations of the strategy, broker and engine loop.
+
+These are verbatim copies of the original, straightforward pandas/Python
+code. They are the oracle that optimized paths (signals_array, run_array,
+LiveTrader, UniverseBacktester, ...) are checked against by
+backtester.difftest, so they must stay simple and must not be optimized
+or refactored along with the code they check.
+"""
+import numpy as np
+import pandas as pd
+
+
+class ReferenceStrategy:
+    """
+    Reference VolatilityBreakoutStrategy: pandas pct_change/rolling().std().
+
+    Args:
+        lookback (int): Number of days for rolling volatility window (default 20)
+    """
+
+    def __init__(self, lookback: int = 20):
+        self.lookback = lookback
+
+    def signals(self, prices: pd.Series) -> pd.Series:
+        """Signals in {-1, 0, 1} aligned with prices index."""
+        if len(prices) == 0:
+            raise ValueError("Prices cannot be empty")
+        pct_chg = prices.pct_change().fillna(0)
+        vol = pct_chg.rolling(self.lookback).std().fillna(0)
+        signals = np.where(pct_chg > vol, 1, 0)
+        signals = np.where(pct_chg < -vol, -1, signals)
+        return pd.Series(signals, index=prices.index)
+
+    def returns_and_vol(self, prices: pd.Series):
+        """The (returns, volatility) pair the signals are compared on."""
+        pct_chg = prices.pct_change().fillna(0)
+        return pct_chg, pct_chg.rolling(self.lookback).std().fillna(0)
+
+
+class ReferenceBroker:
+    """
+    Reference Broker: market orders only, no slippage, no fees.
+
+    Args:
+        cash (float): starting capital (default 1M)
+    """
+
+    def __init__(self, cash: float = 1_000_000):
+        self.cash = cash
+        self.position = 0
+
+    def market_order(self, side: str, qty: int, price: float) -> None:
+        """Execute a market order; raises ValueError on bad input or insufficient cash."""
+        if qty <= 0:
+            raise ValueError("qty must be > 0")
+
+        if side == "BUY":
+            cost = qty * price
+            if cost > self.cash:
+                raise ValueError("Insufficient cash")
+            self.cash -= cost
+            self.position += qty
+        elif side == "SELL":
+            # allow short selling
+            self.cash += qty * price
+            self.position -= qty
+        else:
+            raise ValueError(f"Invalid side: {side}")
+
+
+class ReferenceBacktester:
+    """
+    Reference Backtester loop: one .iloc lookup per bar, results in lists.
+
+    Args:
+        strategy: object with .signals(prices) -> pd.Series method
+        broker: object with .market_order() method
+
+    Returns:
+        pd.DataFrame with columns [equity, cash, position] indexed by date
+    """
+
+    def __init__(self, strategy, broker):
+        self.strategy = strategy
+        self.broker = broker
+
+    def run(self, prices: pd.Series) -> pd.DataFrame:
+        """Run the backtest over a price series."""
+        signals = self.strategy.signals(prices)
+        equity = [self.broker.cash + self.broker.position * prices.iloc[0], ]
+        cash = [self.broker.cash,]
+        position = [self.broker.position,]
+        for i in range(1, len(prices)):
+            target_position = signals.iloc[i-1]
+            curr_position = self.broker.position
+            qty = target_position - curr_position
+            abs_qty = abs(qty)
+
+            if qty != 0:
+                side = "BUY" if qty > 0 else "SELL"
+                # execute trade
+                self.broker.market_order(side, abs_qty, prices.iloc[i])
+
+            cash.append(self.broker.cash)
+            position.append(self.broker.position)
+            equity.append(cash[-1] + position[-1] * prices.iloc[i])
+
+        result = pd.DataFrame({
+            'equity': equity,
+            'cash': cash,
+            'position': position
+        }, index=prices.index)
+
+        return result
@@ -0,0 +1,312 @@
+"""
+HTML/SVG/PNG reports for backtest results and sweep panels.
+
+Curves are downsampled before rendering, so a report's size and build time
+depend on the chart width, not on the number of bars:
+
+- minmax: the first/last point plus the lowest and highest point of each
+  bucket, so every spike and drawdown trough survives
+- lttb: Largest-Triangle-Three-Buckets, one point per bucket chosen to
+  keep the visual shape
+
+Both work on whole arrays (reshape + argmin/argmax for minmax; one
+vectorized argmax per bucket for LTTB). Summary tables come from the
+result arrays: OnlineMetrics.update_many for returns, risk and turnover,
+and extract_trades/summarize for trade statistics when prices are given.
+
+Example:
+    report = Report("Breakout sweep")
+    report.add("lb20", backtester.run_array(prices), prices)
+    report.add_panel(equity, positions, prices, names=[f"lb{lb}" for lb in lookbacks])
+    report.to_html("report.html")
+    report.to_png("report.png")          # needs matplotlib
+"""
+import html
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from backtester.metrics import OnlineMetrics
+from backtester.trades import extract_trades, summarize
+
+_METHODS = ('lttb', 'minmax')
+_COLORS = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f')
+
+
+def minmax_downsample(y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Indices of the first and last point plus each bucket's min and max.
+
+    Args:
+        y: 1-D values
+        points (int): target number of points (>= 4); buckets = points // 2 - 1
+
+    Returns:
+        sorted int64 indices into y, at most `points` of them
+    """
+    n = len(y)
+    if n <= points:
+        return np.arange(n)
+    buckets = max(points // 2 - 1, 1)
+    size = -(-n // buckets)
+    padded = np.empty(buckets * size, dtype=y.dtype)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    blocks = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    idx = np.concatenate(([0, n - 1], offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)))
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def lttb(y: np.ndarray, points: int, x: np.ndarray = None) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point; from each of the `points - 2` buckets
+    in between keeps the point forming the largest triangle with the point
+    kept from the previous bucket and the mean of the next bucket.
+
+    Args:
+        y: 1-D values
+        points (int): number of points to keep (>= 3)
+        x: optional 1-D x coordinates (default: bar number)
+
+    Returns:
+        sorted int64 indices into y
+    """
+    n = len(y)
+    if n <= points:
+        return np.arange(n)
+    if points < 3:
+        raise ValueError("lttb needs points >= 3")
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    # next-bucket means for every bucket, in one pass; the last bucket's "next" is the last point
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+    out = np.empty(points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = mean_x[i + 1], mean_y[i + 1]
+        # twice the area of the triangle (a, b, c) for every candidate b in the bucket
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample(y: np.ndarray, points: int, method: str = 'lttb') -> np.ndarray:
+    """Indices of a shape-preserving subset of y (see minmax_downsample and lttb)."""
+    if method not in _METHODS:
+        raise ValueError(f"method must be one of {_METHODS}")
+    return lttb(y, points) if method == 'lttb' else minmax_downsample(y, points)
+
+
+class Curve(NamedTuple):
+    """A downsampled curve: bar numbers and values."""
+    x: np.ndarray
+    y: np.ndarray
+
+
+class Report:
+    """
+    Collects runs, keeping only their downsampled curves and summary rows,
+    and renders them as HTML (inline SVG) or PNG.
+
+    Args:
+        title (str): report title
+        points (int): points per curve after downsampling (default 2000)
+        method (str): 'lttb' (default) or 'minmax'
+        max_curves (int): curves drawn per chart; a larger panel draws the
+            runs with the highest final equity (default 20). Every run is
+            still in the summary table.
+        periods_per_year (int): annualization factor (default 252)
+    """
+
+    def __init__(self, title: str = "Backtest report", points: int = 2000, method: str = 'lttb',
+                 max_curves: int = 20, periods_per_year: int = 252):
+        if method not in _METHODS:
+            raise ValueError(f"method must be one of {_METHODS}")
+        if points < 4:
+            raise ValueError("points must be >= 4")
+        self.title = title
+        self.points = points
+        self.method = method
+        self.max_curves = max_curves
+        self.periods_per_year = periods_per_year
+        self.names = []
+        self.equity = []
+        self.drawdown = []
+        self.rows = []
+
+    def add(self, name: str, result, prices: np.ndarray = None) -> None:
+        """
+        Add one run.
+
+        Args:
+            name (str): label in charts and tables
+            result: run_array() array or BacktestResult (anything indexable
+                by 'equity' and 'position')
+            prices: optional prices of the run, for trade statistics
+                (default: a BacktestResult's own prices)
+        """
+        if prices is None:
+            prices = getattr(result, 'prices', None)
+        self._add(name, np.asarray(result['equity'], dtype=np.float64),
+                  np.asarray(result['position']), prices)
+
+    def add_panel(self, equity: np.ndarray, positions: np.ndarray, prices: np.ndarray = None,
+                  names: list = None) -> None:
+        """
+        Add a sweep panel.
+
+        Args:
+            equity: (n, runs) equity per bar and run
+            positions: (n, runs) positions, same shape
+            prices: optional (n,) or (n, runs) prices, for trade statistics
+            names (list): run labels (default run0, run1, ...)
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        positions = np.asarray(positions)
+        if equity.ndim != 2 or positions.shape != equity.shape:
+            raise ValueError("equity and positions must be (n, runs) arrays of the same shape")
+        runs = equity.shape[1]
+        names = [f"run{i}" for i in range(runs)] if names is None else list(names)
+        if len(names) != runs:
+            raise ValueError("need one name per run")
+        trades = None
+        if prices is not None:
+            trades = summarize(extract_trades(positions, prices), runs).to_dict('records')
+        for i in range(runs):
+            self._add(names[i], equity[:, i], positions[:, i], None, trades[i] if trades else None)
+
+    def summary(self) -> pd.DataFrame:
+        """Summary table, one row per run, indexed by name."""
+        return pd.DataFrame(self.rows, index=pd.Index(self.names, name='run'))
+
+    def to_svg(self, width: int = 900, height: int = 300, which: str = 'equity') -> str:
+        """Render the equity (or 'drawdown') curves as an SVG string."""
+        curves = self.equity if which == 'equity' else self.drawdown
+        shown = self._shown()
+        return _svg([curves[i] for i in shown], [self.names[i] for i in shown], width, height,
+                    f"{which.capitalize()}")
+
+    def to_html(self, path: str = None, width: int = 900) -> str:
+        """
+        Build a self-contained HTML report (inline SVG charts, summary table).
+
+        Args:
+            path (str): optional file to write
+            width (int): chart width in pixels
+
+        Returns:
+            str: the HTML document
+        """
+        table = self.summary().to_html(float_format=lambda v: f"{v:,.4g}", border=0)
+        doc = (
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(self.title)}</title>"
+            "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+            "td,th{padding:2px 8px;text-align:right}tr:nth-child(even){background:#f4f4f4}</style>"
+            f"</head><body><h1>{html.escape(self.title)}</h1>\n"
+            f"{self.to_svg(width, 300)}\n{self.to_svg(width, 180, 'drawdown')}\n"
+            f"<h2>Summary</h2>\n{table}\n</body></html>\n"
+        )
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(doc)
+        return doc
+
+    def to_png(self, path: str, width: float = 10, height: float = 6, dpi: int = 100) -> None:
+        """
+        Render the charts to a PNG with matplotlib.
+
+        Raises:
+            ImportError: if matplotlib is not installed
+        """
+        try:
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+        except ImportError as exc:
+            raise ImportError("to_png() needs matplotlib; use to_html() without it") from exc
+        fig, (top, bottom) = plt.subplots(2, 1, figsize=(width, height), sharex=True,
+                                          gridspec_kw={'height_ratios': [2, 1]})
+        for i in self._shown():
+            top.plot(*self.equity[i], label=self.names[i], linewidth=0.8)
+            bottom.plot(*self.drawdown[i], linewidth=0.8)
+        top.set_title(self.title)
+        top.set_ylabel('equity')
+        bottom.set_ylabel('drawdown')
+        bottom.set_xlabel('bar')
+        if len(self._shown()) <= 10:
+            top.legend(fontsize='small')
+        fig.tight_layout()
+        fig.savefig(path, dpi=dpi)
+        plt.close(fig)
+
+    def _add(self, name, equity, position, prices, trades=None):
+        if len(equity) != len(position):
+            raise ValueError("equity and position must have the same length")
+        if len(equity) == 0:
+            raise ValueError("cannot report an empty run")
+        metrics = OnlineMetrics(self.periods_per_year)
+        metrics.update_many(equity, position)
+        row = metrics.snapshot()
+        if prices is not None:
+            trades = summarize(extract_trades(position, prices), 1).iloc[0].to_dict()
+        if trades is not None:
+            # 'trades' already counts position changes; these are round trips
+            row.update({'round_trips' if key == 'trades' else key: value for key, value in trades.items()})
+        peaks = np.maximum.accumulate(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peaks > 0, equity / peaks - 1.0, 0.0)
+        self.names.append(name)
+        self.rows.append(row)
+        self.equity.append(self._curve(equity))
+        self.drawdown.append(self._curve(drawdown))
+
+    def _curve(self, y):
+        idx = downsample(y, self.points, self.method)
+        return Curve(idx, y[idx])
+
+    def _shown(self):
+        """Indices of the curves to draw: all, or the max_curves best by final equity."""
+        if len(self.names) <= self.max_curves:
+            return list(range(len(self.names)))
+        final = np.array([curve.y[-1] for curve in self.equity])
+        return sorted(np.argsort(-final, kind='stable')[:self.max_curves].tolist())
+
+
+def _svg(curves, names, width, height, title) -> str:
+    """Polyline chart of downsampled curves with a y-axis range and a legend."""
+    pad_left, pad_top, pad_bottom = 70, 20, 20
+    plot_w, plot_h = width - pad_left - 10, height - pad_top - pad_bottom
+    parts = [f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' "
+             f"font-size='11' font-family='sans-serif'>",
+             f"<text x='{pad_left}' y='13' font-weight='bold'>{html.escape(title)}</text>"]
+    if curves:
+        x_max = max(int(curve.x[-1]) for curve in curves) or 1
+        y_min = min(float(curve.y.min()) for curve in curves)
+        y_max = max(float(curve.y.max()) for curve in curves)
+        span = (y_max - y_min) or 1.0
+        for value, y_px in ((y_max, pad_top), (y_min, pad_top + plot_h)):
+            parts.append(f"<text x='{pad_left - 4}' y='{y_px + 4}' text-anchor='end'>{value:,.4g}</text>")
+        parts.append(f"<rect x='{pad_left}' y='{pad_top}' width='{plot_w}' height='{plot_h}' "
+                     "fill='none' stroke='#ccc'/>")
+        for i, (curve, name) in enumerate(zip(curves, names)):
+            px = pad_left + curve.x * (plot_w / x_max)
+            py = pad_top + (y_max - curve.y) * (plot_h / span)
+            coords = ' '.join(f"{a:.1f},{b:.1f}" for a, b in zip(px.tolist(), py.tolist()))
+            color = _COLORS[i % len(_COLORS)]
+            parts.append(f"<polyline fill='none' stroke='{color}' stroke-width='1' points='{coords}'>"
+                         f"<title>{html.escape(str(name))}</title></polyline>")
+        parts.append(f"<text x='{pad_left + plot_w}' y='{height - 4}' text-anchor='end'>bar {x_max:,}</text>")
+    parts.append("</svg>")
+    return ''.join(parts)
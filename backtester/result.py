@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+
+def result_dtype(with_timestamp: bool = False, dtype=np.float64) -> np.dtype:
+    """Structured dtype of Backtester.run_array() output (equity/cash in `dtype`)."""
+    fields = [('equity', dtype), ('cash', dtype), ('position', np.int64)]
+    if with_timestamp:
+        fields.insert(0, ('timestamp', np.int64))
+    return np.dtype(fields)
+
+
+def equity_of(cash: np.ndarray, position: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    """Equity per bar, cash + position * price, in the dtype of `cash`."""
+    return (cash + position * prices).astype(cash.dtype, copy=False)
+
+
+class BacktestResult:
+    """
+    Lazy view of a backtest's outputs.
+
+    Holds only the arrays the engine produces (cash and position) plus the
+    prices they were run on. Equity is derived on first access, and
+    pandas objects are built only by to_frame(), so a sweep that reads
+    final_equity pays for neither.
+
+    Indexing by field name ('equity', 'cash', 'position', 'timestamp')
+    works like on a run_array() result, so scoring functions written for
+    structured arrays accept a BacktestResult too.
+
+    Args:
+        cash (np.ndarray): cash after each bar
+        position (np.ndarray): int64 position after each bar
+        prices (np.ndarray): prices the run traded at
+        timestamps (np.ndarray): optional int64 epoch ns per bar
+        index (pd.Index): optional index for to_frame() (e.g. the input
+            Series' dates)
+
+    Example:
+        result = backtester.run_result(prices)
+        result.final_equity          # O(1), no arrays built
+        result.equity_array          # computed once, then cached
+        result.to_frame()            # DataFrame [equity, cash, position]
+    """
+
+    __slots__ = ('cash', 'position', 'prices', 'timestamps', 'index', '_equity')
+
+    def __init__(self, cash: np.ndarray, position: np.ndarray, prices: np.ndarray,
+                 timestamps: np.ndarray = None, index: pd.Index = None):
+        if not len(cash) == len(position) == len(prices):
+            raise ValueError("cash, position and prices must have the same length")
+        self.cash = cash
+        self.position = position
+        self.prices = prices
+        self.timestamps = timestamps
+        self.index = index
+        self._equity = None
+
+    def __len__(self) -> int:
+        return len(self.cash)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        if field == 'equity':
+            return self.equity_array
+        if field in ('cash', 'position'):
+            return getattr(self, field)
+        if field == 'timestamp' and self.timestamps is not None:
+            return self.timestamps
+        raise KeyError(field)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Position after each bar."""
+        return self.position
+
+    @property
+    def equity_array(self) -> np.ndarray:
+        """Equity after each bar (computed on first access)."""
+        if self._equity is None:
+            self._equity = equity_of(self.cash, self.position, self.prices)
+        return self._equity
+
+    @property
+    def final_equity(self) -> float:
+        """Equity after the last bar, from the last row only."""
+        return float(equity_of(self.cash[-1:], self.position[-1:], self.prices[-1:])[0])
+
+    @property
+    def final_position(self) -> int:
+        return int(self.position[-1])
+
+    def to_array(self) -> np.ndarray:
+        """The run_array()-style structured array (a copy)."""
+        out = np.empty(len(self), dtype=result_dtype(self.timestamps is not None, self.cash.dtype))
+        out['equity'] = self.equity_array
+        out['cash'] = self.cash
+        out['position'] = self.position
+        if self.timestamps is not None:
+            out['timestamp'] = self.timestamps
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build a DataFrame with columns [equity, cash, position].
+
+        Indexed by `index` if given, else by the timestamps as dates, else
+        by bar number.
+        """
+        index = self.index
+        if index is None and self.timestamps is not None:
+            index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]'))
+        return pd.DataFrame({'equity': self.equity_array, 'cash': self.cash, 'position': self.position},
+                            index=index)
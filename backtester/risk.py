@@ -0,0 +1,252 @@
+import numpy as np
+
+# bit flags returned by RiskLimits.violations(), in check order
+ORDER_NOTIONAL = 1
+GROSS_EXPOSURE = 2
+NET_EXPOSURE = 4
+DAILY_TURNOVER = 8
+DRAWDOWN = 16
+LIMITS = {
+    ORDER_NOTIONAL: 'max_order_notional',
+    GROSS_EXPOSURE: 'max_gross_exposure',
+    NET_EXPOSURE: 'max_net_exposure',
+    DAILY_TURNOVER: 'max_daily_turnover',
+    DRAWDOWN: 'max_drawdown',
+}
+
+
+class RiskLimitError(ValueError):
+    """
+    A proposed trade breaches a risk limit.
+
+    Attributes:
+        limit (str): name of the breached limit, e.g. 'max_gross_exposure'
+        index (int): bar (row) of the first breach in a batch, None for a single order
+    """
+
+    def __init__(self, limit: str, message: str, index: int = None):
+        super().__init__(message)
+        self.limit = limit
+        self.index = index
+
+
+class RiskLimits:
+    """
+    Pre-trade risk limits with kill-switch state.
+
+    Exposures are notional at the trade price: gross is sum |position x
+    price| over symbols, net is |sum position x price| (identical for a
+    single symbol). Exposure limits only reject trades that raise the
+    exposure beyond the limit, so a book pushed over it by prices can
+    still be reduced. Once equity falls more than max_drawdown below its
+    peak the kill switch trips and stays on: only trades that shrink every
+    position are allowed until reset().
+
+    Limits can be checked per order (check_order(), which Broker calls
+    from market_order()) or for a whole proposed position path in one
+    vectorized pass (violations() / check_path(), used by
+    UniverseBacktester). Both share the same state.
+
+    Args:
+        max_gross_exposure (float): cap on gross notional (None = no limit)
+        max_net_exposure (float): cap on absolute net notional
+        max_order_notional (float): cap on |qty x price| of each order (per symbol)
+        max_daily_turnover (float): cap on traded notional per day
+        max_drawdown (float): kill-switch drawdown from peak equity, e.g. 0.2 for 20%
+
+    Raises:
+        ValueError: if a limit is not > 0 (or max_drawdown not in (0, 1))
+
+    Example:
+        limits = RiskLimits(max_gross_exposure=50_000, max_drawdown=0.2)
+        broker = Broker(cash=100_000, risk=limits)
+        broker.market_order("BUY", 1_000, 60.0)   # RiskLimitError: max_gross_exposure
+    """
+
+    def __init__(self, max_gross_exposure: float = None, max_net_exposure: float = None,
+                 max_order_notional: float = None, max_daily_turnover: float = None,
+                 max_drawdown: float = None):
+        for name, value in (('max_gross_exposure', max_gross_exposure), ('max_net_exposure', max_net_exposure),
+                            ('max_order_notional', max_order_notional),
+                            ('max_daily_turnover', max_daily_turnover)):
+            if value is not None and not value > 0:
+                raise ValueError(f"{name} must be > 0")
+        if max_drawdown is not None and not 0 < max_drawdown < 1:
+            raise ValueError("max_drawdown must be in (0, 1)")
+        self.max_gross_exposure = max_gross_exposure
+        self.max_net_exposure = max_net_exposure
+        self.max_order_notional = max_order_notional
+        self.max_daily_turnover = max_daily_turnover
+        self.max_drawdown = max_drawdown
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the peak, the day's turnover and the kill switch."""
+        self.peak = -np.inf
+        self.day = None
+        self.turnover = 0.0
+        self.halted = False
+
+    def get_state(self) -> dict:
+        """
+        Return the peak, day, turnover and kill-switch state, e.g. for checkpointing.
+
+        'day' is left out until a day has been marked (checkpoints cannot
+        store None).
+        """
+        state = {'peak': self.peak, 'turnover': self.turnover, 'halted': self.halted}
+        if self.day is not None:
+            state['day'] = self.day
+        return state
+
+    def set_state(self, state: dict) -> None:
+        """Restore state saved by get_state()."""
+        self.peak = state['peak']
+        self.day = state.get('day')
+        self.turnover = state['turnover']
+        self.halted = state['halted']
+
+    def mark(self, equity: float, day=None) -> None:
+        """
+        Mark equity to market, optionally starting a new day.
+
+        Updates the peak and trips the kill switch on a breach of
+        max_drawdown; a `day` different from the current one resets the
+        turnover count. The engine calls this once per bar (day = bar).
+        """
+        if day is not None and day != self.day:
+            self.day = day
+            self.turnover = 0.0
+        if equity > self.peak:
+            self.peak = equity
+        if self.max_drawdown is not None and equity < self.peak * (1.0 - self.max_drawdown):
+            self.halted = True
+
+    def check_order(self, qty: int, price: float, position: int, cash: float) -> None:
+        """
+        Check one single-symbol order and book its turnover.
+
+        Args:
+            qty (int): signed order size (> 0 buy, < 0 sell)
+            price (float): order price
+            position (int): position before the order
+            cash (float): cash before the order
+
+        Raises:
+            RiskLimitError: naming the first breached limit
+        """
+        self.mark(cash + position * price)
+        if qty == 0:
+            return
+        notional = abs(qty * price)
+        new = position + qty
+        before, after = abs(position * price), abs(new * price)
+        if self.max_order_notional is not None and notional > self.max_order_notional:
+            raise RiskLimitError('max_order_notional', f"Order notional {notional:,.2f} exceeds max_order_notional")
+        for limit in ('max_gross_exposure', 'max_net_exposure'):
+            cap = getattr(self, limit)
+            if cap is not None and after > cap and after > before:
+                raise RiskLimitError(limit, f"Exposure {after:,.2f} would exceed {limit}")
+        if self.max_daily_turnover is not None and self.turnover + notional > self.max_daily_turnover:
+            raise RiskLimitError('max_daily_turnover', "Order would exceed max_daily_turnover")
+        if self.halted and abs(new) > abs(position):
+            raise RiskLimitError('max_drawdown', "Drawdown kill switch is on: only risk-reducing orders allowed")
+        self.turnover += notional
+
+    def violations(self, positions: np.ndarray, prices: np.ndarray, cash: np.ndarray,
+                   days: np.ndarray = None, initial: np.ndarray = None) -> np.ndarray:
+        """
+        Evaluate every limit over a proposed position path in one pass.
+
+        Row t holds the positions after trading at the close of bar t, so
+        the trade at t is positions[t] - positions[t-1]. State (peak, day,
+        turnover, kill switch) is read but not changed.
+
+        Args:
+            positions: int positions after each bar's trades, shape (n,) or (n, k)
+            prices: trade/mark prices, same shape
+            cash: cash after each bar's trades, shape (n,)
+            days: day label of each bar (default: every bar is its own day)
+            initial: positions before bar 0 (default flat)
+
+        Returns:
+            np.ndarray of int flags per bar (0 = ok), OR-ed from
+            ORDER_NOTIONAL, GROSS_EXPOSURE, NET_EXPOSURE, DAILY_TURNOVER, DRAWDOWN
+        """
+        return self._path(positions, prices, cash, days, initial)['flags']
+
+    def check_path(self, positions: np.ndarray, prices: np.ndarray, cash: np.ndarray,
+                   days: np.ndarray = None, initial: np.ndarray = None) -> None:
+        """
+        Check a proposed position path (see violations()) and, if every
+        bar passes, advance the state to its end.
+
+        Raises:
+            RiskLimitError: at the first breaching bar, naming its first limit
+        """
+        values = self._path(positions, prices, cash, days, initial)
+        flags = values['flags']
+        bad = np.flatnonzero(flags)
+        if len(bad):
+            bar = int(bad[0])
+            flag = int(flags[bar])
+            limit = LIMITS[flag & -flag]
+            raise RiskLimitError(limit, f"Bar {bar} breaches {limit}", index=bar)
+        if len(flags):
+            self.peak = max(self.peak, float(values['peak']))
+            self.halted = bool(values['halted'])
+            self.day = values['day']
+            self.turnover = float(values['turnover'])
+
+    def _path(self, positions, prices, cash, days, initial):
+        """Flags of every bar of a path, plus the state at its end."""
+        prices = np.asarray(prices, dtype=np.float64)
+        positions = np.asarray(positions)
+        cash = np.asarray(cash, dtype=np.float64)
+        n = len(prices)
+        if positions.shape != prices.shape or cash.shape != (n,):
+            raise ValueError("positions, prices and cash must describe the same bars")
+        flags = np.zeros(n, dtype=np.int64)
+        if n == 0:
+            return {'flags': flags}
+        prices, positions = prices.reshape(n, -1), positions.reshape(n, -1)
+        previous = np.empty_like(positions)
+        previous[0] = 0 if initial is None else np.asarray(initial).reshape(-1)
+        previous[1:] = positions[:-1]
+        trade = positions - previous
+        traded = (trade != 0).any(axis=1)
+        notional = np.abs(trade * prices)
+
+        if self.max_order_notional is not None:
+            flags[(notional > self.max_order_notional).any(axis=1)] |= ORDER_NOTIONAL
+        value_after, value_before = positions * prices, previous * prices
+        for cap, flag, after, before in (
+                (self.max_gross_exposure, GROSS_EXPOSURE,
+                 np.abs(value_after).sum(axis=1), np.abs(value_before).sum(axis=1)),
+                (self.max_net_exposure, NET_EXPOSURE,
+                 np.abs(value_after.sum(axis=1)), np.abs(value_before.sum(axis=1)))):
+            if cap is not None:
+                flags[traded & (after > cap) & (after > before)] |= flag
+
+        # turnover accumulated within each day, carrying today's count from the state
+        days = np.arange(n) if days is None else np.asarray(days)
+        bar_turnover = notional.sum(axis=1)
+        total = np.cumsum(bar_turnover)
+        starts = np.flatnonzero(np.concatenate(([True], days[1:] != days[:-1])))
+        offset = np.repeat(total[starts] - bar_turnover[starts], np.diff(np.append(starts, n)))
+        day_turnover = total - offset
+        if days[0] == self.day:
+            day_turnover[:starts[1] if len(starts) > 1 else n] += self.turnover
+        if self.max_daily_turnover is not None:
+            flags[traded & (day_turnover > self.max_daily_turnover)] |= DAILY_TURNOVER
+
+        # trading does not move equity (no fees): mark at cash + position value
+        equity = cash + value_after.sum(axis=1)
+        peak = np.maximum.accumulate(np.maximum(equity, self.peak))
+        halted = np.full(n, self.halted)
+        if self.max_drawdown is not None:
+            halted |= np.logical_or.accumulate(equity < peak * (1.0 - self.max_drawdown))
+            growing = (np.abs(positions) > np.abs(previous)).any(axis=1)
+            flags[halted & growing] |= DRAWDOWN
+        return {'flags': flags, 'peak': peak[-1], 'halted': halted[-1],
+                'day': days[-1].item(), 'turnover': day_turnover[-1]}
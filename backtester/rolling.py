@@ -0,0 +1,290 @@
+"""
+Rolling-window statistics over contiguous arrays.
+
+All kernels run along axis 0 in O(n) time, so a 2-D (bars x series) array
+is processed one column per series in a single call. The window-sum
+kernels (sum, mean, var, std) also accept a sequence of windows and then
+return one trailing axis entry per window, reusing the same prefix sums.
+
+Semantics follow pandas' rolling(window, min_periods=window): NaN and
++/-inf inputs are skipped and the result is NaN until min_periods valid
+points are in the window.
+
+float32 input gives float32 output (other dtypes give float64); window sums
+are still accumulated in float64, one chunk of rows at a time, so the
+float64 scratch memory is bounded by the chunk rather than the series.
+
+Example:
+    vol = rolling_std(returns, 20)                   # shape (n,)
+    vols = rolling_std(returns, [10, 20, 50])        # shape (n, 3)
+    hi = rolling_max(prices, 20)
+    ema = ewma(prices, span=10)
+"""
+import numpy as np
+
+
+# Prefix sums are restarted every CHUNK rows (with the window's tail carried
+# over) and taken around the chunk's mean, which bounds their rounding error
+# by the chunk length instead of the full series length.
+CHUNK = 1 << 12
+
+
+def rolling_sum(x: np.ndarray, window, min_periods: int = None) -> np.ndarray:
+    """
+    Rolling sum along axis 0.
+
+    Args:
+        x: array of shape (n,) or (n, k)
+        window: int, or sequence of ints for several windows at once
+        min_periods: valid points required for a result (default: window)
+
+    Returns:
+        np.ndarray of float64 (float32 for float32 x), shape x.shape
+        (+ (len(window),) for a sequence)
+    """
+    out, windows = _output(x, window)
+    for rows, count, s1, _, center in _window_moments(x, windows, min_periods, need_squares=False):
+        out[rows] = s1 + count * center
+    return out
+
+
+def rolling_mean(x: np.ndarray, window, min_periods: int = None) -> np.ndarray:
+    """Rolling mean along axis 0; arguments as in rolling_sum()."""
+    out, windows = _output(x, window)
+    for rows, count, s1, _, center in _window_moments(x, windows, min_periods, need_squares=False):
+        out[rows] = s1 / count + center
+    return out
+
+
+def rolling_var(x: np.ndarray, window, min_periods: int = None, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling variance along axis 0.
+
+    Sums are taken on mean-shifted data, so the usual
+    (sum(x^2) - sum(x)^2 / n) cancellation is limited to the spread of the
+    window rather than its level. Small negative results from rounding are
+    clipped to 0.
+
+    Args:
+        x: array of shape (n,) or (n, k)
+        window: int, or sequence of ints
+        min_periods: valid points required for a result (default: window)
+        ddof: delta degrees of freedom (default 1, like pandas)
+
+    Returns:
+        np.ndarray of float64 (float32 for float32 x); NaN where fewer
+        than ddof + 1 points
+    """
+    out, windows = _output(x, window)
+    for rows, count, s1, s2, _ in _window_moments(x, windows, min_periods, need_squares=True):
+        m2 = s2 - s1 * s1 / count
+        np.maximum(m2, 0.0, out=m2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m2 /= count - ddof
+        if np.any(count <= ddof):
+            m2 = np.where(count <= ddof, np.nan, m2)
+        out[rows] = m2
+    return out
+
+
+def rolling_std(x: np.ndarray, window, min_periods: int = None, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation along axis 0; arguments as in rolling_var()."""
+    return np.sqrt(rolling_var(x, window, min_periods, ddof))
+
+
+def rolling_max(x: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    """
+    Rolling maximum along axis 0 in O(n), independent of the window length.
+
+    Uses the van Herk / Gil-Werman block decomposition (the vectorized
+    equivalent of a monotonic deque): running maxima forward and backward
+    within blocks of `window` rows, then one elementwise max per output.
+
+    Args:
+        x: array of shape (n,) or (n, k)
+        window (int): window length
+        min_periods: valid points required for a result (default: window)
+
+    Returns:
+        np.ndarray of float64 (float32 for float32 x), same shape as x
+    """
+    return _rolling_extreme(x, window, min_periods, np.fmax)
+
+
+def rolling_min(x: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    """Rolling minimum along axis 0; see rolling_max()."""
+    return _rolling_extreme(x, window, min_periods, np.fmin)
+
+
+def ewma(x: np.ndarray, alpha: float = None, span: float = None, adjust: bool = False) -> np.ndarray:
+    """
+    Exponentially weighted moving average along axis 0.
+
+    Matches pandas ewm(alpha=..., adjust=...).mean() for NaN-free input.
+    The recursion y[t] = (1 - alpha) * y[t-1] + alpha * x[t] is evaluated
+    in closed form over blocks of rows, so the Python-level work is
+    O(n / block) rather than O(n).
+
+    Args:
+        x: array of shape (n,) or (n, k)
+        alpha (float): smoothing factor in (0, 1]
+        span (float): alternative to alpha, alpha = 2 / (span + 1)
+        adjust (bool): pandas' adjust flag (default False)
+
+    Returns:
+        np.ndarray of float64 (float32 for float32 x, accumulated in
+        float64), same shape as x
+
+    Raises:
+        ValueError: if neither or both of alpha/span are given, or alpha is out of range
+    """
+    if (alpha is None) == (span is None):
+        raise ValueError("Pass exactly one of alpha or span")
+    if span is not None:
+        alpha = 2.0 / (span + 1.0)
+    if not 0.0 < alpha <= 1.0:
+        raise ValueError("alpha must be in (0, 1]")
+    dtype = _float_dtype(x)
+    x = np.asarray(x, dtype=np.float64)
+    decay = 1.0 - alpha
+    if adjust:
+        numerator = _linear_recurrence(x, decay)
+        steps = np.arange(1, len(x) + 1, dtype=np.float64).reshape((-1,) + (1,) * (x.ndim - 1))
+        denominator = steps if decay == 1.0 else (1.0 - decay ** steps) / alpha
+        return (numerator / denominator).astype(dtype, copy=False)
+    u = alpha * x
+    if len(x):
+        u[0] = x[0]
+    return _linear_recurrence(u, decay).astype(dtype, copy=False)
+
+
+def _output(x, window):
+    """Allocate the result for x and normalize `window` to (windows, multi)."""
+    windows = np.atleast_1d(np.asarray(window, dtype=np.int64))
+    if windows.ndim != 1 or len(windows) == 0 or np.any(windows < 1):
+        raise ValueError("window must be a positive int or a sequence of them")
+    multi = np.ndim(window) > 0
+    shape = np.shape(x) + ((len(windows),) if multi else ())
+    return np.empty(shape, dtype=_float_dtype(x)), (windows, multi)
+
+
+def _float_dtype(x):
+    """Result dtype: float32 stays float32, everything else becomes float64."""
+    return np.float32 if np.asarray(x).dtype == np.float32 else np.float64
+
+
+def _window_moments(x, windows, min_periods, need_squares):
+    """
+    Yield (rows, count, s1, s2, center) per chunk and window along axis 0.
+
+    `rows` indexes the output; s1/s2 are sums of (x - center) and
+    (x - center)^2 over each window, and count is the number of valid
+    points, NaN where it is below min_periods so derived values become NaN.
+    """
+    windows, multi = windows
+    x = np.asarray(x, dtype=_float_dtype(x))
+    widest = int(windows.max())
+    n = len(x)
+    tail = (1,) * (x.ndim - 1)
+
+    chunk = max(CHUNK, 4 * widest)
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        lo = max(0, start - widest + 1)
+        block = x[lo:stop].astype(np.float64, copy=False)
+        finite = np.isfinite(block)
+        has_nan = not finite.all()
+        if has_nan:
+            # like pandas, NaN and +/-inf are both treated as missing
+            filled = np.where(finite, block, 0.0)
+            n_finite = finite.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                center = np.where(n_finite > 0, filled.sum(axis=0) / n_finite, 0.0)
+            filled -= center
+            filled[~finite] = 0.0
+            cum_n = _prefix_sum(finite.astype(np.float64), widest)
+        else:
+            center = block.mean(axis=0)
+            filled = block - center
+        cum_1 = _prefix_sum(filled, widest)
+        cum_2 = _prefix_sum(np.square(filled, out=filled), widest) if need_squares else None
+
+        # with `widest` leading zero rows, window sums are plain slice differences
+        first = start - lo + widest + 1
+        last = stop - lo + widest + 1
+        for j, w in enumerate(windows):
+            required = max(w if min_periods is None else min_periods, 1)
+            if has_nan:
+                count = cum_n[first:last] - cum_n[first - w:last - w]
+            else:
+                count = np.minimum(np.arange(start + 1, stop + 1), w).astype(np.float64).reshape((-1,) + tail)
+            count = np.where(count < required, np.nan, count)
+            s1 = cum_1[first:last] - cum_1[first - w:last - w]
+            s2 = cum_2[first:last] - cum_2[first - w:last - w] if need_squares else None
+            rows = (slice(start, stop),) + ((Ellipsis, j) if multi else ())
+            yield rows, count, s1, s2, center
+
+
+def _prefix_sum(values, pad=0):
+    """Cumulative sum along axis 0 with pad + 1 leading rows of zeros."""
+    out = np.zeros((len(values) + pad + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=out[pad + 1:])
+    return out
+
+
+def _rolling_extreme(x, window, min_periods, op):
+    """Shared van Herk / Gil-Werman kernel for rolling_max/rolling_min."""
+    x = np.asarray(x, dtype=_float_dtype(x))
+    window = int(window)
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    n = len(x)
+    n_blocks = -(-n // window)
+    finite = np.isfinite(x)
+    padded = np.full((n_blocks * window,) + x.shape[1:], np.nan, dtype=x.dtype)
+    # like pandas, NaN and +/-inf are both treated as missing
+    padded[:n] = np.where(finite, x, np.nan)
+    blocks = padded.reshape((n_blocks, window) + x.shape[1:])
+
+    prefix = op.accumulate(blocks, axis=1).reshape(padded.shape)[:n]
+    suffix = np.flip(op.accumulate(np.flip(blocks, axis=1), axis=1), axis=1).reshape(padded.shape)
+
+    out = prefix.copy()
+    if n >= window:
+        # window [t-w+1, t] = suffix of one block + prefix of the next
+        out[window - 1:] = op(suffix[:n - window + 1], prefix[window - 1:])
+
+    required = window if min_periods is None else min_periods
+    valid = _prefix_sum(finite.astype(np.float64), window)
+    count = valid[window + 1:] - valid[1:n + 1]
+    out[count < max(required, 1)] = np.nan
+    return out
+
+
+def _linear_recurrence(u, decay):
+    """
+    Solve y[t] = decay * y[t-1] + u[t] (y[-1] = 0) along axis 0.
+
+    Within a block of B rows, y[b+k] = decay^(k+1) * y[b-1]
+    + decay^k * cumsum(decay^-j * u[b+j]); B is capped so decay^-B stays
+    far from overflow.
+    """
+    y = np.empty_like(u)
+    n = len(u)
+    if n == 0:
+        return y
+    if decay == 0.0:
+        y[:] = u
+        return y
+    block = n if decay == 1.0 else max(1, min(n, int(600.0 / -np.log(decay))))
+    k = np.arange(block, dtype=np.float64).reshape((-1,) + (1,) * (u.ndim - 1))
+    grow = decay ** -k
+    shrink = decay ** k
+    carry = np.zeros(u.shape[1:])
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        m = stop - start
+        partial = np.cumsum(u[start:stop] * grow[:m], axis=0)
+        y[start:stop] = shrink[:m] * (decay * carry + partial)
+        carry = y[stop - 1]
+    return y
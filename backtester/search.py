@@ -0,0 +1,190 @@
+"""
+Successive-halving parameter search.
+
+Instead of running every candidate over the full history, all candidates
+are first run on a short prefix, the best 1/eta of them are kept, and the
+survivors are extended to a prefix eta times longer, until one rung runs
+to the end of the data. A candidate's engine state (broker, strategy and
+cash/position history) is carried from rung to rung through
+Backtester.run_array(resume=...), so bars already simulated are never
+simulated again.
+
+Example:
+    search = SuccessiveHalving(param_grid({'lookback': range(5, 200, 5)}), min_bars=252)
+    ranking = search.run(prices)
+    print(ranking.head(), search.bars_simulated / search.full_grid_bars)
+"""
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def param_grid(params: dict) -> list:
+    """
+    Cartesian product of parameter values.
+
+    Example:
+        param_grid({'lookback': [10, 20]})
+        # [{'lookback': 10}, {'lookback': 20}]
+    """
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def total_return(result: np.ndarray) -> float:
+    """Final equity over starting equity, minus 1."""
+    equity = result['equity']
+    return float(equity[-1] / equity[0] - 1.0)
+
+
+def sharpe(result: np.ndarray, periods_per_year: int = 252) -> float:
+    """Annualized Sharpe ratio of per-bar equity returns (0 if equity never moves)."""
+    equity = result['equity']
+    if len(equity) < 3:
+        return 0.0
+    returns = np.diff(equity) / equity[:-1]
+    std = returns.std(ddof=1)
+    if not std > 0:
+        return 0.0
+    return float(returns.mean() / std * math.sqrt(periods_per_year))
+
+
+def max_drawdown(result: np.ndarray) -> float:
+    """Largest drop of equity below its running peak, as a fraction of the peak."""
+    equity = result['equity']
+    return float(np.max(1.0 - equity / np.maximum.accumulate(equity)))
+
+
+def run_summary(result: np.ndarray) -> dict:
+    """Compact statistics of one run_array() result, as reported by the batch runners."""
+    equity = result['equity']
+    return {
+        'bars': len(equity),
+        'final_equity': float(equity[-1]),
+        'total_return': total_return(result),
+        'sharpe': sharpe(result),
+        'max_drawdown': max_drawdown(result),
+        'trades': int(np.count_nonzero(np.diff(result['position']))),
+    }
+
+
+class SuccessiveHalving:
+    """
+    Early-stopping search over strategy parameters.
+
+    Rung r runs the surviving candidates on the first min_bars * eta^r bars
+    (capped at the series length); after each rung only the best
+    ceil(survivors / eta) candidates by `score` continue. The last rung
+    always runs on the full series (directly, once one candidate is left).
+
+    A candidate's signals are computed once, over the full series, and
+    each rung passes their prefix to run_array(signals=...), so a rung
+    neither re-evaluates the strategy nor depends on where the prefix was
+    cut: the bars of every rung are exactly those of one full run.
+
+    Args:
+        candidates (list): parameter dicts, each passed as strategy_cls(**params)
+        min_bars (int): prefix length of the first rung (default 252)
+        eta (int): keep 1/eta of the candidates and grow the prefix eta-fold
+            per rung (default 2)
+        score: callable(result array) -> float, higher is better (default sharpe)
+        cash (float): starting cash of every candidate (default 1M)
+        strategy_cls: strategy class (default VolatilityBreakoutStrategy)
+
+    Attributes (after run):
+        bars_simulated (int): bars run across all candidates and rungs
+        full_grid_bars (int): bars a full grid over the same data would run
+        rungs (list): (prefix length, number of candidates) per rung
+    """
+
+    def __init__(self, candidates: list, min_bars: int = 252, eta: int = 2, score=sharpe,
+                 cash: float = 1_000_000, strategy_cls=VolatilityBreakoutStrategy):
+        if not candidates:
+            raise ValueError("candidates cannot be empty")
+        if min_bars < 2:
+            raise ValueError("min_bars must be >= 2")
+        if eta < 2:
+            raise ValueError("eta must be >= 2")
+        self.candidates = list(candidates)
+        self.min_bars = min_bars
+        self.eta = eta
+        self.score = score
+        self.cash = cash
+        self.strategy_cls = strategy_cls
+        self.bars_simulated = 0
+        self.full_grid_bars = 0
+        self.rungs = []
+
+    def run(self, prices: np.ndarray) -> pd.DataFrame:
+        """
+        Run the search over a price series.
+
+        Args:
+            prices: 1-D np.ndarray (or pd.Series) of prices
+
+        Returns:
+            pd.DataFrame with one row per candidate: the parameter columns,
+            bars (prefix length reached), rung (last rung reached) and score
+            at that prefix, sorted best first (by rung, then score)
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 1:
+            raise ValueError("prices must be 1-D")
+        if len(prices) == 0:
+            raise ValueError("Prices cannot be empty")
+        n = len(prices)
+        backtesters = [Backtester(self.strategy_cls(**params), Broker(self.cash)) for params in self.candidates]
+        signals = [None] * len(self.candidates)
+        results = [None] * len(self.candidates)
+        scores = np.full(len(self.candidates), -np.inf)
+        reached = np.zeros(len(self.candidates), dtype=np.int64)
+        rung_of = np.zeros(len(self.candidates), dtype=np.int64)
+        self.bars_simulated = 0
+        self.full_grid_bars = len(self.candidates) * n
+        self.rungs = []
+
+        alive = np.arange(len(self.candidates))
+        stop = min(self.min_bars, n)
+        rung = 0
+        while True:
+            for i in alive:
+                if signals[i] is None:
+                    signals[i] = backtesters[i].strategy.signals_array(prices)
+                results[i] = self._extend(backtesters[i], results[i], prices[:stop], signals[i][:stop])
+                self.bars_simulated += stop - reached[i]
+                reached[i] = stop
+                rung_of[i] = rung
+                value = self.score(results[i])
+                scores[i] = value if np.isfinite(value) else -np.inf
+            self.rungs.append((stop, len(alive)))
+            if stop == n:
+                break
+            # stable: ties keep candidate order
+            order = alive[np.argsort(-scores[alive], kind='stable')]
+            alive = np.sort(order[:math.ceil(len(alive) / self.eta)])
+            for i in order[len(alive):]:
+                signals[i] = None  # eliminated
+            # a lone survivor goes straight to the full series
+            stop = n if len(alive) == 1 else min(stop * self.eta, n)
+            rung += 1
+
+        ranking = pd.DataFrame(self.candidates)
+        ranking['bars'] = reached
+        ranking['rung'] = rung_of
+        ranking['score'] = scores
+        return ranking.sort_values(['rung', 'score'], ascending=False, kind='stable')
+
+    @staticmethod
+    def _extend(backtester, previous, prices, signals):
+        """Run `prices` with precomputed signals, continuing from the previous (shorter) result if any."""
+        if previous is None:
+            return backtester.run_array(prices, signals=signals)
+        resume = backtester.get_state()
+        resume.update(cursor=len(previous) - 1, cash=previous['cash'], position=previous['position'])
+        return backtester.run_array(prices, resume=resume, signals=signals)
@@ -0,0 +1,146 @@
+"""
+Persistent store of precomputed strategy signals.
+
+Signals depend only on the prices and the strategy parameters, so they are
+computed once per data update and saved as int8 .npy files that every
+consumer (backtests, risk runs, reports) memory-maps instead of
+regenerating them.
+
+Layout: root/<symbol>/<StrategyClass>-<params digest>/<data version>.npy,
+plus a params.json next to the versions. The data version defaults to a
+content hash of the prices, so stored signals go stale exactly when the
+prices change; writing a new version removes the older ones.
+
+Example:
+    store = SignalStore("signals/")
+    signals = store.get("AAPL", VolatilityBreakoutStrategy(20), prices)   # computed once
+    Backtester(strategy, Broker()).run_array(prices, signals=signals)
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+
+def data_version(prices: np.ndarray) -> str:
+    """Content hash of a price array (dtype, shape and values)."""
+    prices = np.ascontiguousarray(prices)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{prices.dtype.str}{prices.shape}".encode())
+    digest.update(prices.data)
+    return digest.hexdigest()
+
+
+def strategy_params(strategy) -> dict:
+    """Parameters that determine a strategy's signals: its state, plus its dtype if any."""
+    params = dict(strategy.get_state())
+    if hasattr(strategy, 'dtype'):
+        params['dtype'] = np.dtype(strategy.dtype).name
+    return params
+
+
+class SignalStore:
+    """
+    On-disk, memory-mappable signal cache keyed by (symbol, strategy
+    class, parameters, data version).
+
+    Args:
+        root (str): store directory (created if missing)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def get(self, symbol: str, strategy, prices: np.ndarray, version: str = None) -> np.ndarray:
+        """
+        Signals for `strategy` on `prices`, computed and stored on a miss.
+
+        Args:
+            symbol (str): instrument name
+            strategy: object with .signals_array(prices) and .get_state()
+            prices: the prices the signals are computed from
+            version (str): data version; default data_version(prices)
+
+        Returns:
+            read-only np.memmap of int8 signals
+        """
+        version = data_version(prices) if version is None else version
+        path = self._path(symbol, strategy, version)
+        if os.path.exists(path):
+            return np.load(path, mmap_mode='r')
+        return self.put(symbol, strategy, prices, version=version)
+
+    def put(self, symbol: str, strategy, prices: np.ndarray, signals: np.ndarray = None,
+            version: str = None) -> np.ndarray:
+        """
+        Store signals (computed with the strategy unless given), replacing
+        any other data version of the same key.
+
+        Returns:
+            read-only np.memmap of the stored int8 signals
+
+        Raises:
+            ValueError: if given signals do not match the prices or are not in {-1, 0, 1}
+        """
+        version = data_version(prices) if version is None else version
+        if signals is None:
+            signals = strategy.signals_array(prices)
+        signals = np.asarray(signals)
+        if len(signals) != len(prices):
+            raise ValueError("signals must have one row per price bar")
+        if signals.size and (signals.min() < -1 or signals.max() > 1):
+            raise ValueError("signals must be in {-1, 0, 1}")
+        path = self._path(symbol, strategy, version)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'params.json'), 'w') as f:
+            json.dump({'strategy': type(strategy).__name__, 'params': strategy_params(strategy)}, f, sort_keys=True)
+        # write then rename, so readers never map a half-written file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, signals.astype(np.int8, copy=False))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        for name in os.listdir(directory):
+            if name.endswith('.npy') and os.path.join(directory, name) != path:
+                os.remove(os.path.join(directory, name))
+        return np.load(path, mmap_mode='r')
+
+    def load(self, symbol: str, strategy, version: str) -> np.ndarray:
+        """
+        Stored signals of one data version.
+
+        Raises:
+            KeyError: if that version is not stored
+        """
+        path = self._path(symbol, strategy, version)
+        if not os.path.exists(path):
+            raise KeyError((symbol, type(strategy).__name__, version))
+        return np.load(path, mmap_mode='r')
+
+    def versions(self, symbol: str, strategy) -> list:
+        """Data versions stored for a key (at most one after put())."""
+        directory = os.path.dirname(self._path(symbol, strategy, 'x'))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.npy'))
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop every stored signal of a symbol, e.g. after its history was restated."""
+        shutil.rmtree(self._symbol_dir(symbol), ignore_errors=True)
+
+    def _symbol_dir(self, symbol):
+        if not symbol or os.sep in symbol or symbol in ('.', '..') or (os.altsep and os.altsep in symbol):
+            raise ValueError(f"Invalid symbol: {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _path(self, symbol, strategy, version):
+        if not version or os.sep in version:
+            raise ValueError(f"Invalid data version: {version!r}")
+        params = json.dumps(strategy_params(strategy), sort_keys=True)
+        digest = hashlib.blake2b(params.encode(), digest_size=8).hexdigest()
+        return os.path.join(self._symbol_dir(symbol), f"{type(strategy).__name__}-{digest}", f"{version}.npy")
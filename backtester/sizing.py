@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class VolTargetSizer:
+    """
+    Turns ±1 strategy signals into share targets.
+
+    Sizing rules (each optional, combined by taking the smallest size):
+    - target_vol: shares = target_vol * capital / (annualized vol * price)
+    - fraction: shares = fraction * capital / price
+    - max_notional: |shares * price| <= max_notional
+
+    With no rule set, every signal maps to one share (the engine's original
+    behaviour). Sizes are floored to whole shares and computed as array
+    operations over the full history, using the rolling volatility the
+    strategy already produced.
+
+    `capital` is fixed for the whole run: the broker's starting cash, or
+    the value given here. It is not the current equity, so `fraction` is
+    a fraction of initial capital and sizes do not grow with profits or
+    shrink after losses. Following equity would make each size depend on
+    the previous trades and rule out the one-pass array computation.
+
+    Args:
+        target_vol (float): annualized volatility target per position
+        fraction (float): fraction of initial capital per position
+        max_notional (float): cap on the notional of any position
+        capital (float): fixed sizing capital; defaults to the broker's starting cash
+        periods_per_year (int): bars per year for annualizing vol (default 252)
+
+    Example:
+        sizer = VolTargetSizer(target_vol=0.10, max_notional=250_000)
+        bt = Backtester(VolatilityBreakoutStrategy(20), Broker(1_000_000), sizer=sizer)
+    """
+
+    def __init__(self, target_vol: float = None, fraction: float = None,
+                 max_notional: float = None, capital: float = None,
+                 periods_per_year: int = 252):
+        for name, value in (('target_vol', target_vol), ('fraction', fraction),
+                            ('max_notional', max_notional), ('capital', capital)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0")
+        self.target_vol = target_vol
+        self.fraction = fraction
+        self.max_notional = max_notional
+        self.capital = capital
+        self.periods_per_year = periods_per_year
+
+    def size(self, signals: np.ndarray, prices: np.ndarray, vol: np.ndarray,
+             capital: float = None) -> np.ndarray:
+        """
+        Compute share targets for a whole history at once.
+
+        Args:
+            signals: signals in {-1, 0, 1}
+            prices: prices, same shape as signals
+            vol: per-bar volatility of returns (not annualized), same shape
+            capital: fixed sizing capital for every bar (e.g. starting cash),
+                used when the sizer has none of its own
+
+        Returns:
+            np.ndarray of int64 signed share targets; 0 where no size is
+            defined (e.g. zero volatility under vol targeting)
+        """
+        capital = self.capital if self.capital is not None else capital
+        prices = np.asarray(prices, dtype=np.float64)
+        shares = np.ones(prices.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.target_vol is not None:
+                annual_vol = np.asarray(vol, dtype=np.float64) * np.sqrt(self.periods_per_year)
+                shares = self.target_vol * capital / (annual_vol * np.abs(prices))
+            if self.fraction is not None:
+                fixed = self.fraction * capital / np.abs(prices)
+                shares = fixed if self.target_vol is None else np.fmin(shares, fixed)
+            if self.max_notional is not None:
+                shares = np.fmin(shares, self.max_notional / np.abs(prices))
+        shares[~np.isfinite(shares)] = 0.0
+        return np.asarray(signals, dtype=np.int64) * np.floor(np.abs(shares)).astype(np.int64)
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from backtester.rolling import rolling_std
+
 
 class VolatilityBreakoutStrategy:
     """
@@ -14,6 +16,9 @@ class VolatilityBreakoutStrategy:
 
     Args:
         lookback (int): Number of days for rolling volatility window (default 20)
+        dtype: float dtype of the array paths (signals_array/signals_with_vol);
+            np.float32 halves the memory of returns and volatility for large
+            panels at some precision cost (see backtester.precision)
 
     Returns:
         pd.Series: Signal series with values in {-1, 0, 1}
@@ -25,8 +30,11 @@ class VolatilityBreakoutStrategy:
         # First 10 rows may be NaN, then {-1, 0, 1}
     """
 
-    def __init__(self, lookback: int = 20):
+    def __init__(self, lookback: int = 20, dtype=np.float64):
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64")
         self.lookback = lookback
+        self.dtype = np.dtype(dtype)
 
     def signals(self, prices: pd.Series) -> pd.Series:
         """
@@ -57,6 +65,116 @@ class VolatilityBreakoutStrategy:
 
         # YOUR CODE ENDS HERE
 
+    def signals_array(self, prices: np.ndarray, adjustments=None) -> np.ndarray:
+        """
+        NumPy-native counterpart of signals().
+
+        Same rule as signals(), but takes and returns plain ndarrays so that
+        callers holding raw arrays do not pay for building a pd.Series and
+        index. Input already in the strategy's dtype is used as-is (no
+        copy); rolling runs along axis 0, so a 2-D (bars x series) array
+        yields one column of signals per series.
+
+        Args:
+            prices: np.ndarray of prices, shape (n,) or (n, k)
+            adjustments: optional AdjustmentIndex for raw prices; signals
+                are those of the adjusted prices (see signals_with_vol())
+
+        Returns:
+            np.ndarray of int8 signals in {-1, 0, 1}, same shape as prices
+
+        Example:
+            strategy = VolatilityBreakoutStrategy(lookback=3)
+            strategy.signals_array(np.array([100.0, 101.0, 99.0, 104.0]))
+            # array([0, 1, -1, 1], dtype=int8)
+        """
+        return self.signals_with_vol(prices, adjustments)[0]
+
+    def signals_with_vol(self, prices: np.ndarray, adjustments=None):
+        """
+        Signals plus the rolling volatility they were derived from.
+
+        Lets downstream stages (e.g. position sizing) reuse the volatility
+        instead of recomputing it.
+
+        With `adjustments`, prices are raw and the rule runs on adjusted
+        returns: the raw returns with only the event bars corrected
+        (AdjustmentIndex.adjust_returns), so no adjusted copy of the
+        prices is built.
+
+        Args:
+            prices: np.ndarray of prices, shape (n,) or (n, k)
+            adjustments: optional AdjustmentIndex for raw prices
+
+        Returns:
+            tuple (signals, vol): int8 signals as in signals_array() and the
+            rolling std of returns in the strategy's dtype (0 until the
+            window is full)
+        """
+        prices = np.asarray(prices, dtype=self.dtype)
+        if len(prices) == 0:
+            raise ValueError("Prices cannot be empty")
+        pct_chg = self._returns(prices, adjustments)
+        vol = self._volatility(pct_chg)
+        signals = np.zeros(prices.shape, dtype=np.int8)
+        signals[pct_chg > vol] = 1
+        signals[pct_chg < -vol] = -1
+        return signals, vol
+
+    def returns(self, prices: np.ndarray, adjustments=None) -> np.ndarray:
+        """
+        Simple returns the rule is applied to, in the strategy's dtype.
+
+        Like pct_change().fillna(0): the first bar and any NaN are 0. With
+        `adjustments` the returns are those of the adjusted prices, as in
+        signals_with_vol().
+
+        Args:
+            prices: np.ndarray of prices, shape (n,) or (n, k)
+            adjustments: optional AdjustmentIndex for raw prices
+
+        Returns:
+            np.ndarray of returns, same shape as prices
+        """
+        prices = np.asarray(prices, dtype=self.dtype)
+        if len(prices) == 0:
+            raise ValueError("Prices cannot be empty")
+        return self._returns(prices, adjustments)
+
+    def get_state(self) -> dict:
+        """
+        Return the strategy parameters, e.g. for checkpointing.
+
+        This is not the rolling-window state: the array paths keep none
+        between calls, and signals are recomputed from the price history.
+        A resumed Backtester.run_array() therefore needs the full price
+        array (from bar 0), not just the bars after the checkpoint.
+        """
+        return {'lookback': self.lookback}
+
+    def set_state(self, state: dict) -> None:
+        """Restore parameters saved by get_state()."""
+        self.lookback = state['lookback']
+
+    @staticmethod
+    def _returns(prices: np.ndarray, adjustments=None) -> np.ndarray:
+        """Simple returns with the first bar (and any NaN) set to 0, like pct_change().fillna(0)."""
+        pct_chg = np.empty(prices.shape, dtype=prices.dtype)
+        pct_chg[0] = 0.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(prices[1:], prices[:-1], out=pct_chg[1:])
+        pct_chg[1:] -= 1.0
+        if adjustments is not None:
+            adjustments.adjust_returns(pct_chg, prices)
+        pct_chg[np.isnan(pct_chg)] = 0.0
+        return pct_chg
+
+    def _volatility(self, pct_chg: np.ndarray) -> np.ndarray:
+        """Rolling sample std of returns, 0 until the window is full, like rolling().std().fillna(0)."""
+        vol = rolling_std(pct_chg, self.lookback)
+        vol[np.isnan(vol)] = 0.0
+        return vol
+
 if __name__ == "__main__":
     prices = pd.Series([100, 101, 102, 103, 104, 105, 106, 107, 108, 109])
     strategy = VolatilityBreakoutStrategy(lookback=3)
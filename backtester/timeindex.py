@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+
+class TimeIndex:
+    """
+    Sorted time axis of int64 epoch nanoseconds.
+
+    A lightweight replacement for pd.DatetimeIndex inside the engine: range
+    lookups and date-to-bar mapping are np.searchsorted calls, O(log n) per
+    query, and slicing returns views. A DatetimeIndex is only built by
+    to_datetimeindex(), at the output boundary.
+
+    Args:
+        values: strictly increasing int64 epoch ns, datetime64 values,
+            date strings or a pd.DatetimeIndex (tz-aware indexes are taken
+            in UTC)
+
+    Raises:
+        ValueError: if values are not 1-D or not strictly increasing
+
+    Example:
+        ti = TimeIndex(prices.index)
+        window = ti.loc("2023-03-01", "2023-03-31")   # slice of bars
+        result = Backtester(strategy, broker).run_array(values[window], timestamps=ti[window])
+        ti[window].to_datetimeindex()
+    """
+
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        values = _to_ns(values)
+        if values.ndim != 1:
+            raise ValueError("TimeIndex must be 1-D")
+        if len(values) > 1 and not np.all(values[1:] > values[:-1]):
+            raise ValueError("TimeIndex must be strictly increasing")
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.values.dtype:
+            return self.values
+        return self.values.astype(dtype)
+
+    def __getitem__(self, key):
+        """A slice gives a TimeIndex view; an integer gives the int64 timestamp."""
+        if isinstance(key, slice):
+            index = TimeIndex.__new__(TimeIndex)
+            index.values = self.values[key]
+            return index
+        return self.values[key]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TimeIndex) and np.array_equal(self.values, other.values)
+
+    __hash__ = None
+
+    def loc(self, start=None, stop=None) -> slice:
+        """
+        Bars whose time lies in [start, stop] (both inclusive, like pandas .loc).
+
+        Args:
+            start: first time (int ns, string, datetime64 or Timestamp); None = open
+            stop: last time; None = open
+
+        Returns:
+            slice of bar positions, usable on any array aligned with this index
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.values, _scalar_ns(start), side='left'))
+        hi = len(self.values) if stop is None else int(np.searchsorted(self.values, _scalar_ns(stop), side='right'))
+        return slice(lo, max(lo, hi))
+
+    def bar_of(self, when, method: str = 'exact'):
+        """
+        Map times to bar positions.
+
+        Args:
+            when: a time or an array of times
+            method (str): 'exact' (-1 if the time is not a bar), 'ffill'
+                (last bar at or before, -1 if none) or 'bfill' (first bar at
+                or after, -1 if none)
+
+        Returns:
+            int or np.ndarray of int64 bar positions
+
+        Raises:
+            ValueError: on an unknown method
+        """
+        scalar = np.ndim(when) == 0
+        t = np.atleast_1d(_scalar_ns(when) if scalar else _to_ns(when))
+        n = len(self.values)
+        if method == 'exact':
+            pos = np.searchsorted(self.values, t, side='left')
+            hit = pos < n
+            hit[hit] = self.values[pos[hit]] == t[hit]
+            bars = np.where(hit, pos, -1)
+        elif method == 'ffill':
+            bars = np.searchsorted(self.values, t, side='right') - 1
+        elif method == 'bfill':
+            pos = np.searchsorted(self.values, t, side='left')
+            bars = np.where(pos < n, pos, -1)
+        else:
+            raise ValueError(f"Invalid method: {method}")
+        bars = bars.astype(np.int64)
+        return int(bars[0]) if scalar else bars
+
+    def to_datetimeindex(self, tz: str = None) -> pd.DatetimeIndex:
+        """Build a pd.DatetimeIndex (UTC-converted to `tz` if given)."""
+        index = pd.DatetimeIndex(self.values.view('datetime64[ns]'))
+        return index if tz is None else index.tz_localize('UTC').tz_convert(tz)
+
+
+def align(indexes: list, how: str = 'inner'):
+    """
+    Align several time axes on a common calendar.
+
+    Args:
+        indexes (list): TimeIndex objects
+        how (str): 'inner' (times present in every index) or 'outer' (in any)
+
+    Returns:
+        tuple (TimeIndex, list of np.ndarray): the common axis and, per input,
+        the bar position of each common time in that input (-1 where missing)
+
+    Raises:
+        ValueError: on an unknown `how` or no indexes
+
+    Example:
+        common, (pos_a, pos_b) = align([TimeIndex(a.index), TimeIndex(b.index)])
+        panel = np.column_stack([a.to_numpy()[pos_a], b.to_numpy()[pos_b]])
+    """
+    if not indexes:
+        raise ValueError("No indexes to align")
+    if how == 'inner':
+        # start from the shortest axis and keep times found in every other one
+        common = min(indexes, key=len).values
+        for index in indexes:
+            common = common[index.bar_of(common) >= 0]
+    elif how == 'outer':
+        common = np.unique(np.concatenate([index.values for index in indexes]))
+    else:
+        raise ValueError(f"Invalid how: {how}")
+    result = TimeIndex.__new__(TimeIndex)
+    result.values = common
+    return result, [index.bar_of(common) for index in indexes]
+
+
+def take(values: np.ndarray, positions: np.ndarray, fill=np.nan) -> np.ndarray:
+    """Gather values[positions] with `fill` where a position is -1 (see align())."""
+    values = np.asarray(values)
+    missing = positions < 0
+    out = values[np.where(missing, 0, positions)] if len(values) else np.empty(len(positions))
+    if missing.any():
+        out = out.astype(np.result_type(out.dtype, np.asarray(fill).dtype))
+        out[missing] = fill
+    return out
+
+
+def _to_ns(values) -> np.ndarray:
+    """Convert an array-like of times to int64 epoch ns (int input is taken as ns)."""
+    if isinstance(values, TimeIndex):
+        return values.values
+    if isinstance(values, pd.DatetimeIndex):
+        if values.tz is not None:
+            values = values.tz_convert('UTC').tz_localize(None)
+        return values.as_unit('ns').asi8
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64, copy=False)
+    return values.astype('datetime64[ns]').view(np.int64)
+
+
+def _scalar_ns(when) -> int:
+    """Convert one time (int ns, string, datetime, datetime64, Timestamp) to int64 ns."""
+    if isinstance(when, (int, np.integer)):
+        return int(when)
+    # Timestamp.value is epoch ns, in UTC for tz-aware times
+    return pd.Timestamp(when).value
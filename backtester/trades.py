@@ -0,0 +1,166 @@
+"""
+Round-trip trade extraction from position paths.
+
+A trade is a maximal run of bars holding a position of one sign. It is
+entered at the close of its first bar and exited at the close of the bar
+where the position goes flat or flips (a flip exits one trade and enters
+the opposite one on the same bar). Adding to or trimming a position
+inside the run stays part of the same trade.
+
+Everything is computed with sign-change detection and segment reductions
+(ufunc.reduceat) over the flattened (runs x bars) arrays, so a sweep
+panel of thousands of runs is handled in one pass.
+
+Example:
+    result = Backtester(strategy, broker).run_array(prices)
+    trades = extract_trades(result['position'], prices)
+    trades[trades['pnl'] < 0]['mae']        # worst excursion of losing trades
+    summarize(trades)                        # per-run win rate, profit factor, ...
+"""
+import numpy as np
+import pandas as pd
+
+TRADE_DTYPE = np.dtype([
+    ('run', np.int64),           # column of the position panel (0 for 1-D input)
+    ('side', np.int8),           # +1 long, -1 short
+    ('entry_bar', np.int64),
+    ('exit_bar', np.int64),      # last bar for a trade still open at the end
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('size', np.int64),          # largest absolute position held
+    ('bars_held', np.int64),
+    ('pnl', np.float64),         # mark-to-market P&L, including any scaling in/out
+    ('mae', np.float64),         # maximum adverse excursion (<= 0)
+    ('mfe', np.float64),         # maximum favourable excursion (>= 0)
+    ('open', np.bool_),
+])
+
+
+def extract_trades(positions: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    """
+    Reconstruct round-trip trades from positions and prices.
+
+    Args:
+        positions: int positions held after each bar, shape (n,) or (n, runs)
+        prices: close prices, shape (n,) (shared by all runs) or (n, runs)
+
+    Returns:
+        structured np.ndarray of TRADE_DTYPE, ordered by run, then entry bar
+
+    Raises:
+        ValueError: if the shapes do not match
+    """
+    positions = np.asarray(positions)
+    prices = np.asarray(prices, dtype=np.float64)
+    if positions.ndim not in (1, 2) or prices.ndim not in (1, 2) or len(prices) != len(positions):
+        raise ValueError("positions and prices must be (n,) or (n, runs) arrays over the same bars")
+    n = len(positions)
+    positions = (positions if positions.ndim == 2 else positions[:, None]).astype(np.int64, copy=False)
+    if prices.ndim == 1:
+        prices = np.broadcast_to(prices[:, None], positions.shape)
+    elif prices.shape != positions.shape:
+        raise ValueError("prices must be (n,) or match the positions' shape")
+    runs = positions.shape[1]
+    if n == 0 or runs == 0:
+        return np.empty(0, dtype=TRADE_DTYPE)
+
+    # bar t's P&L comes from holding position[t-1] from close t-1 to close t
+    pnl = np.zeros(positions.shape)
+    pnl[1:] = positions[:-1] * np.diff(prices, axis=0)
+
+    # one run after another: flat index = run * n + bar
+    pos, px, pnl = positions.T.ravel(), np.ascontiguousarray(prices.T).ravel(), pnl.T.ravel()
+    sign = np.sign(pos)
+    bar = np.tile(np.arange(n), runs)
+    previous = np.empty_like(sign)
+    previous[0] = 0
+    previous[1:] = sign[:-1]
+    previous[bar == 0] = 0
+    following = np.empty_like(sign)
+    following[-1] = 0
+    following[:-1] = sign[1:]
+    following[bar == n - 1] = 0
+    held = sign != 0
+    starts = np.flatnonzero(held & (sign != previous))
+    ends = np.flatnonzero(held & (sign != following))
+    is_open = bar[ends] == n - 1
+    exits = np.where(is_open, ends, ends + 1)
+
+    # P&L accrues on bars start+1..exit; the running sum within that span
+    # is the trade's unrealized P&L path
+    running = np.cumsum(pnl)
+    path_min = _segment_reduce(np.minimum, running, starts + 1, exits + 1, np.inf)
+    path_max = _segment_reduce(np.maximum, running, starts + 1, exits + 1, -np.inf)
+    base = running[starts]
+
+    trades = np.empty(len(starts), dtype=TRADE_DTYPE)
+    trades['run'] = starts // n
+    trades['side'] = sign[starts]
+    trades['entry_bar'] = bar[starts]
+    trades['exit_bar'] = bar[exits]
+    trades['entry_price'] = px[starts]
+    trades['exit_price'] = px[exits]
+    trades['size'] = _segment_reduce(np.maximum, np.abs(pos), starts, ends + 1, 0)
+    trades['bars_held'] = exits - starts
+    trades['pnl'] = _segment_reduce(np.add, pnl, starts + 1, exits + 1, 0.0)
+    trades['mae'] = np.minimum(path_min - base, 0.0)
+    trades['mfe'] = np.maximum(path_max - base, 0.0)
+    trades['open'] = is_open
+    return trades
+
+
+def summarize(trades: np.ndarray, runs: int = None) -> pd.DataFrame:
+    """
+    Per-run trade statistics.
+
+    Args:
+        trades: output of extract_trades()
+        runs (int): number of runs, so runs without trades get a row
+            (default: 1 + the largest run id)
+
+    Returns:
+        pd.DataFrame indexed by run with columns trades, win_rate,
+        total_pnl, avg_pnl, profit_factor (gross profit / gross loss, inf
+        with no losses), avg_bars_held, max_mae and max_mfe
+    """
+    runs = (int(trades['run'].max()) + 1 if len(trades) else 0) if runs is None else runs
+    run = trades['run']
+    pnl = trades['pnl']
+
+    def per_run(weights=None):
+        return np.bincount(run, weights=weights, minlength=runs)[:runs]
+
+    count = per_run()
+    profit = per_run(np.where(pnl > 0, pnl, 0.0))
+    loss = -per_run(np.where(pnl < 0, pnl, 0.0))
+    # trades are grouped by run, so each run's extremes are one segment reduction
+    mae = np.zeros(runs)
+    mfe = np.zeros(runs)
+    traded = count > 0
+    starts = np.searchsorted(run, np.flatnonzero(traded))
+    if len(starts):
+        mae[traded] = np.minimum(np.minimum.reduceat(trades['mae'], starts), 0.0)
+        mfe[traded] = np.maximum(np.maximum.reduceat(trades['mfe'], starts), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'trades': count.astype(np.int64),
+            'win_rate': per_run(pnl > 0) / count,
+            'total_pnl': per_run(pnl),
+            'avg_pnl': per_run(pnl) / count,
+            'profit_factor': np.where(loss > 0, profit / loss, np.where(profit > 0, np.inf, np.nan)),
+            'avg_bars_held': per_run(trades['bars_held']) / count,
+            'max_mae': mae,
+            'max_mfe': mfe,
+        }, index=pd.RangeIndex(runs, name='run'))
+
+
+def _segment_reduce(ufunc, values, lo, hi, empty):
+    """ufunc.reduce over values[lo[i]:hi[i]] for every i (`empty` where lo == hi)."""
+    if len(lo) == 0:
+        return np.empty(0, dtype=values.dtype)
+    # reduceat over interleaved bounds: even slots are the segments
+    padded = np.append(values, values[:1])
+    bounds = np.empty(2 * len(lo), dtype=np.int64)
+    bounds[0::2], bounds[1::2] = lo, hi
+    out = ufunc.reduceat(padded, bounds)[0::2]
+    return np.where(hi > lo, out, empty)
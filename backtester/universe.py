@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+
+class SignalEvents:
+    """
+    Sparse, CSR-like index of position changes across a universe.
+
+    Events for bar t are symbols[indptr[t]:indptr[t+1]] with signed trade
+    sizes qty[indptr[t]:indptr[t+1]]. Only bars/symbols whose target
+    position changes appear, so storage is O(changes), not O(bars x symbols).
+
+    Args:
+        indptr (np.ndarray): int64 offsets, length n_bars + 1
+        symbols (np.ndarray): int64 symbol ids of each event, sorted by bar
+        qty (np.ndarray): int64 signed trade size of each event
+        n_symbols (int): width of the universe
+
+    Example:
+        events = SignalEvents.from_targets(targets)
+        syms, qty = events.at(10)   # trades executed at the close of bar 10
+    """
+
+    def __init__(self, indptr: np.ndarray, symbols: np.ndarray, qty: np.ndarray, n_symbols: int):
+        self.indptr = indptr
+        self.symbols = symbols
+        self.qty = qty
+        self.n_symbols = n_symbols
+
+    @classmethod
+    def from_targets(cls, targets: np.ndarray, initial: np.ndarray = None) -> "SignalEvents":
+        """
+        Build events from a dense (bars x symbols) target-position matrix.
+
+        Args:
+            targets: target position held after the close of each bar
+            initial: positions before bar 0 (default all zero)
+
+        Returns:
+            SignalEvents with one event per (bar, symbol) where the target changes
+        """
+        targets = np.asarray(targets)
+        n_bars, n_symbols = targets.shape
+        if initial is None:
+            initial = np.zeros(n_symbols, dtype=targets.dtype)
+        delta = np.diff(targets, axis=0, prepend=np.asarray(initial, dtype=targets.dtype)[None, :])
+        bars, symbols = np.nonzero(delta)
+        qty = delta[bars, symbols].astype(np.int64)
+        indptr = np.zeros(n_bars + 1, dtype=np.int64)
+        np.cumsum(np.bincount(bars, minlength=n_bars), out=indptr[1:])
+        return cls(indptr, symbols.astype(np.int64), qty, n_symbols)
+
+    @property
+    def bars(self) -> np.ndarray:
+        """Bar index of every event (expanded from indptr)."""
+        return np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+
+    def __len__(self) -> int:
+        return len(self.qty)
+
+    def at(self, bar: int):
+        """Return (symbols, qty) traded at the close of `bar`."""
+        lo, hi = self.indptr[bar], self.indptr[bar + 1]
+        return self.symbols[lo:hi], self.qty[lo:hi]
+
+    def positions(self) -> np.ndarray:
+        """Densify into a (bars x symbols) position matrix."""
+        dense = np.zeros((len(self.indptr) - 1, self.n_symbols), dtype=np.int64)
+        dense[self.bars, self.symbols] = self.qty
+        return np.cumsum(dense, axis=0, out=dense)
+
+
+class UniverseBacktester:
+    """
+    Cross-sectional backtester over many symbols sharing one cash account.
+
+    Same rules as Backtester, applied to every column of a price panel:
+    the target for bar t is the strategy signal at t-1, trades execute at
+    the close of t, and a BUY needs enough cash. Position changes are kept
+    as sparse SignalEvents, so trading work scales with the number of
+    changes; equity is marked to market with dense array operations.
+
+    Within a bar the sells execute before the buys, so a buy is checked
+    against the cash left after that bar's sells and any earlier buys.
+    This is what a Broker's per-order check would give with the orders
+    sent in that sequence. Sending them in another order (e.g. by
+    symbol) could reject a buy that passes here.
+
+    Args:
+        strategy: object with .signals_array(prices) -> ndarray, applied column-wise
+        cash (float): starting capital shared by all symbols (default 1M)
+        risk (RiskLimits): optional pre-trade limits, checked over the whole
+            target path in one vectorized pass (one bar = one day)
+
+    Returns:
+        pd.DataFrame with columns [equity, cash] indexed like the price panel
+
+    Example:
+        ub = UniverseBacktester(VolatilityBreakoutStrategy(lookback=20), cash=1e7)
+        result = ub.run(panel)        # panel: DataFrame, one column per symbol
+        ub.events.at(42)              # symbols and quantities traded on bar 42
+    """
+
+    def __init__(self, strategy, cash: float = 1_000_000, risk=None):
+        self.strategy = strategy
+        self.cash = cash
+        self.risk = risk
+        self.events = None
+
+    def run(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run the universe backtest over a (dates x symbols) price DataFrame.
+
+        Args:
+            prices: pd.DataFrame of daily prices, one column per symbol
+
+        Returns:
+            pd.DataFrame with index=dates, columns=[equity, cash]
+        """
+        out = self.run_array(prices.to_numpy())
+        return pd.DataFrame({'equity': out['equity'], 'cash': out['cash']}, index=prices.index)
+
+    def run_array(self, prices: np.ndarray, signals: np.ndarray = None) -> np.ndarray:
+        """
+        Run the universe backtest over a (bars x symbols) price array.
+
+        Args:
+            prices: 2-D np.ndarray of prices
+            signals: optional precomputed (bars x symbols) signals; computed
+                with the strategy when omitted
+
+        Returns:
+            structured np.ndarray with fields [equity, cash]
+
+        Raises:
+            ValueError: if prices are empty, not 2-D or not finite, or cash
+                runs out on a BUY
+            RiskLimitError: if the trades breach a risk limit
+        """
+        prices = _check_inputs(prices)
+        if signals is None:
+            signals = self.strategy.signals_array(prices)
+
+        # target at bar t is the signal at t-1; nothing is held before bar 1
+        signals = np.asarray(signals)
+        targets = np.zeros(prices.shape, dtype=signals.dtype)
+        targets[1:] = signals[:-1]
+        events = SignalEvents.from_targets(targets)
+        self.events = events
+
+        # cash moves only on event bars: one weighted bincount over the events;
+        # a bar's net flow going negative means its last buy (after the sells) fails
+        bars = events.bars
+        flows = -(events.qty * prices[bars, events.symbols])
+        cash_flow = np.bincount(bars, weights=flows, minlength=len(prices))
+        cash_flow[0] = self.cash
+        cash = np.cumsum(cash_flow)
+        buying = np.bincount(bars, weights=events.qty > 0, minlength=len(prices)) > 0
+        if np.any(buying & (cash < 0)):
+            raise ValueError("Insufficient cash")
+        if self.risk is not None:
+            self.risk.check_path(targets, prices, cash)
+
+        out = np.empty(len(prices), dtype=[('equity', np.float64), ('cash', np.float64)])
+        out['cash'] = cash
+        out['equity'] = cash + np.einsum('ij,ij->i', targets, prices)
+        return out
+
+
+def _check_inputs(prices):
+    """Validate a price panel; return it as a float64 array."""
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim != 2:
+        raise ValueError("prices must be 2-D (bars x symbols)")
+    if len(prices) == 0:
+        raise ValueError("Prices cannot be empty")
+    if not np.isfinite(prices).all():
+        raise ValueError("prices must be finite")
+    return prices
@@ -0,0 +1,70 @@
+"""
+Storage size and reload time of a parameter sweep: raw .npy vs ResultArchive.
+
+Runs Backtester over one seeded random walk for n_runs lookbacks, stores
+the [equity, cash, position] results once as raw .npy files and once in a
+results archive, and reports bytes on disk, compression ratio and the time
+to reload every run and a single run.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_archive.py [n_runs] [n_bars]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backtester.archive import ArchiveReader, ArchiveWriter
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def main(n_runs: int = 200, n_bars: int = 5_000) -> None:
+    rng = np.random.default_rng(42)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    results = {f"lb{lb}": Backtester(VolatilityBreakoutStrategy(lb), Broker()).run_array(prices)
+               for lb in range(2, n_runs + 2)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = os.path.join(tmp, "raw")
+        os.mkdir(raw_dir)
+        for key, result in results.items():
+            np.save(os.path.join(raw_dir, f"{key}.npy"), result)
+        raw_bytes = sum(os.path.getsize(os.path.join(raw_dir, name)) for name in os.listdir(raw_dir))
+
+        path = os.path.join(tmp, "sweep.btar")
+        start = time.perf_counter()
+        with ArchiveWriter(path) as archive:
+            archive.add_prices("walk", prices)
+            for key, result in results.items():
+                archive.add(key, result, prices="walk")
+        write_seconds = time.perf_counter() - start
+        archive_bytes = os.path.getsize(path)
+
+        start = time.perf_counter()
+        for key in results:
+            np.load(os.path.join(raw_dir, f"{key}.npy"))
+        raw_load = time.perf_counter() - start
+
+        with ArchiveReader(path) as archive:
+            start = time.perf_counter()
+            for key in archive.keys():
+                archive.load(key)
+            archive_load = time.perf_counter() - start
+        with ArchiveReader(path) as archive:
+            start = time.perf_counter()
+            archive.load(f"lb{n_runs // 2}")
+            single = time.perf_counter() - start
+
+    print(f"results archive  runs={n_runs}  bars={n_bars:,}")
+    print(f"  raw .npy   {raw_bytes / 1e6:9.2f} MB   load all {raw_load * 1e3:8.1f} ms")
+    print(f"  archive    {archive_bytes / 1e6:9.2f} MB   load all {archive_load * 1e3:8.1f} ms"
+          f"   one run {single * 1e3:.2f} ms   write {write_seconds * 1e3:.1f} ms")
+    print(f"  ratio      {raw_bytes / archive_bytes:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
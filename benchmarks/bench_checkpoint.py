@@ -0,0 +1,57 @@
+"""
+Cost of checkpointing a long backtest.
+
+Runs the same seeded random walk with and without a Checkpointer and
+reports total run time, loop overhead and the background writer's time per
+snapshot.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_checkpoint.py [n_bars] [every]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backtester.broker import Broker
+from backtester.checkpoint import Checkpointer, load_checkpoint
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def main(n_bars: int = 2_000_000, every: int = 100_000) -> None:
+    rng = np.random.default_rng(42)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    strategy = VolatilityBreakoutStrategy(lookback=20)
+
+    start = time.perf_counter()
+    Backtester(strategy, Broker(cash=1e9)).run_array(prices)
+    plain = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.ckpt")
+        cp = Checkpointer(path, every=every)
+        start = time.perf_counter()
+        Backtester(strategy, Broker(cash=1e9)).run_array(prices, checkpoint=cp)
+        looped = time.perf_counter() - start
+        cp.close()
+        total = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        load_checkpoint(path)
+        load = time.perf_counter() - start
+
+    writes = np.array(cp.write_seconds) * 1_000
+    print(f"bars={n_bars:,}  every={every:,}  snapshots={len(writes)}")
+    print(f"  run without checkpoint  {plain:8.3f} s")
+    print(f"  run with checkpoint     {looped:8.3f} s  (overhead {100 * (looped / plain - 1):+.1f}%)")
+    print(f"  incl. final flush       {total:8.3f} s")
+    print(f"  write per snapshot      {writes.mean():8.3f} ms mean, {writes.max():.3f} ms max")
+    print(f"  log size                {size / 2**20:8.2f} MiB, load {load * 1_000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,28 @@
+"""
+Large-scale differential test of the optimized backends against the oracle.
+
+Runs backtester.difftest over seeded randomized scenarios (gaps, constant
+prices, extreme moves, a 10x long series, ...), fails if any backend
+disagrees with the reference implementation, and reports per-backend
+speedup over the reference.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_difftest.py [n_bars] [seed]
+"""
+import sys
+
+from backtester.difftest import assert_equivalent, run_difftest, scenarios
+
+
+def main(n_bars: int = 20_000, seed: int = 0) -> None:
+    report = run_difftest(scenarios(n_bars=n_bars, seed=seed))
+    summary = report.groupby('backend').agg(
+        passed=('passed', 'all'), exact=('exact', 'mean'),
+        median_speedup=('speedup', 'median'), min_speedup=('speedup', 'min'))
+    print(f"difftest  scenarios={report['scenario'].nunique()}  bars={n_bars:,}  seed={seed}")
+    print(summary.to_string(float_format=lambda x: f"{x:8.2f}"))
+    assert_equivalent(report)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""
+Fill throughput and cash drift: float Broker vs FixedPointBroker.
+
+Books the same seeded stream of random fills three ways: one
+Broker.market_order() per fill (float cash), one
+FixedPointBroker.market_order() per fill, and a single
+FixedPointBroker.fill_batch() over the whole stream. Reports fills per
+second and how far the float cash ends from the exact ledger.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_fixedpoint.py [n_fills]
+"""
+import sys
+import time
+
+import numpy as np
+
+from backtester.broker import Broker, FixedPointBroker
+
+
+def main(n_fills: int = 1_000_000) -> None:
+    rng = np.random.default_rng(42)
+    qty = rng.integers(1, 100, n_fills) * rng.choice([-1, 1], n_fills)
+    price_ticks = rng.integers(1_000, 50_000, n_fills)
+    prices = price_ticks / 100
+    sides = np.where(qty > 0, "BUY", "SELL").tolist()
+    sizes = np.abs(qty).tolist()
+    cash = 1e12
+
+    broker = Broker(cash=cash)
+    start = time.perf_counter()
+    for side, size, price in zip(sides, sizes, prices.tolist()):
+        broker.market_order(side, size, price)
+    floating = time.perf_counter() - start
+
+    fixed = FixedPointBroker(cash=cash)
+    start = time.perf_counter()
+    for side, size, price in zip(sides, sizes, prices.tolist()):
+        fixed.market_order(side, size, price)
+    looped = time.perf_counter() - start
+
+    batch = FixedPointBroker(cash=cash)
+    start = time.perf_counter()
+    batch.fill_batch(qty, batch.to_ticks(prices))
+    batched = time.perf_counter() - start
+
+    assert batch.cash_ticks == fixed.cash_ticks and batch.position == fixed.position
+    # exact ledger in Python ints
+    ledger = int(cash) * 100 - sum(int(q) * int(p) for q, p in zip(qty, price_ticks))
+    drift = broker.cash - ledger / 100
+    print(f"fills={n_fills:,}")
+    print(f"  Broker.market_order            {n_fills / floating / 1e6:8.2f} M fills/s")
+    print(f"  FixedPointBroker.market_order  {n_fills / looped / 1e6:8.2f} M fills/s")
+    print(f"  FixedPointBroker.fill_batch    {n_fills / batched / 1e6:8.2f} M fills/s"
+          f"  ({floating / batched:.0f}x float loop)")
+    print(f"  float cash drift vs ledger     {drift:+.6f}  (fixed point: {batch.cash_ticks - ledger:+d} ticks)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""
+Per-bar decision latency of LiveTrader.
+
+Feeds a seeded random walk through LiveTrader.on_bar() one price at a time
+and reports p50 / p99 / p99.9 latency of each call.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_live.py [n_bars] [lookback]
+"""
+import sys
+import time
+
+import numpy as np
+
+from backtester.live import LiveTrader
+
+
+def main(n_bars: int = 1_000_000, lookback: int = 20) -> None:
+    rng = np.random.default_rng(42)
+    prices = (100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))).tolist()
+    trader = LiveTrader(lookback=lookback)
+    timings = np.empty(n_bars, dtype=np.int64)
+    clock = time.perf_counter_ns
+    on_bar = trader.on_bar
+
+    for i, price in enumerate(prices):
+        start = clock()
+        on_bar(price)
+        timings[i] = clock() - start
+
+    p50, p99, p999 = np.percentile(timings, [50, 99, 99.9]) / 1_000
+    print(f"LiveTrader.on_bar  bars={n_bars:,}  lookback={lookback}")
+    print(f"  p50   {p50:8.3f} us")
+    print(f"  p99   {p99:8.3f} us")
+    print(f"  p99.9 {p999:8.3f} us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""
+Chunked backtest with and without background prefetching.
+
+Saves a seeded random walk as .npy, then runs it chunk by chunk through
+run_chunks(): once loading each chunk in the foreground, once with a
+Prefetcher loading the next chunk while the current one is simulated.
+Files live in a temporary directory (usually the page cache), so the
+measured I/O is a lower bound for disk or network storage.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pipeline.py [n_bars] [chunk]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.pipeline import NpyChunks, Prefetcher, run_chunks
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def main(n_bars: int = 10_000_000, chunk: int = 1_000_000) -> None:
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "prices.npy")
+        np.save(path, 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars))))
+        source = NpyChunks(path, chunk)
+
+        def serial():
+            buffer = np.empty(source.capacity, dtype=source.dtype)
+            for item in source.items:
+                yield buffer[:source(item, buffer)]
+
+        start = time.perf_counter()
+        for _ in run_chunks(Backtester(VolatilityBreakoutStrategy(20), Broker(cash=1e12)), serial()):
+            pass
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with Prefetcher(source, source.items, source.capacity, dtype=source.dtype) as chunks:
+            backtester = Backtester(VolatilityBreakoutStrategy(20), Broker(cash=1e12))
+            for _ in run_chunks(backtester, (c.data for c in chunks)):
+                pass
+        prefetch_time = time.perf_counter() - start
+
+    print(f"bars={n_bars:,}  chunk={chunk:,}  chunks={len(source.items)}")
+    print(f"  serial      {serial_time:7.3f} s")
+    print(f"  prefetched  {prefetch_time:7.3f} s  (loading {chunks.load_seconds:.3f} s in background, "
+          f"consumer waited {chunks.wait_seconds:.3f} s)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""
+Cost of the data-quality pre-pass next to the backtest it guards.
+
+Injects NaNs, zeros, fat-finger ticks and a few duplicate timestamps into
+a seeded random walk, then times DataValidator.check(), .clean() and a
+Backtester.run_array() over the cleaned bars.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_quality.py [n_bars] [n_bad]
+"""
+import sys
+import time
+
+import numpy as np
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.quality import ISSUES, DataValidator
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def main(n_bars: int = 10_000_000, n_bad: int = 1_000) -> None:
+    rng = np.random.default_rng(42)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+    times = np.arange(n_bars, dtype=np.int64) * 60_000_000_000
+    bad = rng.choice(np.arange(1, n_bars - 1), size=4 * n_bad, replace=False).reshape(4, n_bad)
+    prices[bad[0]] = np.nan
+    prices[bad[1]] = 0.0
+    prices[bad[2]] *= 10
+    times[bad[3]] = times[bad[3] - 1]
+    validator = DataValidator()
+
+    start = time.perf_counter()
+    validator.check(prices, times)
+    check = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cleaned = validator.clean(prices, times)
+    clean = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Backtester(VolatilityBreakoutStrategy(20), Broker(cash=1e12)).run_array(cleaned.prices)
+    run = time.perf_counter() - start
+
+    print(f"bars={n_bars:,}  injected={n_bad:,} of each issue")
+    print("  found   " + "  ".join(f"{issue}={len(cleaned.report[issue]):,}" for issue in ISSUES))
+    print(f"  check      {check:8.3f} s  ({check / n_bars * 1e9:5.1f} ns/bar)")
+    print(f"  clean      {clean:8.3f} s  ({clean / n_bars * 1e9:5.1f} ns/bar)")
+    print(f"  run_array  {run:8.3f} s  (clean adds {100 * clean / run:.1f}%)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
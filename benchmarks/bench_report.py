@@ -0,0 +1,44 @@
+"""
+Report build time and size for a long run, against rendering every bar.
+
+Runs a breakout backtest over a seeded random walk, then times
+Report.add() (summary statistics + downsampling) and to_html() with LTTB
+and min/max bucketing, and compares the HTML size with an SVG holding
+every bar.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_report.py [n_bars] [points]
+"""
+import sys
+import time
+
+import numpy as np
+
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.report import Report
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+def main(n_bars: int = 10_000_000, points: int = 2000) -> None:
+    rng = np.random.default_rng(42)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+    result = Backtester(VolatilityBreakoutStrategy(20), Broker(cash=1e12)).run_result(prices)
+    result.equity_array
+
+    print(f"bars={n_bars:,}  points={points:,}")
+    for method in ('lttb', 'minmax'):
+        report = Report(points=points, method=method)
+        start = time.perf_counter()
+        report.add("lb20", result)
+        add = time.perf_counter() - start
+        start = time.perf_counter()
+        doc = report.to_html()
+        render = time.perf_counter() - start
+        print(f"  {method:<7} add {add:6.3f} s  to_html {render:6.3f} s  html {len(doc) / 1e3:8.1f} kB")
+    # every bar as "x,y " with one decimal: ~16 bytes per point, two curves
+    print(f"  full-resolution SVG would be ~{2 * 16 * n_bars / 1e6:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
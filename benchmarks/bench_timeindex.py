@@ -0,0 +1,47 @@
+"""
+Date-range slicing cost: pandas DatetimeIndex vs TimeIndex.
+
+Cuts many short date windows out of a long daily series, the way a
+short-window, many-run sweep does, and times the lookup plus slice with
+Series.loc and with TimeIndex.loc on a plain array.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_timeindex.py [n_bars] [n_windows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtester.timeindex import TimeIndex
+
+
+def main(n_bars: int = 10_000, n_windows: int = 20_000) -> None:
+    dates = pd.bdate_range("1990-01-01", periods=n_bars)
+    series = pd.Series(np.linspace(100, 200, n_bars), index=dates)
+    values = series.to_numpy()
+    index = TimeIndex(dates)
+    rng = np.random.default_rng(0)
+    starts = dates[rng.integers(0, n_bars - 60, n_windows)]
+    stops = starts + pd.Timedelta(days=60)
+
+    start = time.perf_counter()
+    for lo, hi in zip(starts, stops):
+        series.loc[lo:hi]
+    pandas_seconds = time.perf_counter() - start
+
+    lo_ns, hi_ns = starts.as_unit('ns').asi8.tolist(), stops.as_unit('ns').asi8.tolist()
+    start = time.perf_counter()
+    for lo, hi in zip(lo_ns, hi_ns):
+        values[index.loc(lo, hi)]
+    index_seconds = time.perf_counter() - start
+
+    print(f"date-range slicing  bars={n_bars:,}  windows={n_windows:,}")
+    print(f"  Series.loc     {pandas_seconds / n_windows * 1e6:8.2f} us/window")
+    print(f"  TimeIndex.loc  {index_seconds / n_windows * 1e6:8.2f} us/window"
+          f"  ({pandas_seconds / index_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -53,6 +53,23 @@ def volatile_prices():
     return pd.Series(prices, index=pd.date_range('2023-01-01', periods=50))
 
 
+@pytest.fixture
+def walk(request):
+    """
+    A seeded geometric random walk starting near 100.
+
+    2,000 bars of 2% steps from seed 0 unless the module or test picks
+    its own with @pytest.mark.walk(n=..., sigma=..., seed=...).
+
+    Returns:
+        np.ndarray: prices
+    """
+    marker = request.node.get_closest_marker('walk')
+    options = {'n': 2_000, 'sigma': 0.02, 'seed': 0, **(marker.kwargs if marker else {})}
+    rng = np.random.default_rng(options['seed'])
+    return 100 * np.exp(np.cumsum(rng.normal(0, options['sigma'], options['n'])))
+
+
 @pytest.fixture
 def constant_prices():
     """
@@ -0,0 +1,171 @@
+"""
+Unit tests for the corporate-action AdjustmentIndex.
+
+Tests should verify:
+- Cumulative factors for splits and dividends, applied to earlier bars only
+- Lazy slices equal the corresponding part of a fully adjusted series
+- Engine runs on raw prices with adjustments keep accounting continuous
+"""
+import numpy as np
+import pytest
+from backtester.adjustments import AdjustmentIndex
+from backtester.broker import Broker
+from backtester.checkpoint import Checkpointer
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+@pytest.fixture
+def raw():
+    """600 bars of adjusted prices turned raw by a 2:1 split at bar 200 and a 3:1 split at bar 400."""
+    rng = np.random.default_rng(11)
+    adjusted = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 600)))
+    scale = np.ones(600)
+    scale[:400] *= 3.0
+    scale[:200] *= 2.0
+    return adjusted * scale, adjusted
+
+
+class TestFactors:
+    """Test factor construction and lazy slicing."""
+
+    def test_split_factors(self):
+        """
+        Verify a 2:1 split at bar 3 halves bars 0..2 only.
+
+        Expected: factors [0.5, 0.5, 0.5, 1, 1]
+        """
+        adj = AdjustmentIndex.from_actions(np.full(5, 10.0), splits={3: 2.0})
+        np.testing.assert_array_equal(adj.factors(0, 5), [0.5, 0.5, 0.5, 1.0, 1.0])
+        assert len(adj) == 1
+
+    def test_dividend_factor(self):
+        """
+        Verify a dividend scales earlier bars by (1 - dividend / previous close).
+
+        Expected: $1 dividend on a $20 close -> factor 0.95 before the ex-date
+        """
+        prices = np.array([20.0, 20.0, 19.0, 19.0])
+        adj = AdjustmentIndex.from_actions(prices, dividends={2: 1.0})
+        np.testing.assert_allclose(adj.adjust(prices), [19.0, 19.0, 19.0, 19.0])
+
+    def test_removes_split_jumps(self, raw):
+        """
+        Verify adjusting the raw series recovers the adjusted series.
+
+        Expected: equal up to rounding
+        """
+        prices, adjusted = raw
+        adj = AdjustmentIndex.from_actions(prices, splits={200: 2.0, 400: 3.0})
+        np.testing.assert_allclose(adj.adjust(prices), adjusted, rtol=1e-12)
+
+    def test_slice_matches_full(self, raw):
+        """
+        Verify a lazily adjusted slice equals the same slice of the full adjustment.
+
+        Expected: identical values for a slice spanning one event, and for 2-D input
+        """
+        prices, _ = raw
+        adj = AdjustmentIndex.from_actions(prices, splits={200: 2.0, 400: 3.0}, dividends={300: 1.0})
+        full = adj.adjust(prices)
+        np.testing.assert_array_equal(adj.adjust(prices, 150, 250), full[150:250])
+        panel = np.column_stack([prices, prices])
+        np.testing.assert_array_equal(adj.adjust(panel, 390, 410)[:, 1], full[390:410])
+        np.testing.assert_array_equal(adj.events(200, 400), [0, 1])
+
+    def test_returns_match_adjusted_prices(self, raw):
+        """
+        Verify patched raw returns equal the returns of the adjusted prices.
+
+        Expected: equal up to rounding, for 1-D and 2-D input; same signals
+        """
+        prices, _ = raw
+        adj = AdjustmentIndex.from_actions(prices, splits={200: 2.0, 400: 3.0}, dividends={300: 1.0})
+        adjusted = adj.adjust(prices)
+        expected = adjusted[1:] / adjusted[:-1] - 1.0
+        returns = np.concatenate(([0.0], prices[1:] / prices[:-1] - 1.0))
+        np.testing.assert_allclose(adj.adjust_returns(returns, prices)[1:], expected, rtol=1e-12, atol=1e-15)
+        panel = np.column_stack([prices, prices])
+        panel_returns = np.vstack(([0.0, 0.0], panel[1:] / panel[:-1] - 1.0))
+        np.testing.assert_allclose(adj.adjust_returns(panel_returns, panel)[1:, 1], expected, rtol=1e-12, atol=1e-15)
+        strategy = VolatilityBreakoutStrategy(10)
+        np.testing.assert_array_equal(strategy.signals_array(prices, adjustments=adj),
+                                      strategy.signals_array(adjusted))
+
+    def test_validation(self):
+        """
+        Verify malformed events raise ValueError.
+
+        Expected: errors for bar 0, unsorted bars, bad ratio, negative or too large dividend
+        """
+        with pytest.raises(ValueError):
+            AdjustmentIndex([0], [2.0], [0.0], [0.5])
+        with pytest.raises(ValueError):
+            AdjustmentIndex([3, 2], [2.0, 2.0], [0.0, 0.0], [0.5, 0.5])
+        with pytest.raises(ValueError):
+            AdjustmentIndex.from_actions(np.ones(5), splits={2: -1.0})
+        with pytest.raises(ValueError):
+            AdjustmentIndex([2], [1.0], [-1.0], [1.0])
+        with pytest.raises(ValueError):
+            AdjustmentIndex.from_actions(np.ones(5), dividends={2: 1.0})
+        with pytest.raises(ValueError):
+            AdjustmentIndex.from_actions(np.ones(5), dividends={9: 0.1})
+
+
+class TestEngineAdjustments:
+    """Test Backtester.run_array(adjustments=...)."""
+
+    def test_signals_use_adjusted_prices(self, raw):
+        """
+        Verify positions match a run on adjusted prices until the first split.
+
+        Expected: identical positions before bar 200; no trade triggered by the split itself
+        """
+        prices, adjusted = raw
+        adj = AdjustmentIndex.from_actions(prices, splits={200: 2.0, 400: 3.0})
+        strategy = VolatilityBreakoutStrategy(lookback=10)
+        expected = Backtester(strategy, Broker(1_000_000)).run_array(adjusted)
+        result = Backtester(strategy, Broker(1_000_000)).run_array(prices, adjustments=adj)
+        np.testing.assert_array_equal(result['position'][:200], expected['position'][:200])
+
+    def test_equity_continuous_across_split(self, raw):
+        """
+        Verify the split rescales the held position so equity does not jump.
+
+        Expected: equity[b] - equity[b-1] == held shares x post-split price - old value
+        """
+        prices, _ = raw
+        adj = AdjustmentIndex.from_actions(prices, splits={200: 2.0, 400: 3.0})
+        result = Backtester(VolatilityBreakoutStrategy(lookback=10), Broker(1_000_000)).run_array(
+            prices, adjustments=adj)
+        for bar, ratio in ((200, 2.0), (400, 3.0)):
+            held = result['position'][bar - 1]
+            change = held * ratio * prices[bar] - held * prices[bar - 1]
+            assert result['equity'][bar] - result['equity'][bar - 1] == pytest.approx(change)
+
+    def test_dividend_credited(self):
+        """
+        Verify a held position receives its dividend at the ex-date bar.
+
+        Expected: holding 1 share, cash rises by exactly the $2 dividend
+        """
+        prices = np.array([100.0, 101.0, 102.0, 103.0, 101.0, 102.0])
+        adj = AdjustmentIndex.from_actions(prices, dividends={4: 2.0})
+        strategy = VolatilityBreakoutStrategy(lookback=20)
+        result = Backtester(strategy, Broker(1_000)).run_array(prices, adjustments=adj)
+        assert result['position'][3] == result['position'][4] == 1
+        assert result['cash'][4] == result['cash'][3] + 2.0
+
+    def test_checkpointed_run_matches(self, raw, tmp_path):
+        """
+        Verify adjustments apply identically in checkpointed segments.
+
+        Expected: same result with and without a Checkpointer
+        """
+        prices, _ = raw
+        adj = AdjustmentIndex.from_actions(prices, splits={200: 2.0, 400: 3.0}, dividends={300: 1.0})
+        strategy = VolatilityBreakoutStrategy(lookback=10)
+        expected = Backtester(strategy, Broker(1_000_000)).run_array(prices, adjustments=adj)
+        with Checkpointer(str(tmp_path / "run.ckpt"), every=150) as cp:
+            result = Backtester(strategy, Broker(1_000_000)).run_array(prices, checkpoint=cp, adjustments=adj)
+        np.testing.assert_array_equal(result, expected)
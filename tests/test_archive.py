@@ -0,0 +1,225 @@
+"""
+Unit tests for the compressed results archive.
+
+Tests should verify:
+- Runs round-trip bit for bit, including splits/dividends and timestamps
+- Random access to one run, metadata and append mode
+- The archive is much smaller than the raw arrays
+- Invalid inputs and damaged files are rejected
+"""
+import os
+
+import numpy as np
+import pytest
+from backtester.adjustments import AdjustmentIndex
+from backtester.archive import ArchiveReader, ArchiveWriter
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.sizing import VolTargetSizer
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+pytestmark = pytest.mark.walk(n=2_000, seed=8)
+
+
+@pytest.fixture
+def sweep(walk):
+    """run_array results for lookbacks 2..21."""
+    return {f"lb{lb}": Backtester(VolatilityBreakoutStrategy(lb), Broker()).run_array(walk) for lb in range(2, 22)}
+
+
+@pytest.fixture
+def archive_path(tmp_path, walk, sweep):
+    """An archive holding the sweep, with lookback metadata."""
+    path = str(tmp_path / "sweep.btar")
+    with ArchiveWriter(path) as archive:
+        archive.add_prices("walk", walk)
+        for key, result in sweep.items():
+            archive.add(key, result, prices="walk", meta={'lookback': int(key[2:])})
+    return path
+
+
+class TestRoundTrip:
+    """Test lossless encoding."""
+
+    def test_bit_exact(self, archive_path, sweep):
+        """
+        Verify every run decodes to exactly the array that was added.
+
+        Expected: identical bytes, including rebuilt equity
+        """
+        with ArchiveReader(archive_path) as archive:
+            assert len(archive) == len(sweep)
+            for key, result in sweep.items():
+                assert archive.load(key).tobytes() == result.tobytes()
+
+    def test_corporate_actions_and_sizing(self, tmp_path, walk):
+        """
+        Verify runs whose cash does not follow the trade flows still round-trip.
+
+        Expected: exact equality for a sized run with a split and a dividend
+        """
+        adj = AdjustmentIndex.from_actions(walk, splits={500: 2.0}, dividends={1_200: 0.3})
+        strategy = VolatilityBreakoutStrategy(10)
+        result = Backtester(strategy, Broker(), sizer=VolTargetSizer(fraction=0.3)).run_array(
+            walk, adjustments=adj)
+        path = str(tmp_path / "adj.btar")
+        with ArchiveWriter(path) as archive:
+            archive.add_prices("walk", walk)
+            archive.add("sized", result, prices="walk")
+        with ArchiveReader(path) as archive:
+            assert archive.load("sized").tobytes() == result.tobytes()
+
+    def test_timestamps(self, tmp_path, walk):
+        """
+        Verify a leading timestamp field is stored and restored.
+
+        Expected: identical structured array with the timestamp field
+        """
+        timestamps = np.arange(len(walk), dtype=np.int64) * 86_400_000_000_000 + 1_600_000_000_000_000_000
+        result = Backtester(VolatilityBreakoutStrategy(5), Broker()).run_array(walk, timestamps=timestamps)
+        path = str(tmp_path / "ts.btar")
+        with ArchiveWriter(path) as archive:
+            archive.add_prices("walk", walk)
+            archive.add("run", result, prices="walk")
+        with ArchiveReader(path) as archive:
+            loaded = archive.load("run")
+        assert loaded.dtype == result.dtype
+        assert loaded.tobytes() == result.tobytes()
+
+    def test_timestamp_deltas_stay_narrow(self, tmp_path, walk):
+        """
+        Verify the epoch offset of the first timestamp does not widen the delta stream.
+
+        Expected: millisecond steps stored in 4 bytes; exact round trip
+        """
+        timestamps = np.arange(len(walk), dtype=np.int64) * 1_000_000 + 1_600_000_000_000_000_000
+        result = Backtester(VolatilityBreakoutStrategy(5), Broker()).run_array(walk, timestamps=timestamps)
+        path = str(tmp_path / "ms.btar")
+        with ArchiveWriter(path) as archive:
+            archive.add_prices("walk", walk)
+            archive.add("run", result, prices="walk")
+            assert np.dtype(archive._runs["run"]['sections']['timestamp'][2]).itemsize == 4
+        with ArchiveReader(path) as archive:
+            assert archive.load("run").tobytes() == result.tobytes()
+
+    def test_float32_runs(self, tmp_path, walk):
+        """
+        Verify float32 results keep their dtype and bits, next to float64 runs.
+
+        Expected: each run loads back with its own dtype, byte for byte
+        """
+        adj = AdjustmentIndex.from_actions(walk, splits={500: 2.0}, dividends={1_200: 0.3})
+        results = {str(np.dtype(dtype)): Backtester(VolatilityBreakoutStrategy(10), Broker(), dtype=dtype).run_array(
+            walk, adjustments=adj) for dtype in (np.float32, np.float64)}
+        path = str(tmp_path / "f32.btar")
+        with ArchiveWriter(path) as archive:
+            archive.add_prices("walk", walk)
+            for key, result in results.items():
+                archive.add(key, result, prices="walk")
+        with ArchiveReader(path) as archive:
+            for key, result in results.items():
+                loaded = archive.load(key)
+                assert loaded.dtype == result.dtype
+                assert loaded.tobytes() == result.tobytes()
+
+
+class TestAccess:
+    """Test random access, metadata and appending."""
+
+    def test_keys_meta_and_prices(self, archive_path, walk):
+        """
+        Verify the index exposes keys, metadata and stored prices.
+
+        Expected: insertion-ordered keys, lookback metadata, exact prices
+        """
+        with ArchiveReader(archive_path) as archive:
+            assert archive.keys()[:2] == ["lb2", "lb3"]
+            assert "lb7" in archive and "lb99" not in archive
+            assert archive.meta("lb7") == {'lookback': 7}
+            np.testing.assert_array_equal(archive.prices("walk"), walk)
+
+    def test_append(self, archive_path, walk, sweep):
+        """
+        Verify append mode keeps existing runs and adds new ones.
+
+        Expected: 21 runs, old and new both decode exactly
+        """
+        extra = Backtester(VolatilityBreakoutStrategy(50), Broker()).run_array(walk)
+        with ArchiveWriter(archive_path, append=True) as archive:
+            archive.add("lb50", extra, prices="walk")
+        with ArchiveReader(archive_path) as archive:
+            assert len(archive) == len(sweep) + 1
+            assert archive.load("lb50").tobytes() == extra.tobytes()
+            assert archive.load("lb2").tobytes() == sweep["lb2"].tobytes()
+
+    def test_crashed_append_keeps_archive(self, archive_path, walk, sweep):
+        """
+        Verify an append that dies before close() leaves the earlier runs readable.
+
+        Expected: the original runs after the crash; a later append adds to them
+        """
+        extra = Backtester(VolatilityBreakoutStrategy(50), Broker()).run_array(walk)
+        archive = ArchiveWriter(archive_path, append=True)
+        archive.add("lb50", extra, prices="walk")
+        archive._file.close()  # the process dies: no footer written
+        with ArchiveReader(archive_path) as reader:
+            assert reader.keys() == list(sweep)
+            assert reader.load("lb2").tobytes() == sweep["lb2"].tobytes()
+        with ArchiveWriter(archive_path, append=True) as archive:
+            archive.add("lb50", extra, prices="walk")
+        with ArchiveReader(archive_path) as reader:
+            assert len(reader) == len(sweep) + 1
+            assert reader.load("lb50").tobytes() == extra.tobytes()
+
+    def test_compression_ratio(self, archive_path, sweep):
+        """
+        Verify the archive is at least 10x smaller than the raw arrays.
+
+        Expected: raw bytes / archive bytes >= 10
+        """
+        raw = sum(result.nbytes for result in sweep.values())
+        assert raw / os.path.getsize(archive_path) >= 10
+
+
+class TestValidation:
+    """Test error handling."""
+
+    def test_add_errors(self, tmp_path, walk, sweep):
+        """
+        Verify bad adds raise ValueError.
+
+        Expected: unknown prices, duplicate key/prices, wrong length, inconsistent equity
+        """
+        with ArchiveWriter(str(tmp_path / "bad.btar")) as archive:
+            with pytest.raises(ValueError, match="Unknown prices"):
+                archive.add("lb2", sweep["lb2"], prices="walk")
+            archive.add_prices("walk", walk)
+            with pytest.raises(ValueError, match="already"):
+                archive.add_prices("walk", walk)
+            archive.add("lb2", sweep["lb2"], prices="walk")
+            with pytest.raises(ValueError, match="already"):
+                archive.add("lb2", sweep["lb2"], prices="walk")
+            with pytest.raises(ValueError, match="length"):
+                archive.add("short", sweep["lb3"][:10], prices="walk")
+            broken = sweep["lb3"].copy()
+            broken['equity'][5] += 1.0
+            with pytest.raises(ValueError, match="equity"):
+                archive.add("broken", broken, prices="walk")
+
+    def test_damaged_file(self, archive_path, tmp_path):
+        """
+        Verify a truncated or foreign file is rejected.
+
+        Expected: ValueError on open
+        """
+        with open(archive_path, 'rb') as f:
+            data = f.read()
+        truncated = tmp_path / "truncated.btar"
+        truncated.write_bytes(data[:-3])
+        with pytest.raises(ValueError, match="complete"):
+            ArchiveReader(str(truncated))
+        tiny = tmp_path / "tiny.btar"
+        tiny.write_bytes(b"abc")
+        with pytest.raises(ValueError, match="not a results archive"):
+            ArchiveReader(str(tiny))
@@ -6,9 +6,13 @@ Tests should verify:
 - Input validation (side, qty)
 - Insufficient cash/shares handling
 - Edge cases (zero qty, negative values)
+- Fixed-point (int64 tick) cash accounting and batch fills
 """
+import numpy as np
 import pytest
-from backtester.broker import Broker
+from backtester.broker import Broker, FixedPointBroker
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
 
 
 class TestBuyOrders:
@@ -311,3 +315,169 @@ class TestEdgeCases:
         # Step 2: Assert final position and cash
         pass
         # YOUR CODE ENDS HERE
+
+
+class TestCorporateActions:
+    """Test split and dividend bookkeeping."""
+
+    def test_split_scales_position(self, broker):
+        """
+        Verify a 2-for-1 split doubles the position and leaves cash alone.
+
+        Expected: position 10 -> 20, cash unchanged
+        """
+        broker.market_order("BUY", 10, 50.0)
+        broker.apply_split(2.0, 25.0)
+        assert broker.position == 20
+        assert broker.cash == 500
+
+    def test_fractional_shares_paid_in_cash(self, broker):
+        """
+        Verify fractional split shares are settled at the post-split price.
+
+        Expected: 3 shares x 1.5 = 4 shares + 0.5 x $40 cash; shorts truncate toward zero
+        """
+        broker.position = 3
+        broker.apply_split(1.5, 40.0)
+        assert broker.position == 4
+        assert broker.cash == 1_020
+        broker.position = -3
+        broker.apply_split(1.5, 40.0)
+        assert broker.position == -4
+        assert broker.cash == 1_000
+
+    def test_reverse_split_and_invalid_ratio(self, broker):
+        """
+        Verify a 1-for-10 reverse split and ratio validation.
+
+        Expected: 25 shares -> 2 shares + 0.5 x $100 cash; ratio <= 0 raises ValueError
+        """
+        broker.position = 25
+        broker.apply_split(0.1, 100.0)
+        assert broker.position == 2
+        assert broker.cash == pytest.approx(1_050)
+        with pytest.raises(ValueError):
+            broker.apply_split(0.0, 100.0)
+
+    def test_dividend(self, broker):
+        """
+        Verify dividends are credited to longs and charged to shorts.
+
+        Expected: +$5 for 10 shares at $0.50, then -$2.50 for -5 shares
+        """
+        broker.position = 10
+        broker.apply_dividend(0.5)
+        assert broker.cash == 1_005
+        broker.position = -5
+        broker.apply_dividend(0.5)
+        assert broker.cash == 1_002.5
+
+
+class TestFixedPointBroker:
+    """Test int64 tick cash accounting."""
+
+    def test_no_drift(self):
+        """
+        Verify many fills at a non-representable price leave exact cash.
+
+        Given: 100,000 buys of 1 share @ $0.10, then one sell of all of them
+        Expected: cash back to exactly $1,000,000 (the float Broker drifts)
+        """
+        fixed, floating = FixedPointBroker(cash=1_000_000), Broker(cash=1_000_000)
+        for broker in (fixed, floating):
+            for _ in range(100_000):
+                broker.market_order("BUY", 1, 0.1)
+            broker.market_order("SELL", 100_000, 0.1)
+        assert fixed.cash_ticks == 100_000_000
+        assert fixed.cash == 1_000_000
+        assert floating.cash != 1_000_000
+
+    def test_matches_broker_rules(self):
+        """
+        Verify validation and cash checks match Broker.market_order.
+
+        Expected: exact-cash buy succeeds, one tick more raises; bad side/qty raise
+        """
+        broker = FixedPointBroker(cash=100)
+        broker.market_order("BUY", 4, 25.0)
+        assert (broker.cash_ticks, broker.position) == (0, 4)
+        with pytest.raises(ValueError, match="Insufficient cash"):
+            broker.market_order("BUY", 1, 0.01)
+        broker.market_order("SELL", 6, 10.125)  # rounds half to even: 10.12
+        assert (broker.cash_ticks, broker.position) == (6_072, -2)
+        with pytest.raises(ValueError):
+            broker.market_order("HOLD", 1, 1.0)
+        with pytest.raises(ValueError):
+            broker.market_order("BUY", 0, 1.0)
+        with pytest.raises(ValueError):
+            FixedPointBroker(ticks_per_unit=0)
+
+    def test_fill_batch_equals_sequential(self):
+        """
+        Verify fill_batch books the same cash path as one order per fill.
+
+        Expected: identical per-fill cash ticks and final position
+        """
+        rng = np.random.default_rng(0)
+        qty = rng.integers(-50, 51, 1_000)
+        price = rng.integers(1_000, 20_000, 1_000)
+        batch, loop = FixedPointBroker(cash=10_000_000), FixedPointBroker(cash=10_000_000)
+        path = batch.fill_batch(qty, price)
+        expected = []
+        for q, p in zip(qty, price):
+            if q:
+                loop.market_order_ticks("BUY" if q > 0 else "SELL", abs(int(q)), int(p))
+            expected.append(loop.cash_ticks)
+        assert path.tolist() == expected
+        assert (batch.cash_ticks, batch.position) == (loop.cash_ticks, loop.position)
+
+    def test_fill_batch_is_atomic(self):
+        """
+        Verify a batch with an unaffordable buy books nothing.
+
+        Expected: ValueError naming the fill; cash and position unchanged
+        """
+        broker = FixedPointBroker(cash=100)
+        with pytest.raises(ValueError, match="fill 1"):
+            broker.fill_batch([5, 6, -11], [1_000, 1_000, 1_000])
+        assert (broker.cash_ticks, broker.position) == (10_000, 0)
+        assert broker.fill_batch([], []).size == 0
+        with pytest.raises(ValueError):
+            broker.fill_batch([1, 2], [1])
+        with pytest.raises(ValueError, match="overflow"):
+            broker.fill_batch([-2**40], [2**40])
+
+    def test_corporate_actions_and_state(self):
+        """
+        Verify splits, dividends and get_state/set_state stay in ticks.
+
+        Expected: cash in lieu and dividends rounded to cents; state round-trips
+        """
+        broker = FixedPointBroker(cash=1_000)
+        broker.position = 3
+        broker.apply_split(1.5, 40.0)
+        broker.apply_dividend(0.333)  # 4 x 0.333 = 1.332 -> 1.33
+        assert (broker.cash_ticks, broker.position) == (102_133, 4)
+        with pytest.raises(ValueError):
+            broker.apply_split(-1.0, 40.0)
+        state = broker.get_state()
+        other = FixedPointBroker()
+        other.set_state(state)
+        assert other.get_state() == state
+        other.set_state({'cash': 12.345, 'position': 0})
+        assert other.cash_ticks == 1_234
+
+    def test_drop_in_for_engine(self):
+        """
+        Verify the engine runs unchanged on a FixedPointBroker.
+
+        Expected: on cent prices, same positions as Broker and cash equal to the cent
+        """
+        rng = np.random.default_rng(1)
+        prices = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 500))), 2)
+        strategy = VolatilityBreakoutStrategy(lookback=10)
+        fixed = Backtester(strategy, FixedPointBroker()).run_array(prices)
+        floating = Backtester(strategy, Broker()).run_array(prices)
+        np.testing.assert_array_equal(fixed['position'], floating['position'])
+        np.testing.assert_allclose(fixed['cash'], floating['cash'], atol=1e-6)
+        assert np.all(np.round(fixed['cash'] * 100) == fixed['cash'] * 100)
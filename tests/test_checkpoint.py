@@ -0,0 +1,223 @@
+"""
+Unit tests for checkpoint/restore.
+
+Tests should verify:
+- State dicts round-trip through the binary format bit for bit
+- A run killed mid-way resumes from its last snapshot with identical results
+- Truncated/corrupted trailing records are ignored
+- Broker, strategy and LiveTrader state save/restore
+"""
+import numpy as np
+import pytest
+from backtester.checkpoint import Checkpointer, dumps, loads, load_checkpoint
+from backtester.engine import Backtester
+from backtester.broker import Broker
+from backtester.live import LiveTrader
+from backtester.risk import RiskLimits
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+class CrashingBroker(Broker):
+    """Broker that dies after a fixed number of orders, simulating a crash."""
+
+    def __init__(self, cash, orders_before_crash):
+        super().__init__(cash)
+        self.orders_left = orders_before_crash
+
+    def market_order(self, side, qty, price):
+        if self.orders_left == 0:
+            raise RuntimeError("node died")
+        self.orders_left -= 1
+        super().market_order(side, qty, price)
+
+
+pytestmark = pytest.mark.walk(n=3_000, seed=11)
+
+
+class TestSerialization:
+    """Test the binary state format."""
+
+    def test_nested_state_round_trips(self):
+        """
+        Verify scalars, arrays and nesting survive dumps()/loads().
+
+        Expected: identical values and types
+        """
+        state = {'cursor': 7, 'broker': {'cash': 0.1 + 0.2, 'position': -3}, 'cash': np.arange(3.0)}
+        restored = loads(dumps(state))
+        assert restored['cursor'] == 7
+        assert restored['broker'] == {'cash': 0.1 + 0.2, 'position': -3}
+        np.testing.assert_array_equal(restored['cash'], state['cash'])
+
+    def test_component_states(self, volatile_prices):
+        """
+        Verify get_state()/set_state() on Broker, strategy and LiveTrader.
+
+        Expected: a restored LiveTrader makes the same decisions as the original
+        """
+        broker = Broker(cash=500)
+        broker.market_order("SELL", 2, 10.0)
+        clone = Broker()
+        clone.set_state(loads(dumps(broker.get_state())))
+        assert (clone.cash, clone.position) == (520, -2)
+
+        strategy = VolatilityBreakoutStrategy(lookback=3)
+        restored = VolatilityBreakoutStrategy()
+        restored.set_state(strategy.get_state())
+        assert restored.lookback == 3
+
+        prices = volatile_prices.to_numpy()
+        trader = LiveTrader(lookback=5)
+        for price in prices[:30]:
+            trader.on_bar(price)
+        copy = LiveTrader()
+        copy.set_state(loads(dumps(trader.get_state())))
+        for price in prices[30:]:
+            assert trader.on_bar(price) == copy.on_bar(price)
+            assert trader.target == copy.target
+
+
+class TestResume:
+    """Test checkpointed runs and resumption."""
+
+    def test_checkpoint_does_not_change_results(self, tmp_path, walk):
+        """
+        Verify that checkpointing is transparent to the run.
+
+        Expected: identical output with and without a Checkpointer
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=10)
+        expected = Backtester(strategy, Broker(cash=1e6)).run_array(walk)
+        with Checkpointer(str(tmp_path / "run.ckpt"), every=250) as cp:
+            result = Backtester(strategy, Broker(cash=1e6)).run_array(walk, checkpoint=cp)
+        np.testing.assert_array_equal(result, expected)
+        assert len(cp.write_seconds) == 12
+        snapshot = load_checkpoint(str(tmp_path / "run.ckpt"))
+        assert snapshot['cursor'] == len(walk) - 1
+        np.testing.assert_array_equal(snapshot['cash'], expected['cash'])
+
+    def test_resume_after_crash_is_bit_identical(self, tmp_path, walk):
+        """
+        Verify that a crashed run resumed from its last snapshot matches a clean run.
+
+        Given: a broker that dies partway, snapshots every 200 bars
+        Expected: resumed output == uninterrupted output, bit for bit
+        """
+        path = str(tmp_path / "run.ckpt")
+        strategy = VolatilityBreakoutStrategy(lookback=10)
+        expected = Backtester(strategy, Broker(cash=1e6)).run_array(walk)
+
+        with Checkpointer(path, every=200) as cp:
+            with pytest.raises(RuntimeError):
+                Backtester(strategy, CrashingBroker(1e6, 400)).run_array(walk, checkpoint=cp)
+        snapshot = load_checkpoint(path)
+        assert 0 < snapshot['cursor'] < len(walk) - 1
+
+        with Checkpointer(path, every=200) as cp:
+            result = Backtester(VolatilityBreakoutStrategy(), Broker()).run_array(
+                walk, checkpoint=cp, resume=snapshot)
+        np.testing.assert_array_equal(result, expected)
+        final = load_checkpoint(path)
+        np.testing.assert_array_equal(final['position'], expected['position'])
+        assert final['broker']['cash'] == expected['cash'][-1]
+
+    def test_resume_beyond_prices_raises(self, tmp_path, walk):
+        """
+        Verify that a snapshot from a longer series is rejected.
+
+        Expected: ValueError
+        """
+        path = str(tmp_path / "run.ckpt")
+        with Checkpointer(path, every=1_000) as cp:
+            Backtester(VolatilityBreakoutStrategy(), Broker(cash=1e6)).run_array(walk, checkpoint=cp)
+        with pytest.raises(ValueError):
+            Backtester(VolatilityBreakoutStrategy(), Broker()).run_array(walk[:10], resume=load_checkpoint(path))
+
+
+class TestLogIntegrity:
+    """Test robustness of the checkpoint log."""
+
+    def test_truncated_record_is_ignored(self, tmp_path, walk):
+        """
+        Verify that a half-written final record falls back to the previous one.
+
+        Expected: cursor of the second-to-last snapshot
+        """
+        path = tmp_path / "run.ckpt"
+        with Checkpointer(str(path), every=1_000) as cp:
+            Backtester(VolatilityBreakoutStrategy(), Broker(cash=1e6)).run_array(walk, checkpoint=cp)
+        data = path.read_bytes()
+        path.write_bytes(data[:-10])
+        assert load_checkpoint(str(path))['cursor'] == 2_000
+
+    def test_empty_log_raises(self, tmp_path):
+        """
+        Verify that a log with no complete snapshot is rejected.
+
+        Expected: ValueError
+        """
+        path = tmp_path / "empty.ckpt"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            load_checkpoint(str(path))
+
+    def test_single_bar_run_writes_snapshot(self, tmp_path):
+        """
+        Verify that even a one-bar run leaves a usable snapshot.
+
+        Expected: cursor 0
+        """
+        path = str(tmp_path / "one.ckpt")
+        with Checkpointer(path) as cp:
+            Backtester(VolatilityBreakoutStrategy(), Broker()).run_array(np.array([100.0]), checkpoint=cp)
+            cp.flush()
+        assert load_checkpoint(path)['cursor'] == 0
+
+    def test_risk_state_round_trips(self, tmp_path):
+        """
+        Verify risk-limit state, before and after the first mark, survives a checkpoint.
+
+        Expected: fresh limits load back with no day; a one-bar run with a
+            risk broker leaves a loadable snapshot that restores the limits
+        """
+        broker = Broker(1, risk=RiskLimits())
+        clone = Broker(risk=RiskLimits(max_drawdown=0.5))
+        clone.risk.mark(5.0, day=3)
+        clone.set_state(loads(dumps(broker.get_state())))
+        assert (clone.risk.peak, clone.risk.day, clone.risk.turnover) == (-np.inf, None, 0.0)
+
+        path = str(tmp_path / "risk.ckpt")
+        with Checkpointer(path) as cp:
+            Backtester(VolatilityBreakoutStrategy(), Broker(risk=RiskLimits(max_drawdown=0.5))).run_array(
+                np.array([100.0]), checkpoint=cp)
+        snapshot = load_checkpoint(path)
+        assert snapshot['cursor'] == 0
+        restored = Broker(risk=RiskLimits())
+        restored.risk.mark(5.0, day=3)
+        restored.set_state(snapshot['broker'])
+        assert restored.risk.get_state() == snapshot['broker']['risk']
+        assert restored.risk.day is None
+
+    def test_invalid_interval_raises(self, tmp_path):
+        """
+        Verify that the snapshot interval must be positive.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            Checkpointer(str(tmp_path / "x.ckpt"), every=0)
+
+    def test_writer_errors_surface(self, tmp_path):
+        """
+        Verify that a failure in the background writer reaches the caller.
+
+        Expected: the writer's exception is raised on flush()
+        """
+        cp = Checkpointer(str(tmp_path / "bad.ckpt"))
+        cp.submit({'bad': lambda: None})
+        with pytest.raises(Exception):
+            cp.flush()
+        with pytest.raises(Exception):
+            cp.submit({'cursor': 0})
+        with pytest.raises(Exception):
+            cp.close()
@@ -0,0 +1,178 @@
+"""
+Unit tests for the command-line batch runner.
+
+Tests should verify:
+- Every (symbol x strategy x params) job runs once and matches Backtester directly
+- Serial and process-pool runs write the same columnar output
+- Full results, CSV data and failing runs are handled
+- Progress lines report throughput
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.archive import ArchiveReader
+from backtester.broker import Broker
+from backtester.cli import Progress, load_config, main, read_summary
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+
+SYMBOLS = ["AAA", "BBB"]
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    """A directory with seeded random-walk prices and a 2 symbols x 3 lookbacks config."""
+    prices = tmp_path / "prices"
+    prices.mkdir()
+    rng = np.random.default_rng(0)
+    for symbol in SYMBOLS:
+        np.save(prices / f"{symbol}.npy", 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300))))
+    config = {
+        'data': {'dir': 'prices'},
+        'strategies': [{'class': 'VolatilityBreakoutStrategy', 'grid': {'lookback': [5, 10, 20]}}],
+        'broker': {'cash': 100_000},
+        'workers': 1,
+        'batch': 2,
+        'output': 'out',
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config))
+    return tmp_path
+
+
+def write_config(workdir, **changes):
+    path = workdir / "config.json"
+    config = json.loads(path.read_text())
+    config.update(changes)
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+class TestBatchRunner:
+    """Test running a config end to end."""
+
+    def test_matches_direct_runs(self, workdir):
+        """
+        Verify the summary holds one row per job with the engine's numbers.
+
+        Expected: 6 rows in grid order; final equity equal to a direct run
+        """
+        assert main([write_config(workdir), '-q']) == 0
+        summary = read_summary(str(workdir / "out"))
+        assert list(zip(summary['symbol'], summary['lookback'])) == \
+            [(s, lb) for s in SYMBOLS for lb in (5, 10, 20)]
+        assert (summary['error'] == '').all()
+        for row in summary.itertuples():
+            prices = np.load(workdir / "prices" / f"{row.symbol}.npy")
+            result = Backtester(VolatilityBreakoutStrategy(int(row.lookback)), Broker(100_000)).run_array(prices)
+            assert row.final_equity == result['equity'][-1]
+            assert row.bars == len(prices)
+
+    def test_pool_matches_serial(self, workdir):
+        """
+        Verify a process-pool run writes the same output as a serial one.
+
+        Expected: identical summaries
+        """
+        main([write_config(workdir), '-q', '-o', str(workdir / "serial")])
+        main([write_config(workdir), '-q', '-j', '2', '-o', str(workdir / "pool")])
+        pd.testing.assert_frame_equal(read_summary(str(workdir / "pool")), read_summary(str(workdir / "serial")))
+
+    def test_save_runs_and_columns(self, workdir):
+        """
+        Verify full results go to the archive and columns load individually.
+
+        Expected: 6 archived runs equal to direct runs; only the requested columns read
+        """
+        main([write_config(workdir, save_runs=True), '-q'])
+        with ArchiveReader(str(workdir / "out" / "runs.btar")) as archive:
+            assert len(archive) == 6
+            prices = np.load(workdir / "prices" / "AAA.npy")
+            expected = Backtester(VolatilityBreakoutStrategy(10), Broker(100_000)).run_array(prices)
+            np.testing.assert_array_equal(archive.load("AAA/VolatilityBreakoutStrategy/lookback=10"), expected)
+        assert list(read_summary(str(workdir / "out"), ['sharpe'])) == ['sharpe']
+
+    def test_csv_data(self, workdir):
+        """
+        Verify CSV prices are read from the configured column.
+
+        Expected: same final equity as the .npy run of the same prices
+        """
+        csv = workdir / "csv"
+        csv.mkdir()
+        prices = np.load(workdir / "prices" / "AAA.npy")
+        pd.DataFrame({'date': range(len(prices)), 'px': prices}).to_csv(csv / "AAA.csv", index=False)
+        main([write_config(workdir, data={'dir': 'csv', 'format': 'csv', 'column': 'px'}), '-q'])
+        summary = read_summary(str(workdir / "out"))
+        main([write_config(workdir, data={'dir': 'prices', 'symbols': ['AAA']}), '-q', '-o', str(workdir / "npy")])
+        np.testing.assert_array_equal(summary['final_equity'], read_summary(str(workdir / "npy"))['final_equity'])
+
+    def test_failed_runs_are_reported(self, workdir):
+        """
+        Verify a run breaching a risk limit is recorded, not fatal.
+
+        Expected: exit code 1; error column names RiskLimitError; NaN statistics
+        """
+        path = write_config(workdir, broker={'cash': 100_000, 'risk': {'max_order_notional': 1.0}})
+        assert main([path, '-q']) == 1
+        summary = read_summary(str(workdir / "out"))
+        assert summary['error'].str.startswith('RiskLimitError').all()
+        assert summary['final_equity'].isna().all()
+
+    def test_bad_config(self, workdir):
+        """
+        Verify unknown strategies, brokers and formats are rejected up front.
+
+        Expected: ValueError from load_config
+        """
+        for changes in ({'strategies': [{'class': 'Nope'}]}, {'broker': {'class': 'Nope'}},
+                        {'data': {'dir': 'prices', 'format': 'parquet'}}):
+            with pytest.raises(ValueError):
+                load_config(write_config(workdir, **changes))
+
+    def test_bad_workers_override(self, workdir, capsys):
+        """
+        Verify -j is validated like the config's workers.
+
+        Expected: a usage error (exit code 2) naming --workers for -j 0
+        """
+        with pytest.raises(SystemExit) as exc:
+            main([write_config(workdir), '-q', '-j', '0'])
+        assert exc.value.code == 2
+        assert '--workers must be >= 1' in capsys.readouterr().err
+
+    def test_module_entry_point(self, workdir):
+        """
+        Verify `python -m backtester` runs a config.
+
+        Expected: exit code 0 and a progress line with throughput
+        """
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        proc = subprocess.run([sys.executable, "-m", "backtester", write_config(workdir), "-j", "2"],
+                              env=env, capture_output=True, text=True, timeout=60)
+        assert proc.returncode == 0, proc.stderr
+        assert "6/6 runs" in proc.stderr and "bars/s" in proc.stderr
+
+
+class TestProgress:
+    """Test the progress reporter."""
+
+    def test_throttled_lines(self):
+        """
+        Verify updates inside the interval are not printed, and finish() always prints.
+
+        Expected: one line per interval plus the final line
+        """
+        stream = io.StringIO()
+        progress = Progress(10, stream=stream, interval=3600)
+        progress.update(4, 400)
+        progress.update(6, 600)
+        progress.finish()
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 2
+        assert lines[-1].startswith("10/10 runs") and "runs/s" in lines[-1]
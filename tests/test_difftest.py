@@ -0,0 +1,170 @@
+"""
+Unit tests for the reference oracle and differential testing harness.
+
+Tests should verify:
+- The reference implementation reproduces the original engine results
+- Every optimized backend agrees with the oracle on randomized scenarios
+- Disagreements (wrong positions, wrong cash, mismatched errors) are caught
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.difftest import (
+    ENGINES, SIGNALS, Scenario, assert_equivalent, compare, run_difftest, scenarios,
+)
+from backtester.reference import ReferenceBacktester, ReferenceBroker, ReferenceStrategy
+
+
+class TestReference:
+    """Test the frozen reference implementation."""
+
+    def test_reference_run(self, simple_prices):
+        """
+        Verify the oracle on a rising series with lookback=3.
+
+        Expected: buys 1 share on bar 2 (signal from bar 1) and holds it
+        """
+        result = ReferenceBacktester(ReferenceStrategy(lookback=3), ReferenceBroker(cash=1_000)).run(simple_prices)
+        assert result['position'].tolist()[:3] == [0, 0, 1]
+        assert result['cash'].iloc[2] == 1_000 - 102.0
+        assert result['equity'].iloc[-1] == result['cash'].iloc[-1] + result['position'].iloc[-1] * 109.0
+
+    def test_reference_broker_validation(self):
+        """
+        Verify the reference broker keeps the original validation rules.
+
+        Expected: ValueError for qty <= 0, bad side and insufficient cash
+        """
+        broker = ReferenceBroker(cash=100)
+        with pytest.raises(ValueError, match="qty"):
+            broker.market_order("BUY", 0, 10.0)
+        with pytest.raises(ValueError, match="Invalid side"):
+            broker.market_order("HOLD", 1, 10.0)
+        with pytest.raises(ValueError, match="Insufficient cash"):
+            broker.market_order("BUY", 11, 10.0)
+        with pytest.raises(ValueError, match="empty"):
+            ReferenceStrategy().signals(pd.Series([], dtype=float))
+
+
+class TestScenarios:
+    """Test the randomized scenario generator."""
+
+    def test_seeded(self):
+        """
+        Verify that the same seed gives the same scenarios.
+
+        Expected: identical names and prices; a different seed changes prices
+        """
+        a, b, c = scenarios(200, seed=1), scenarios(200, seed=1), scenarios(200, seed=2)
+        assert [s.name for s in a] == [s.name for s in b]
+        assert all(np.array_equal(x.prices, y.prices) for x, y in zip(a, b))
+        assert not np.array_equal(a[0].prices, c[0].prices)
+
+    def test_covers_edge_cases(self):
+        """
+        Verify that the edge-case kinds are generated.
+
+        Expected: constant, very short, long and oversized-lookback cases, all prices positive
+        """
+        cases = {s.name: s for s in scenarios(100)}
+        assert np.all(cases['constant/lb5'].prices == 100.0)
+        assert len(cases['short1'].prices) == 1
+        assert len(cases['long'].prices) == 1_000
+        assert cases['lookback_exceeds_bars'].lookback > len(cases['lookback_exceeds_bars'].prices)
+        assert all(np.all(s.prices > 0) for s in cases.values())
+
+
+class TestHarness:
+    """Test oracle-vs-backend comparisons."""
+
+    def test_all_backends_agree(self):
+        """
+        Verify every built-in backend matches the oracle on all scenarios.
+
+        Expected: no failing rows, one row per scenario and backend, positive speedups
+        """
+        cases = scenarios(300, seed=5)
+        report = run_difftest(cases)
+        assert_equivalent(report)
+        assert len(report) == len(cases) * (len(ENGINES) + len(SIGNALS))
+        assert (report['speedup'] > 0).all()
+
+    def test_matching_errors_pass(self):
+        """
+        Verify that a backend raising the oracle's error counts as agreeing.
+
+        Expected: with too little cash every engine fails like the oracle and passes
+        """
+        case = Scenario("gaps", scenarios(300, seed=0)[4].prices * 1_000, 1)
+        rows = compare(case, signals={}, cash=100)
+        assert all(row['passed'] and "Insufficient cash" in row['error'] for row in rows)
+
+    def test_detects_wrong_positions(self):
+        """
+        Verify that a backend trading one bar late is caught.
+
+        Expected: the row fails with position mismatches; assert_equivalent raises
+        """
+        def late(prices, lookback, cash):
+            out = ENGINES['run_array'](prices, lookback, cash)
+            out['position'][1:] = out['position'][:-1].copy()
+            return out
+
+        report = run_difftest(scenarios(200)[:4], engines={'late': late}, signals={})
+        assert not report['passed'].any()
+        assert (report['position_mismatches'] > 0).all()
+        with pytest.raises(AssertionError, match="late"):
+            assert_equivalent(report)
+
+    def test_detects_cash_drift(self):
+        """
+        Verify cash differences beyond rtol fail while tiny ones pass.
+
+        Expected: a $1 offset fails, a 1e-12 relative offset passes
+        """
+        case = scenarios(200)[0]
+
+        def offset(amount):
+            def backend(prices, lookback, cash):
+                out = ENGINES['run_array'](prices, lookback, cash)
+                out['cash'] += amount
+                return out
+            return backend
+
+        rows = compare(case, engines={'big': offset(1.0), 'tiny': offset(1e-12 * 1_000_000)}, signals={})
+        assert [row['passed'] for row in rows] == [False, True]
+        assert not rows[1]['exact']
+
+    def test_detects_error_mismatch(self):
+        """
+        Verify a backend raising where the oracle does not is caught.
+
+        Expected: the row fails and records the backend error
+        """
+        def broken(prices, lookback, cash):
+            raise ValueError("boom")
+
+        row = compare(scenarios(200)[0], engines={'broken': broken}, signals={})[0]
+        assert not row['passed']
+        assert "boom" in row['error']
+
+    def test_signal_flips_only_allowed_when_ambiguous(self):
+        """
+        Verify signal mismatches pass only inside the ambiguous band.
+
+        Expected: a flipped signal fails normally, passes with a huge signal_rtol,
+        and the engine comparison then stops at the first ambiguous bar
+        """
+        case = scenarios(200)[3]   # random walk, lookback 20
+
+        def flipped(prices, lookback):
+            # flip only once the rolling window is full (vol > 0)
+            out = SIGNALS['signals_array'](prices, lookback).copy()
+            out[50:] *= -1
+            return out
+
+        strict = compare(case, engines={}, signals={'flipped': flipped})[0]
+        loose = compare(case, engines={'run': ENGINES['run']}, signals={'flipped': flipped}, signal_rtol=1e9)
+        assert not strict['passed']
+        assert loose[0]['passed'] and not loose[0]['exact']
+        assert loose[1]['passed'] and loose[1]['bars_compared'] < len(case.prices)
@@ -0,0 +1,212 @@
+"""
+Unit tests for the shared-filesystem sweep coordinator and workers.
+
+Tests should verify:
+- The grid is split into units and every unit is run exactly to one result
+- Results match running Backtester directly
+- Crashed workers' leases expire and their units are requeued
+- Failing units are retried, then parked with their errors
+- Result writes are idempotent and concurrent workers on localhost cooperate
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.distributed import NpyLoader, SweepCoordinator, SweepWorker
+from backtester.engine import Backtester
+from backtester.search import sharpe
+from backtester.strategy import VolatilityBreakoutStrategy
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+
+
+@pytest.fixture
+def prices_dir(tmp_path):
+    """One seeded random-walk .npy price file per symbol."""
+    directory = tmp_path / "prices"
+    directory.mkdir()
+    rng = np.random.default_rng(0)
+    for symbol in SYMBOLS:
+        np.save(directory / f"{symbol}.npy", 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 500))))
+    return str(directory)
+
+
+@pytest.fixture
+def sweep(tmp_path):
+    """A coordinator with a submitted 3 symbols x 3 lookbacks grid."""
+    coordinator = SweepCoordinator(str(tmp_path / "sweep"), lease_seconds=600, max_attempts=2)
+    coordinator.submit(SYMBOLS, {'lookback': [5, 10, 20]})
+    return coordinator
+
+
+class TestSubmit:
+    """Test splitting the grid into units."""
+
+    def test_units_queued(self, sweep):
+        """
+        Verify one unit per (symbol, lookback) is pending after submit.
+
+        Expected: 9 pending units, nothing else
+        """
+        assert sweep.status() == {'pending': 9, 'leases': 0, 'results': 0, 'failed': 0}
+        assert not sweep.done()
+
+    def test_resubmit_is_noop(self, sweep):
+        """
+        Verify that submitting the same grid again queues nothing.
+
+        Expected: 0 new units; a different grid raises ValueError
+        """
+        assert sweep.submit(SYMBOLS, {'lookback': [5, 10, 20]}) == 0
+        with pytest.raises(ValueError, match="different sweep"):
+            sweep.submit(SYMBOLS, {'lookback': [5]})
+
+    def test_batch(self, tmp_path):
+        """
+        Verify batch groups several parameter sets into one unit.
+
+        Expected: 3 symbols x ceil(3 / 2) = 6 units
+        """
+        coordinator = SweepCoordinator(str(tmp_path / "batched"))
+        assert coordinator.submit(SYMBOLS, {'lookback': [5, 10, 20]}, batch=2) == 6
+        with pytest.raises(ValueError):
+            coordinator.submit(SYMBOLS, {'lookback': [5]}, batch=0)
+
+
+class TestWorker:
+    """Test running units."""
+
+    def test_results_match_backtester(self, sweep, prices_dir):
+        """
+        Verify a worker drains the queue with results equal to direct runs.
+
+        Expected: 9 result rows; final equity, Sharpe and trade counts match Backtester
+        """
+        assert SweepWorker(sweep.root, NpyLoader(prices_dir)).run() == 9
+        assert sweep.done()
+        results = sweep.results()
+        assert len(results) == 9
+        for row in results.itertuples():
+            prices = np.load(os.path.join(prices_dir, f"{row.symbol}.npy"))
+            out = Backtester(VolatilityBreakoutStrategy(row.lookback), Broker(1_000_000)).run_array(prices)
+            assert row.final_equity == out['equity'][-1]
+            assert row.sharpe == sharpe(out)
+            assert row.trades == np.count_nonzero(np.diff(out['position']))
+            assert row.bars == 500
+
+    def test_crashed_worker_requeued(self, sweep, prices_dir):
+        """
+        Verify a unit claimed by a dead worker is requeued after its lease.
+
+        Expected: nothing requeued before expiry; afterwards another worker finishes all 9
+        """
+        dead = SweepWorker(sweep.root, NpyLoader(prices_dir), worker_id="dead")
+        assert dead.claim() is not None  # claims, then "crashes"
+        assert sweep.requeue_expired() == 0
+        assert sweep.status()['leases'] == 1
+        assert sweep.requeue_expired(now=os.path.getmtime(sweep.root) + 10_000) == 1
+        SweepWorker(sweep.root, NpyLoader(prices_dir)).run()
+        assert sweep.status() == {'pending': 0, 'leases': 0, 'results': 9, 'failed': 0}
+
+    def test_repeatedly_expiring_unit_is_parked(self, sweep, prices_dir):
+        """
+        Verify each expiry counts as an attempt, so a unit that keeps killing
+        its worker ends up in failed/.
+
+        Expected: requeued once with attempts 1; parked on the second expiry (max_attempts=2)
+        """
+        for expected in (1, 0):
+            unit = SweepWorker(sweep.root, NpyLoader(prices_dir), worker_id="dead").claim()
+            assert unit['unit_id'] == 0
+            assert sweep.requeue_expired(now=os.path.getmtime(sweep.root) + 10_000) == expected
+        assert sweep.status() == {'pending': 8, 'leases': 0, 'results': 0, 'failed': 1}
+        failed = sweep.failures()[0]
+        assert failed['attempts'] == 2 and "lease expired" in failed['errors'][-1]
+
+    def test_lease_requeued_during_claim(self, sweep, prices_dir, monkeypatch):
+        """
+        Verify a lease that disappears right after the rename is skipped, not fatal.
+
+        Expected: the claim moves on to the next pending unit
+        """
+        real_utime = os.utime
+        calls = []
+
+        def requeued_meanwhile(path):
+            calls.append(path)
+            if len(calls) == 1:
+                os.remove(path)  # the coordinator's expiry sweep won the race
+            real_utime(path)
+
+        monkeypatch.setattr(os, 'utime', requeued_meanwhile)
+        unit = SweepWorker(sweep.root, NpyLoader(prices_dir)).claim()
+        assert unit['unit_id'] == 1
+
+    def test_expired_lease_of_finished_unit_is_dropped(self, sweep, prices_dir):
+        """
+        Verify a stale lease whose result exists is cleaned up, not rerun.
+
+        Expected: no requeue, the lease disappears
+        """
+        worker = SweepWorker(sweep.root, NpyLoader(prices_dir))
+        unit = worker.claim()
+        worker.run_unit(dict(unit))
+        lease = os.path.join(sweep.root, 'leases', f"{unit['unit_id']:06d}.json")
+        with open(lease, 'w') as f:
+            f.write("{}")
+        assert sweep.requeue_expired(now=os.path.getmtime(lease) + 10_000) == 0
+        assert not os.path.exists(lease)
+
+    def test_failures_retried_then_parked(self, sweep, prices_dir):
+        """
+        Verify a failing unit is retried up to max_attempts and then parked.
+
+        Expected: the 'BBB' units land in failed/ with two errors each; others finish
+        """
+        loader = NpyLoader(prices_dir)
+
+        def flaky(symbol):
+            if symbol == "BBB":
+                raise OSError("disk gone")
+            return loader(symbol)
+
+        SweepWorker(sweep.root, flaky).run()
+        assert sweep.status() == {'pending': 0, 'leases': 0, 'results': 6, 'failed': 3}
+        failures = sweep.failures()
+        assert all(unit['symbol'] == "BBB" and unit['attempts'] == 2 for unit in failures)
+        assert "disk gone" in failures[0]['errors'][0]
+
+    def test_idempotent_result(self, sweep, prices_dir):
+        """
+        Verify running the same unit twice writes the same result file.
+
+        Expected: identical bytes after the second run
+        """
+        worker = SweepWorker(sweep.root, NpyLoader(prices_dir))
+        unit = worker.claim()
+        path = os.path.join(sweep.root, 'results', f"{unit['unit_id']:06d}.json")
+        worker.run_unit(dict(unit))
+        with open(path, 'rb') as f:
+            first = f.read()
+        worker.run_unit(dict(unit))
+        with open(path, 'rb') as f:
+            assert f.read() == first
+        assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')]
+
+    def test_concurrent_processes(self, sweep, prices_dir):
+        """
+        Verify several worker processes on localhost share the queue.
+
+        Expected: all units finish, one result row per grid point
+        """
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        procs = [subprocess.Popen([sys.executable, "-m", "backtester.distributed", sweep.root, prices_dir], env=env)
+                 for _ in range(3)]
+        assert all(proc.wait(timeout=60) == 0 for proc in procs)
+        assert sweep.done()
+        results = sweep.results()
+        assert sorted(zip(results['symbol'], results['lookback'])) == \
+            sorted((s, lb) for s in SYMBOLS for lb in (5, 10, 20))
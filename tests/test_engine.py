@@ -450,3 +450,71 @@ class TestMockedScenarios:
         # Step 4: Assert cash changes reflect round trip
         pass
         # YOUR CODE ENDS HERE
+
+
+class TestArrayApi:
+    """Test the NumPy-native run_array() entry point."""
+
+    def test_matches_dataframe_run(self, strategy, volatile_prices):
+        """
+        Verify that run_array() reproduces run() bar for bar.
+
+        Expected: identical equity, cash and position columns
+        """
+        expected = Backtester(strategy, Broker(cash=1_000_000)).run(volatile_prices)
+        result = Backtester(strategy, Broker(cash=1_000_000)).run_array(volatile_prices.to_numpy())
+        for column in ['equity', 'cash', 'position']:
+            np.testing.assert_array_equal(result[column], expected[column].to_numpy())
+
+    def test_returns_structured_array(self, strategy, broker, simple_prices):
+        """
+        Verify output fields without timestamps.
+
+        Expected: structured ndarray with fields (equity, cash, position)
+        """
+        result = Backtester(strategy, broker).run_array(simple_prices.to_numpy())
+        assert result.dtype.names == ('equity', 'cash', 'position')
+        assert len(result) == len(simple_prices)
+
+    def test_timestamps_are_carried_through(self, strategy, broker, simple_prices):
+        """
+        Verify that int64 timestamps are returned as a leading field.
+
+        Expected: result['timestamp'] equals the input timestamps
+        """
+        timestamps = simple_prices.index.asi8
+        result = Backtester(strategy, broker).run_array(simple_prices.to_numpy(), timestamps)
+        assert result.dtype.names[0] == 'timestamp'
+        np.testing.assert_array_equal(result['timestamp'], timestamps)
+
+    def test_invalid_inputs_raise(self, strategy, broker):
+        """
+        Verify input validation on empty, 2-D and misaligned inputs.
+
+        Expected: ValueError in each case
+        """
+        bt = Backtester(strategy, broker)
+        with pytest.raises(ValueError):
+            bt.run_array(np.array([]))
+        with pytest.raises(ValueError):
+            bt.run_array(np.ones((3, 2)))
+        with pytest.raises(ValueError):
+            bt.run_array(np.ones(3), timestamps=np.arange(2))
+
+    def test_float32_outputs(self, volatile_prices):
+        """
+        Verify dtype=float32 stores equity and cash as float32.
+
+        Expected: float32 fields, positions equal to the float64 run; bad dtype raises
+        """
+        prices = volatile_prices.to_numpy()
+        strategy = VolatilityBreakoutStrategy(lookback=5, dtype=np.float32)
+        result = Backtester(strategy, Broker(1_000_000), dtype=np.float32).run_array(prices)
+        expected = Backtester(VolatilityBreakoutStrategy(lookback=5), Broker(1_000_000)).run_array(prices)
+        assert result.dtype['equity'] == np.float32 and result.dtype['cash'] == np.float32
+        np.testing.assert_array_equal(result['position'], expected['position'])
+        np.testing.assert_allclose(result['equity'], expected['equity'], rtol=1e-7)
+        frame = Backtester(strategy, Broker(1_000_000), dtype=np.float32).run(volatile_prices)
+        assert frame['equity'].dtype == np.float32
+        with pytest.raises(ValueError):
+            Backtester(strategy, Broker(), dtype=np.float16)
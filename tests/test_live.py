@@ -0,0 +1,135 @@
+"""
+Unit tests for LiveTrader (single-bar decision path).
+
+Tests should verify:
+- Bar-by-bar decisions reproduce Backtester + VolatilityBreakoutStrategy
+- Orders are (side, qty) tuples, None when no trade is needed
+- Edge cases (first bar, zero price, custom starting position)
+"""
+import numpy as np
+import pytest
+from backtester.live import LiveTrader
+from backtester.engine import Backtester
+from backtester.broker import Broker
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+class TestMatchesBacktester:
+    """Test that live decisions agree with the batch engine."""
+
+    def test_positions_match_backtest(self, volatile_prices):
+        """
+        Verify that feeding prices one by one yields the backtest's positions.
+
+        Expected: identical position path for several lookbacks
+        """
+        prices = volatile_prices.to_numpy()
+        for lookback in (1, 2, 5, 20):
+            strategy = VolatilityBreakoutStrategy(lookback=lookback)
+            expected = Backtester(strategy, Broker(cash=1_000_000)).run_array(prices)['position']
+            trader = LiveTrader.from_strategy(strategy)
+            positions = []
+            for price in prices:
+                trader.on_bar(price)
+                positions.append(trader.position)
+            np.testing.assert_array_equal(positions, expected)
+
+    def test_long_series_does_not_drift(self):
+        """
+        Verify agreement over a long series where incremental updates could drift.
+
+        Expected: identical position path over 5,000 bars
+        """
+        np.random.seed(7)
+        prices = 100 * np.exp(np.cumsum(np.random.normal(0, 0.01, 5_000)))
+        expected = Backtester(VolatilityBreakoutStrategy(lookback=10), Broker(cash=1e9)).run_array(prices)['position']
+        trader = LiveTrader(lookback=10)
+        positions = [(trader.on_bar(price), trader.position)[1] for price in prices]
+        np.testing.assert_array_equal(positions, expected)
+
+    def test_orders_replayed_on_broker_match_backtest(self, volatile_prices):
+        """
+        Verify that executing the returned orders reproduces the backtest's cash.
+
+        Expected: same final cash and position
+        """
+        prices = volatile_prices.to_numpy()
+        expected = Backtester(VolatilityBreakoutStrategy(lookback=5), Broker(cash=10_000)).run_array(prices)
+        broker = Broker(cash=10_000)
+        trader = LiveTrader(lookback=5)
+        for price in prices:
+            order = trader.on_bar(price)
+            if order is not None:
+                broker.market_order(order[0], order[1], price)
+        assert broker.cash == expected['cash'][-1]
+        assert broker.position == expected['position'][-1]
+
+
+class TestOrders:
+    """Test the orders returned by on_bar()."""
+
+    def test_first_bar_never_trades(self):
+        """
+        Verify that the first price only seeds state.
+
+        Expected: None
+        """
+        assert LiveTrader(lookback=3).on_bar(100.0) is None
+
+    def test_breakout_then_order_next_bar(self):
+        """
+        Verify that a breakout on bar t produces a BUY on bar t+1.
+
+        Expected: None at the jump, ("BUY", 1) on the following bar
+        """
+        trader = LiveTrader(lookback=5)
+        for price in [100.0] * 10:
+            assert trader.on_bar(price) is None
+        assert trader.on_bar(110.0) is None
+        assert trader.on_bar(110.0) == ("BUY", 1)
+
+    def test_large_position_change_builds_order(self):
+        """
+        Verify orders outside the prebuilt table are still produced.
+
+        Given: starting position of -5 and a flat market
+        Expected: ("BUY", 5) on the second bar
+        """
+        trader = LiveTrader(lookback=3, position=-5)
+        trader.target = 0
+        trader.on_bar(100.0)
+        assert trader.on_bar(100.0) == ("BUY", 5)
+        assert trader.position == 0
+
+
+class TestEdgeCases:
+    """Test unusual inputs."""
+
+    def test_invalid_lookback_raises_error(self):
+        """
+        Verify that lookback must be positive.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            LiveTrader(lookback=0)
+
+    def test_zero_price_is_treated_as_flat_return(self):
+        """
+        Verify that a zero previous price does not crash the decision path.
+
+        Expected: no exception, no signal from the undefined return
+        """
+        trader = LiveTrader(lookback=3)
+        trader.on_bar(0.0)
+        trader.on_bar(100.0)
+        assert trader.target == 0
+
+    def test_uses_slots(self):
+        """
+        Verify that state is held in __slots__ (no per-instance __dict__).
+
+        Expected: AttributeError on unknown attribute assignment
+        """
+        with pytest.raises(AttributeError):
+            LiveTrader().unknown = 1
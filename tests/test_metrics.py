@@ -0,0 +1,105 @@
+"""
+Unit tests for the streaming metrics accumulator.
+
+Tests should verify:
+- Streaming statistics equal the same statistics computed over the full result
+- Chunked updates match per-bar updates
+- Empty and degenerate inputs, and state round-trips
+"""
+import math
+
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.metrics import OnlineMetrics
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+@pytest.fixture
+def result(volatile_prices):
+    """A run_array() result over the volatile fixture prices."""
+    return Backtester(VolatilityBreakoutStrategy(lookback=5), Broker(cash=1_000)).run_array(
+        volatile_prices.to_numpy())
+
+
+class TestOnlineMetrics:
+    """Test the per-bar accumulator."""
+
+    def test_matches_batch_statistics(self, result):
+        """
+        Verify streamed statistics equal ones computed from the whole result.
+
+        Expected: mean/vol/Sharpe, max drawdown, exposure, turnover and trades all match
+        """
+        metrics = OnlineMetrics()
+        for equity, position in zip(result['equity'], result['position']):
+            metrics.update(float(equity), int(position))
+        snap = metrics.snapshot()
+
+        equity, position = result['equity'], result['position']
+        returns = np.diff(equity) / equity[:-1]
+        peaks = np.maximum.accumulate(equity)
+        assert snap['bars'] == len(equity)
+        assert snap['total_return'] == pytest.approx(equity[-1] / equity[0] - 1)
+        assert snap['mean_return'] == pytest.approx(returns.mean())
+        assert snap['volatility'] == pytest.approx(returns.std(ddof=1) * math.sqrt(252))
+        assert snap['sharpe'] == pytest.approx(returns.mean() / returns.std(ddof=1) * math.sqrt(252))
+        assert snap['max_drawdown'] == pytest.approx((1 - equity / peaks).max())
+        assert snap['drawdown'] == pytest.approx(1 - equity[-1] / peaks[-1])
+        assert snap['exposure'] == np.count_nonzero(position) / len(position)
+        assert snap['turnover'] == np.abs(np.diff(position, prepend=0)).sum()
+        assert snap['trades'] == np.count_nonzero(np.diff(position, prepend=0))
+
+    def test_chunks_match_bars(self, result):
+        """
+        Verify update_many over uneven chunks equals update() per bar.
+
+        Expected: equal counters; moments equal to float tolerance
+        """
+        streamed, chunked = OnlineMetrics(), OnlineMetrics()
+        for equity, position in zip(result['equity'], result['position']):
+            streamed.update(float(equity), int(position))
+        bounds = [0, 1, 7, 8, 30, len(result)]
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            chunked.update_many(result['equity'][lo:hi], result['position'][lo:hi])
+        chunked.update_many([], [])
+        a, b = streamed.snapshot(), chunked.snapshot()
+        for key in a:
+            assert a[key] == pytest.approx(b[key]), key
+
+    def test_empty_and_single_bar(self):
+        """
+        Verify snapshots before enough data are NaN rather than errors.
+
+        Expected: NaN returns/vol/Sharpe with 0 or 1 bars; zero drawdown
+        """
+        metrics = OnlineMetrics()
+        snap = metrics.snapshot()
+        assert snap['bars'] == 0 and math.isnan(snap['exposure']) and math.isnan(snap['sharpe'])
+        metrics.update(100.0, 0)
+        snap = metrics.snapshot()
+        assert snap['total_return'] == 0.0
+        assert math.isnan(snap['mean_return']) and math.isnan(snap['volatility'])
+        assert snap['max_drawdown'] == 0.0
+        metrics.update(100.0, 0)
+        assert math.isnan(metrics.snapshot()['sharpe'])  # flat equity: zero vol
+        with pytest.raises(ValueError):
+            metrics.update_many([1.0, 2.0], [0])
+
+    def test_state_round_trip(self, result):
+        """
+        Verify get_state/set_state resumes the accumulator exactly.
+
+        Expected: a restored copy fed the rest of the bars matches the original
+        """
+        first, rest = slice(0, 20), slice(20, None)
+        original = OnlineMetrics()
+        original.update_many(result['equity'][first], result['position'][first])
+        restored = OnlineMetrics()
+        restored.set_state(original.get_state())
+        for metrics in (original, restored):
+            metrics.update_many(result['equity'][rest], result['position'][rest])
+        assert restored.snapshot() == original.snapshot()
+        with pytest.raises(AttributeError):
+            original.extra = 1  # __slots__: no per-instance dict
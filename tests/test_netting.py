@@ -0,0 +1,151 @@
+"""
+Unit tests for cross-strategy order netting.
+
+Tests should verify:
+- Net orders equal the change of the summed targets, one per symbol and bar
+- Each strategy's book matches trading alone when costs are zero
+- Costs are paid only on net orders and split across books
+- step() matches run(), continues its state and drives brokers
+"""
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.netting import OrderNetter
+from backtester.universe import UniverseBacktester
+
+
+@pytest.fixture
+def path():
+    """Seeded targets for 3 strategies x 4 symbols over 200 bars, and prices."""
+    rng = np.random.default_rng(0)
+    targets = rng.integers(-2, 3, size=(200, 3, 4)) * 10
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (200, 4)), axis=0))
+    return targets, prices
+
+
+class TestOrderNetter:
+    """Test netting over a whole path."""
+
+    def test_net_orders(self, path):
+        """
+        Verify net trades are the change of the summed targets.
+
+        Expected: trades == diff(sum over strategies); fewer orders than without netting
+        """
+        targets, prices = path
+        netted = OrderNetter(3, 4, cash=1e6).run(targets, prices)
+        np.testing.assert_array_equal(netted.trades, np.diff(targets.sum(axis=1), axis=0, prepend=0))
+        np.testing.assert_array_equal(netted.fills.sum(axis=1), netted.trades)
+        assert netted.net_orders == np.count_nonzero(netted.trades)
+        assert netted.net_orders < netted.gross_orders
+
+    def test_books_match_standalone(self, path):
+        """
+        Verify a book with no costs equals running that strategy alone.
+
+        Expected: each book's cash and equity equal a one-strategy netter's
+        """
+        targets, prices = path
+        netted = OrderNetter(3, 4, cash=1e6).run(targets, prices)
+        for s in range(3):
+            alone = OrderNetter(1, 4, cash=1e6).run(targets[:, s:s + 1], prices)
+            np.testing.assert_allclose(netted.cash[:, s], alone.cash[:, 0])
+            np.testing.assert_allclose(netted.equity[:, s], alone.equity[:, 0])
+
+    def test_universe_agreement(self, path):
+        """
+        Verify the combined books equal UniverseBacktester on the summed targets.
+
+        Expected: same total equity per bar
+        """
+        targets, prices = path
+        targets = targets.copy()
+        targets[0] = 0  # the universe engine holds nothing on bar 0
+        netted = OrderNetter(3, 4, cash=1e6).run(targets, prices)
+        total = targets.sum(axis=1)
+        signals = np.zeros_like(total)
+        signals[:-1] = total[1:]  # the universe engine holds the previous bar's signal
+        expected = UniverseBacktester(None, cash=3e6).run_array(prices, signals=signals)
+        np.testing.assert_allclose(netted.equity.sum(axis=1), expected['equity'])
+
+    def test_costs_on_net_orders_only(self):
+        """
+        Verify offsetting trades pay cost only on the net and split it by gross share.
+
+        Expected: +10/-6 on one bar costs 4 shares; books pay 10/16 and 6/16 of it
+        """
+        netter = OrderNetter(2, 1, cash=1_000, cost_per_share=1.0)
+        netted = netter.run(np.array([[[10], [-6]]]), np.array([[5.0]]))
+        assert netted.net_cost == 4.0 and netted.gross_cost == 16.0
+        np.testing.assert_allclose(netted.costs[0], [2.5, 1.5])
+        np.testing.assert_allclose(netted.cash[0], [1_000 - 50 - 2.5, 1_000 + 30 - 1.5])
+
+    def test_bps_costs_and_validation(self, path):
+        """
+        Verify basis-point costs and shape/cash checks.
+
+        Expected: net cost <= gross cost; ValueError on bad shapes and overdrawn cash
+        """
+        targets, prices = path
+        netted = OrderNetter(3, 4, cost_bps=5.0).run(targets, prices)
+        assert 0 < netted.net_cost < netted.gross_cost
+        assert netted.costs.sum() == pytest.approx(netted.net_cost)
+        with pytest.raises(ValueError):
+            OrderNetter(3, 4).run(targets[:, :2], prices)
+        with pytest.raises(ValueError):
+            OrderNetter(1, 1, cash=100).run(np.array([[[10]]]), np.array([[50.0]]))
+
+
+class TestStep:
+    """Test bar-by-bar netting."""
+
+    def test_step_matches_run(self, path):
+        """
+        Verify stepping bar by bar, and chunked runs, equal one run.
+
+        Expected: same trades and final books
+        """
+        targets, prices = path
+        whole = OrderNetter(3, 4, cost_bps=2.0)
+        netted = whole.run(targets, prices)
+        stepped = OrderNetter(3, 4, cost_bps=2.0)
+        trades = np.array([stepped.step(t, p) for t, p in zip(targets, prices)])
+        np.testing.assert_array_equal(trades, netted.trades)
+        np.testing.assert_allclose(stepped.cash, whole.cash)
+        np.testing.assert_array_equal(stepped.positions, whole.positions)
+        restored = OrderNetter(3, 4, cost_bps=2.0)
+        restored.set_state(stepped.get_state())
+        assert restored.get_state()['cash'].tolist() == stepped.cash.tolist()
+
+    def test_step_sends_one_order_per_symbol(self):
+        """
+        Verify brokers receive only net orders.
+
+        Expected: symbol 0 nets to zero (no order); symbol 1 buys 5
+        """
+        brokers = [Broker(1_000), Broker(1_000)]
+        netter = OrderNetter(2, 2)
+        trades = netter.step([[10, 5], [-10, 0]], [20.0, 30.0], brokers=brokers)
+        assert trades.tolist() == [0, 5]
+        assert brokers[0].position == 0 and brokers[0].cash == 1_000
+        assert brokers[1].position == 5 and brokers[1].cash == 850
+
+    def test_step_validates_before_sending(self):
+        """
+        Verify a bar the books cannot afford sends no orders, and a broker
+        rejection restores the books.
+
+        Expected: broker untouched on Insufficient cash; books unchanged
+            after a broker rejects symbol 1 while symbol 0 stays filled
+        """
+        netter = OrderNetter(2, 1, cash=[50, 50])
+        broker = Broker()
+        with pytest.raises(ValueError, match="Insufficient"):
+            netter.step([[3], [0]], [50.0], brokers=[broker])
+        assert broker.position == 0 and netter.positions.sum() == 0
+        netter = OrderNetter(1, 2, cash=1_000)
+        brokers = [Broker(1_000), Broker(10)]
+        with pytest.raises(ValueError, match="Insufficient"):
+            netter.step([[2, 2]], [10.0, 10.0], brokers=brokers)
+        assert netter.positions.tolist() == [[0, 0]] and netter.cash.tolist() == [1_000]
+        assert brokers[0].position == 2 and brokers[1].position == 0
@@ -0,0 +1,280 @@
+"""
+Unit tests for limit/stop orders (OrderBook and Broker integration).
+
+Tests should verify:
+- Fill bar and price for each order type and side
+- Gap fills at the open
+- No fills before an order's start bar
+- Vectorized first-crossing search agrees with a brute-force scan
+- Broker books fills with market_order rules
+"""
+import numpy as np
+import pytest
+from backtester.orders import OrderBook, _Crossings
+from backtester.broker import Broker, FixedPointBroker
+from backtester.checkpoint import dumps, loads
+
+
+@pytest.fixture
+def bars():
+    """
+    Five bars of (open, high, low).
+
+    Returns:
+        tuple of np.ndarray: open, high, low
+    """
+    open_ = np.array([100.0, 101.0, 97.0, 104.0, 99.0])
+    high = np.array([101.0, 102.0, 99.0, 106.0, 100.0])
+    low = np.array([99.0, 100.0, 96.0, 103.0, 95.0])
+    return open_, high, low
+
+
+class TestLimitOrders:
+    """Test limit order fills."""
+
+    def test_buy_limit_fills_when_low_touches(self, bars):
+        """
+        Verify a BUY LIMIT at 99 fills on the first bar whose low <= 99.
+
+        Expected: bar 2 at 99 (no open given)
+        """
+        _, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 5, "LIMIT", limit_price=99.0, start=1)
+        fills = book.match(high, low)
+        assert fills['bar'].tolist() == [2]
+        assert fills['price'].tolist() == [99.0]
+        assert fills['qty'].tolist() == [5]
+
+    def test_buy_limit_gap_fills_at_open(self, bars):
+        """
+        Verify a gap below the limit fills at the better open.
+
+        Expected: bar 2 at the open of 97
+        """
+        open_, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 1, "LIMIT", limit_price=99.0, start=1)
+        assert book.match(high, low, open_)['price'].tolist() == [97.0]
+
+    def test_sell_limit_fills_when_high_touches(self, bars):
+        """
+        Verify a SELL LIMIT at 105 fills when high >= 105.
+
+        Expected: bar 3 at 105
+        """
+        open_, high, low = bars
+        book = OrderBook()
+        book.add("SELL", 1, "LIMIT", limit_price=105.0)
+        fills = book.match(high, low, open_)
+        assert fills['bar'].tolist() == [3]
+        assert fills['price'].tolist() == [105.0]
+
+    def test_unreachable_limit_keeps_resting(self, bars):
+        """
+        Verify an order that never crosses stays in the book.
+
+        Expected: no fills, one resting order
+        """
+        _, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 1, "LIMIT", limit_price=50.0)
+        assert len(book.match(high, low)) == 0
+        assert len(book) == 1
+
+    def test_start_bar_prevents_early_fill(self, bars):
+        """
+        Verify an order placed later cannot fill on earlier bars.
+
+        Expected: BUY LIMIT 99 from bar 3 fills on bar 4, not bar 0 or 2
+        """
+        _, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 1, "LIMIT", limit_price=99.0, start=3)
+        assert book.match(high, low)['bar'].tolist() == [4]
+
+
+class TestStopOrders:
+    """Test stop and stop-limit fills."""
+
+    def test_buy_stop_gap_fills_at_worse_open(self, bars):
+        """
+        Verify a BUY STOP at 103 gapped through fills at the open.
+
+        Expected: bar 3 at 104
+        """
+        open_, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 1, "STOP", stop_price=103.0, start=2)
+        fills = book.match(high, low, open_)
+        assert fills['bar'].tolist() == [3]
+        assert fills['price'].tolist() == [104.0]
+
+    def test_sell_stop_fills_at_stop(self, bars):
+        """
+        Verify a SELL STOP at 98 triggers on low <= 98.
+
+        Expected: bar 2 at 98 without opens
+        """
+        _, high, low = bars
+        book = OrderBook()
+        book.add("SELL", 1, "STOP", stop_price=98.0)
+        fills = book.match(high, low)
+        assert (fills['bar'].tolist(), fills['price'].tolist()) == ([2], [98.0])
+
+    def test_stop_limit_within_limit_fills_on_trigger(self, bars):
+        """
+        Verify a BUY STOP_LIMIT whose trigger price respects the limit fills at once.
+
+        Expected: trigger at bar 3 (open 104 <= limit 105), fill at 104
+        """
+        open_, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 1, "STOP_LIMIT", stop_price=103.0, limit_price=105.0, start=2)
+        fills = book.match(high, low, open_)
+        assert (fills['bar'].tolist(), fills['price'].tolist()) == ([3], [104.0])
+
+    def test_stop_limit_gapped_past_limit_rests(self, bars):
+        """
+        Verify a stop-limit gapped beyond its limit rests as a limit order.
+
+        Given: BUY stop 103, limit 103.5; bar 3 opens at 104
+        Expected: no fill on bar 3; fills on bar 4 at the better open of 99
+        """
+        open_, high, low = bars
+        book = OrderBook()
+        book.add("BUY", 1, "STOP_LIMIT", stop_price=103.0, limit_price=103.5, start=2)
+        fills = book.match(high, low, open_)
+        assert (fills['bar'].tolist(), fills['price'].tolist()) == ([4], [99.0])
+
+    def test_fills_sorted_and_removed(self, bars):
+        """
+        Verify fills come back in bar order and leave the book.
+
+        Expected: bars ascending, book empty afterwards; cancelled orders never fill
+        """
+        _, high, low = bars
+        book = OrderBook()
+        book.add("SELL", 1, "LIMIT", limit_price=105.0)
+        book.add("BUY", 1, "LIMIT", limit_price=99.0, start=1)
+        cancelled = book.add("BUY", 1, "LIMIT", limit_price=200.0)
+        book.cancel(cancelled)
+        fills = book.match(high, low)
+        assert fills['bar'].tolist() == [2, 3]
+        assert len(book) == 0
+        assert len(book.match(high, low)) == 0
+
+
+class TestValidation:
+    """Test order validation."""
+
+    def test_invalid_orders_raise(self):
+        """
+        Verify bad side, qty, type and missing prices are rejected.
+
+        Expected: ValueError for each
+        """
+        book = OrderBook()
+        with pytest.raises(ValueError):
+            book.add("HOLD", 1, "LIMIT", limit_price=1.0)
+        with pytest.raises(ValueError):
+            book.add("BUY", 0, "LIMIT", limit_price=1.0)
+        with pytest.raises(ValueError):
+            book.add("BUY", 1, "MARKET")
+        with pytest.raises(ValueError):
+            book.add("BUY", 1, "LIMIT")
+        with pytest.raises(ValueError):
+            book.add("BUY", 1, "STOP_LIMIT", limit_price=1.0)
+
+
+class TestFirstCrossing:
+    """Test the vectorized first-crossing search."""
+
+    def test_matches_brute_force(self):
+        """
+        Verify against a Python scan for many lengths, starts and levels.
+
+        Expected: identical first-crossing bars (or -1)
+        """
+        np.random.seed(5)
+        for n in (1, 63, 64, 65, 300):
+            values = np.random.normal(0, 1, n)
+            values[n // 2] = np.nan
+            starts = np.random.randint(0, n + 2, 200)
+            levels = np.random.normal(0, 1.5, 200)
+            for above in (True, False):
+                result = _Crossings(values, above).first(starts, levels)
+                for s, level, got in zip(starts, levels, result):
+                    hits = [t for t in range(s, n)
+                            if (values[t] >= level if above else values[t] <= level)]
+                    assert got == (hits[0] if hits else -1)
+
+
+class TestBrokerIntegration:
+    """Test Broker order methods."""
+
+    def test_fill_orders_books_cash_and_position(self, bars):
+        """
+        Verify fills update the broker like market orders.
+
+        Given: BUY 2 limit at 99, SELL 1 stop at 96 (after the buy)
+        Expected: position 1, cash = 1000 - 2*99 + 96
+        """
+        open_, high, low = bars
+        broker = Broker(cash=1_000)
+        broker.limit_order("BUY", 2, 99.0, start=1)
+        broker.stop_order("SELL", 1, 96.0, start=3)
+        broker.stop_limit_order("BUY", 1, 200.0, 201.0)
+        fills = broker.fill_orders(high, low)
+        assert len(fills) == 2
+        assert broker.position == 1
+        assert broker.cash == 1_000 - 2 * 99.0 + 96.0
+        assert len(broker.orders) == 1
+
+    def test_fill_without_cash_raises(self, bars):
+        """
+        Verify the BUY cash check still applies to order fills.
+
+        Expected: ValueError about insufficient cash
+        """
+        _, high, low = bars
+        broker = Broker(cash=10)
+        broker.limit_order("BUY", 1, 99.0)
+        with pytest.raises(ValueError, match="Insufficient"):
+            broker.fill_orders(high, low)
+
+    def test_rejected_fill_keeps_later_orders(self):
+        """
+        Verify a rejected fill leaves it and every later order resting.
+
+        Given: cash 900; BUY 5 @ 100 twice and SELL 1 @ 200, all filling
+        Expected: first buy booked; second buy and the sell still in the book
+        """
+        broker = Broker(cash=900)
+        broker.limit_order("BUY", 5, 100.0)
+        broker.limit_order("BUY", 5, 100.0)
+        broker.limit_order("SELL", 1, 200.0)
+        with pytest.raises(ValueError, match="Insufficient"):
+            broker.fill_orders([100.0, 300.0], [90.0, 90.0])
+        assert (broker.cash, broker.position, len(broker.orders)) == (400, 5, 2)
+        broker.orders.cancel(1)
+        fills = broker.fill_orders([100.0, 300.0], [90.0, 90.0])
+        assert fills['order_id'].tolist() == [2]
+        assert (broker.cash, broker.position, len(broker.orders)) == (600, 4, 0)
+
+    def test_state_keeps_resting_orders(self, bars):
+        """
+        Verify get_state() carries the order book through a checkpoint.
+
+        Expected: the restored broker fills the same orders with the same ids
+        """
+        open_, high, low = bars
+        for broker in (Broker(cash=1_000), FixedPointBroker(cash=1_000)):
+            broker.limit_order("BUY", 2, 99.0, start=1)
+            broker.stop_order("SELL", 1, 96.0, start=3)
+            broker.orders.cancel(broker.stop_limit_order("BUY", 1, 200.0, 201.0))
+            clone = type(broker)()
+            clone.set_state(loads(dumps(broker.get_state())))
+            assert len(clone.orders) == 2
+            np.testing.assert_array_equal(clone.fill_orders(high, low), broker.fill_orders(high, low))
+            assert (clone.cash, clone.position) == (broker.cash, broker.position)
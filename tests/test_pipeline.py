@@ -0,0 +1,114 @@
+"""
+Unit tests for the prefetching data pipeline.
+
+Tests should verify:
+- Chunks arrive in order with the file's values, in a fixed pool of buffers
+- Loader errors reach the consumer; leaving early stops the thread
+- A chunked run equals one run over the whole series
+"""
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.pipeline import NpyChunks, NpyFiles, Prefetcher, run_chunks
+from backtester.sizing import VolTargetSizer
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+@pytest.fixture
+def prices_file(tmp_path):
+    """A seeded 20k-bar random walk saved as .npy."""
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, 20_000)))
+    path = tmp_path / "prices.npy"
+    np.save(path, prices)
+    return str(path), prices
+
+
+class TestPrefetcher:
+    """Test the background loader."""
+
+    def test_chunks_in_order_with_pooled_buffers(self, prices_file):
+        """
+        Verify chunks reassemble the file and only depth + 1 buffers are used.
+
+        Expected: concatenated chunks equal the array; every chunk a view of a pooled buffer
+        """
+        path, prices = prices_file
+        source = NpyChunks(path, chunk=3_000)
+        seen, buffers = [], set()
+        with Prefetcher(source, source.items, source.capacity, depth=2, dtype=source.dtype) as chunks:
+            for chunk in chunks:
+                seen.append(chunk.data.copy())
+                buffers.add(id(chunk.data.base))
+            assert len(chunks.buffers) == 3
+            assert buffers <= {id(buffer) for buffer in chunks.buffers}
+        np.testing.assert_array_equal(np.concatenate(seen), prices)
+        assert [len(part) for part in seen] == [3_000] * 6 + [2_000]
+
+    def test_files(self, tmp_path):
+        """
+        Verify whole files of different lengths load through one buffer size.
+
+        Expected: each file's values, capacity = longest file
+        """
+        arrays = [np.arange(n, dtype=np.float64) for n in (5, 12, 7)]
+        paths = []
+        for i, array in enumerate(arrays):
+            paths.append(str(tmp_path / f"s{i}.npy"))
+            np.save(paths[-1], array)
+        source = NpyFiles(paths)
+        assert source.capacity == 12
+        with Prefetcher(source, paths, source.capacity) as chunks:
+            loaded = [(chunk.item, chunk.data.copy()) for chunk in chunks]
+        assert [item for item, _ in loaded] == paths
+        for (_, data), array in zip(loaded, arrays):
+            np.testing.assert_array_equal(data, array)
+
+    def test_errors_and_early_exit(self, prices_file):
+        """
+        Verify loader errors are raised in the consumer and close() stops the thread.
+
+        Expected: ValueError on a dtype mismatch; thread finished after an early break
+        """
+        path, _ = prices_file
+        source = NpyChunks(path, chunk=100)
+        with pytest.raises(ValueError):
+            with Prefetcher(source, source.items, source.capacity, dtype=np.float32) as chunks:
+                list(chunks)
+        prefetcher = Prefetcher(source, source.items, source.capacity)
+        for _ in prefetcher:
+            break
+        prefetcher.close()
+        assert not prefetcher._thread.is_alive()
+        with pytest.raises(ValueError):
+            Prefetcher(source, source.items, source.capacity, depth=0)
+
+
+class TestRunChunks:
+    """Test chunked backtests."""
+
+    def test_matches_whole_run(self, prices_file):
+        """
+        Verify a prefetched chunked run equals one run_array() over all bars.
+
+        Expected: identical structured arrays, for chunks shorter and longer than the warm-up
+        """
+        path, prices = prices_file
+        expected = Backtester(VolatilityBreakoutStrategy(20), Broker()).run_array(prices)
+        for size in (7, 4_096):
+            source = NpyChunks(path, chunk=size)
+            with Prefetcher(source, source.items, source.capacity) as chunks:
+                backtester = Backtester(VolatilityBreakoutStrategy(20), Broker())
+                result = np.concatenate(list(run_chunks(backtester, (chunk.data for chunk in chunks))))
+            np.testing.assert_array_equal(result, expected)
+
+    def test_rejects_sizer(self, prices_file):
+        """
+        Verify sized backtests are refused.
+
+        Expected: ValueError
+        """
+        _, prices = prices_file
+        backtester = Backtester(VolatilityBreakoutStrategy(20), Broker(), sizer=VolTargetSizer(fraction=0.1))
+        with pytest.raises(ValueError):
+            next(run_chunks(backtester, [prices]))
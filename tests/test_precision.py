@@ -0,0 +1,68 @@
+"""
+Unit tests for the float32 precision report.
+
+Tests should verify:
+- float32 agrees with float64 on ordinary data, with small reported errors
+- Signals on the +/- vol knife edge are flagged and flips are counted
+- Panels report signal statistics only
+"""
+import numpy as np
+import pytest
+from backtester.precision import precision_report
+
+
+@pytest.fixture
+def knife_edge():
+    """
+    Prices whose every odd return equals the lookback-2 volatility in exact arithmetic.
+
+    With r[2k] = -(sqrt(2) - 1) * x and r[2k+1] = x, the std of the pair is
+    exactly x, so float rounding alone decides the signal.
+    """
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0.01, 0.05, 500)
+    returns = np.empty(1_000)
+    returns[0::2] = -(np.sqrt(2) - 1) * x
+    returns[1::2] = x
+    return 100 * np.cumprod(np.concatenate([[1.0], 1 + returns]))
+
+
+class TestPrecisionReport:
+    """Test float32 vs float64 comparisons."""
+
+    def test_ordinary_series(self, volatile_prices):
+        """
+        Verify float32 matches float64 on a random walk.
+
+        Expected: no flips, identical positions, relative equity error < 1e-6
+        """
+        report = precision_report(volatile_prices.to_numpy(), lookback=5)
+        assert report['signal_flips'] == 0
+        assert report['first_flip'] == -1
+        assert report['position_mismatches'] == 0
+        assert 0 < report['max_abs_vol_error'] < 1e-6
+        assert report['max_rel_equity_error'] < 1e-6
+
+    def test_knife_edge_flips_are_flagged(self, knife_edge):
+        """
+        Verify signals decided by rounding are reported.
+
+        Expected: every odd bar is near the threshold; flips happen only there
+        """
+        report = precision_report(knife_edge, lookback=2)
+        assert report['near_threshold'] == 500
+        assert 0 < report['signal_flips'] <= report['near_threshold']
+        assert report['first_flip'] % 2 == 0  # the x returns land on even price bars
+        assert report['position_mismatches'] > 0
+
+    def test_panel(self, volatile_prices):
+        """
+        Verify a 2-D panel reports signal statistics and NaN backtest errors.
+
+        Expected: no flips; engine fields NaN
+        """
+        prices = volatile_prices.to_numpy()
+        report = precision_report(np.column_stack([prices, prices * 3]), lookback=5)
+        assert report['signal_flips'] == 0
+        assert np.isnan(report['position_mismatches'])
+        assert np.isnan(report['max_abs_equity_error'])
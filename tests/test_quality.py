@@ -0,0 +1,264 @@
+"""
+Unit tests for the data-quality pre-pass.
+
+Tests should verify:
+- Clean data passes through untouched with an empty report
+- NaN, non-positive and outlier prices are found and repaired per policy
+- Unsorted and duplicate timestamps are sorted / de-duplicated
+- Panels and pd.Series inputs are handled
+- Invalid policies and inputs are rejected
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.quality import ISSUES, DataValidator
+
+
+pytestmark = pytest.mark.walk(n=1_000, sigma=0.01)
+
+
+@pytest.fixture
+def times(walk):
+    """Minute timestamps (int64 ns) for the walk's bars."""
+    return np.arange(len(walk), dtype=np.int64) * 60_000_000_000
+
+
+class TestCheck:
+    """Test issue detection."""
+
+    def test_clean_data(self, walk, times):
+        """
+        Verify clean data yields an empty report and unchanged output.
+
+        Expected: no issue bars; prices and timestamps returned as given
+        """
+        prices = walk
+        cleaned = DataValidator().clean(prices, times)
+        assert all(len(cleaned.report[issue]) == 0 for issue in ISSUES)
+        np.testing.assert_array_equal(cleaned.prices, prices)
+        np.testing.assert_array_equal(cleaned.timestamps, times)
+
+    def test_bad_values(self, walk):
+        """
+        Verify NaN, inf, zero and negative prices are flagged by bar.
+
+        Expected: nan at [3, 7], nonpositive at [10, 11]; input not modified
+        """
+        prices = walk
+        prices[[3, 7, 10, 11]] = [np.nan, np.inf, 0.0, -5.0]
+        before = prices.copy()
+        report = DataValidator().check(prices)
+        assert report['nan'].tolist() == [3, 7]
+        assert report['nonpositive'].tolist() == [10, 11]
+        np.testing.assert_array_equal(prices, before)
+
+    def test_outliers(self, walk):
+        """
+        Verify a fat-finger tick is flagged but a lasting jump is not.
+
+        Expected: the x10 tick at 500 and the tick next to a NaN at 600 are
+        outliers; the permanent x2 level shift at 800 is not
+        """
+        prices = walk
+        prices[500] *= 10
+        prices[599] = np.nan
+        prices[600] /= 10
+        prices[800:] *= 2
+        report = DataValidator().check(prices)
+        assert report['outlier'].tolist() == [500, 600]
+
+    def test_threshold(self, walk):
+        """
+        Verify outlier_threshold sets the jump size that counts as a bad tick.
+
+        Expected: a 5% spike is ignored at 10 sigma and flagged at 2 sigma
+        """
+        prices = walk
+        prices[500] *= 1.05
+        assert len(DataValidator().check(prices)['outlier']) == 0
+        assert 500 in DataValidator(outlier_threshold=2).check(prices)['outlier']
+
+    def test_flat_prices(self):
+        """
+        Verify mostly unchanged bars do not turn every reverting move into an outlier.
+
+        Expected: one-tick moves kept; a x10 tick still flagged; all-flat prices pass
+        """
+        prices = np.full(200, 100.0)
+        prices[[30, 90]] = [101.0, 99.0]
+        np.testing.assert_array_equal(DataValidator().clean(prices).prices, prices)
+        prices[150] = 1_000.0
+        assert DataValidator().check(prices)['outlier'].tolist() == [150]
+        assert len(DataValidator().check(np.full(50, 100.0))['outlier']) == 0
+
+    def test_timestamps(self, walk, times):
+        """
+        Verify out-of-order and repeated timestamps are flagged.
+
+        Expected: unsorted at the bar that goes back in time; duplicate at the later copy
+        """
+        prices = walk
+        times[[20, 21]] = times[[21, 20]]
+        times[50] = times[49]
+        report = DataValidator().check(prices, times)
+        assert report['unsorted'].tolist() == [21]
+        assert report['duplicate'].tolist() == [50]
+
+
+class TestClean:
+    """Test repair policies."""
+
+    def test_ffill(self, walk):
+        """
+        Verify 'ffill' carries the last good price, and leading bad bars the first one.
+
+        Expected: bars 0-1 take bar 2's price; bar 10 takes bar 9's; the spike takes bar 499's
+        """
+        prices = walk
+        expected = prices.copy()
+        prices[[0, 1, 10]] = [np.nan, 0.0, np.nan]
+        prices[500] *= 10
+        cleaned = DataValidator().clean(prices)
+        assert cleaned.prices[0] == cleaned.prices[1] == expected[2]
+        assert cleaned.prices[10] == expected[9]
+        assert cleaned.prices[500] == expected[499]
+        assert np.isnan(prices[0])  # input untouched
+
+    def test_drop(self, walk, times):
+        """
+        Verify 'drop' removes bad bars together with their timestamps.
+
+        Expected: 998 bars, timestamps of bars 3 and 500 gone
+        """
+        prices = walk
+        prices[3] = np.nan
+        prices[500] *= 10
+        cleaned = DataValidator(nan='drop', outliers='drop').clean(prices, times)
+        assert len(cleaned.prices) == len(cleaned.timestamps) == 998
+        assert times[3] not in cleaned.timestamps and times[500] not in cleaned.timestamps
+
+    def test_raise_and_keep(self, walk):
+        """
+        Verify 'raise' rejects bad data and 'keep' leaves it in place.
+
+        Expected: ValueError naming the bar; kept NaN still NaN but reported
+        """
+        prices = walk
+        prices[3] = np.nan
+        with pytest.raises(ValueError, match=r"nan prices at bars \[3\]"):
+            DataValidator(nan='raise').clean(prices)
+        cleaned = DataValidator(nan='keep').clean(prices)
+        assert np.isnan(cleaned.prices[3])
+        assert cleaned.report['nan'].tolist() == [3]
+
+    def test_sort_and_deduplicate(self, walk, times):
+        """
+        Verify timestamps are stably sorted and duplicates keep the last or first bar.
+
+        Expected: strictly increasing output; 'last' keeps bar 50, 'first' bar 49
+        """
+        prices = walk
+        times[[20, 21]] = times[[21, 20]]
+        times[50] = times[49]
+        last = DataValidator().clean(prices, times)
+        assert np.all(np.diff(last.timestamps) > 0)
+        assert last.prices[20] == prices[21] and last.prices[21] == prices[20]
+        assert last.prices[49] == prices[50]
+        first = DataValidator(duplicates='first').clean(prices, times)
+        assert first.prices[49] == prices[49]
+        with pytest.raises(ValueError, match="Unsorted"):
+            DataValidator(unsorted='raise').clean(prices, times)
+        with pytest.raises(ValueError, match="Duplicate"):
+            DataValidator(duplicates='raise').clean(prices, times)
+
+    def test_outlier_checked_in_time_order(self, walk, times):
+        """
+        Verify value checks run after sorting, so a swapped pair is not a spike.
+
+        Expected: no outliers once bars are put back in time order
+        """
+        prices = walk
+        prices[500:] *= 3  # a real jump between bars 499 and 500
+        order = np.arange(1_000)
+        order[[499, 500]] = [500, 499]
+        report = DataValidator().check(prices[order], times[order])
+        assert len(report['outlier']) == 0
+        assert report['unsorted'].tolist() == [500]
+
+    def test_panel(self, walk):
+        """
+        Verify a (n, k) panel is checked per column and dropped by row.
+
+        Expected: a row is flagged if any column is; 'drop' removes the whole row
+        """
+        prices = walk
+        panel = np.column_stack([prices, prices[::-1]])
+        panel[3, 0] = np.nan
+        panel[7, 1] = np.nan
+        panel[300, 1] *= 10
+        validator = DataValidator(nan='drop')
+        cleaned = validator.clean(panel)
+        assert cleaned.report['nan'].tolist() == [3, 7]
+        assert cleaned.report['outlier'].tolist() == [300]
+        assert cleaned.prices.shape == (998, 2)
+        assert cleaned.prices[298, 1] == panel[299, 1]  # bar 300 filled, shifted by 2 drops
+
+    def test_series(self):
+        """
+        Verify a pd.Series is cleaned along its index and comes back as a Series.
+
+        Expected: NaN filled, duplicate date removed, name and timezone kept
+        """
+        index = pd.DatetimeIndex(['2024-01-02', '2024-01-03', '2024-01-03', '2024-01-04'], tz='US/Eastern')
+        prices = pd.Series([100.0, np.nan, 101.0, 102.0], index=index, name="AAPL")
+        cleaned = DataValidator().clean(prices)
+        assert isinstance(cleaned.prices, pd.Series)
+        assert cleaned.prices.name == "AAPL"
+        assert cleaned.prices.index.equals(index[[0, 2, 3]])
+        assert cleaned.prices.tolist() == [100.0, 101.0, 102.0]
+
+
+    def test_series_without_dates(self):
+        """
+        Verify a Series without a DatetimeIndex keeps its own index labels.
+
+        Expected: NaN filled on the RangeIndex; dropped bars take their labels with them
+        """
+        prices = pd.Series([100.0, np.nan, 102.0, 103.0])
+        cleaned = DataValidator().clean(prices)
+        assert cleaned.prices.index.equals(pd.RangeIndex(4))
+        assert cleaned.prices.tolist() == [100.0, 100.0, 102.0, 103.0]
+        assert cleaned.timestamps is None
+        labelled = pd.Series([100.0, np.nan, 102.0], index=['a', 'b', 'c'])
+        assert DataValidator(nan='drop').clean(labelled).prices.index.tolist() == ['a', 'c']
+
+
+class TestValidation:
+    """Test rejected configurations and inputs."""
+
+    def test_invalid_arguments(self, walk, times):
+        """
+        Verify unknown policies, bad thresholds and mismatched inputs raise ValueError.
+
+        Expected: ValueError for each
+        """
+        prices = walk
+        with pytest.raises(ValueError):
+            DataValidator(nan='interpolate')
+        with pytest.raises(ValueError):
+            DataValidator(duplicates='keep')
+        with pytest.raises(ValueError):
+            DataValidator(outlier_threshold=0)
+        with pytest.raises(ValueError):
+            DataValidator().check(prices, times[:-1])
+        with pytest.raises(ValueError):
+            DataValidator().check(prices.reshape(10, 10, 10))
+
+    def test_no_usable_prices(self):
+        """
+        Verify a column with no good price at all cannot be filled.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError, match="no usable values"):
+            DataValidator().clean(np.array([np.nan, 0.0, np.nan]))
@@ -0,0 +1,140 @@
+"""
+Unit tests for report generation and curve downsampling.
+
+Tests should verify:
+- Downsampling keeps endpoints, extremes and the point budget
+- Summary tables match the statistics computed directly from the arrays
+- HTML/SVG output stays small for long runs; panels and PNG output
+"""
+import importlib.util
+
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.metrics import OnlineMetrics
+from backtester.report import Report, lttb, minmax_downsample
+from backtester.strategy import VolatilityBreakoutStrategy
+from backtester.trades import extract_trades, summarize
+
+
+pytestmark = pytest.mark.walk(n=100_000, sigma=0.01)
+
+
+class TestDownsampling:
+    """Test the shape-preserving downsamplers."""
+
+    def test_minmax_keeps_extremes(self, walk):
+        """
+        Verify min/max bucketing keeps the endpoints and global extremes.
+
+        Expected: sorted unique indices within budget, including argmin/argmax
+        """
+        idx = minmax_downsample(walk, 500)
+        assert len(idx) <= 500
+        assert idx[0] == 0 and idx[-1] == len(walk) - 1
+        assert np.all(np.diff(idx) > 0)
+        assert walk.argmin() in idx and walk.argmax() in idx
+
+    def test_lttb_budget_and_spike(self, walk):
+        """
+        Verify LTTB returns exactly `points` ordered indices and keeps an isolated spike.
+
+        Expected: endpoints kept; the spike bar selected
+        """
+        walk = walk.copy()
+        walk[54_321] *= 3
+        idx = lttb(walk, 400)
+        assert len(idx) == 400
+        assert idx[0] == 0 and idx[-1] == len(walk) - 1
+        assert np.all(np.diff(idx) > 0)
+        assert 54_321 in idx
+
+    def test_short_input_unchanged(self):
+        """
+        Verify inputs within the budget are returned whole.
+
+        Expected: every index, for both methods
+        """
+        y = np.arange(10.0)
+        assert lttb(y, 20).tolist() == list(range(10))
+        assert minmax_downsample(y, 10).tolist() == list(range(10))
+
+
+class TestReport:
+    """Test the report builder."""
+
+    def test_summary_from_arrays(self, volatile_prices):
+        """
+        Verify summary rows equal OnlineMetrics and trade statistics of the run.
+
+        Expected: same Sharpe, max drawdown and round trips; BacktestResult prices used
+        """
+        prices = volatile_prices.to_numpy()
+        result = Backtester(VolatilityBreakoutStrategy(5), Broker(1_000)).run_result(prices)
+        report = Report()
+        report.add("lb5", result)
+        row = report.summary().loc["lb5"]
+        metrics = OnlineMetrics()
+        metrics.update_many(result['equity'], result['position'])
+        assert row['sharpe'] == metrics.snapshot()['sharpe']
+        assert row['max_drawdown'] == metrics.snapshot()['max_drawdown']
+        trades = summarize(extract_trades(result['position'], prices), 1).iloc[0]
+        assert row['round_trips'] == trades['trades']
+        assert row['total_pnl'] == trades['total_pnl']
+
+    def test_html_is_bounded(self, walk):
+        """
+        Verify a long run renders with at most `points` vertices per curve.
+
+        Expected: an HTML document with two polylines of <= 300 points each
+        """
+        result = Backtester(VolatilityBreakoutStrategy(20), Broker()).run_array(walk)
+        report = Report("Long run", points=300, method='minmax')
+        report.add("lb20", result, walk)
+        doc = report.to_html()
+        assert doc.startswith("<!DOCTYPE html>") and "Long run" in doc
+        polylines = doc.split("points='")[1:]
+        assert len(polylines) == 2
+        assert all(len(p.split("'")[0].split(' ')) <= 300 for p in polylines)
+        assert "round_trips" in doc
+
+    def test_panel(self, volatile_prices, tmp_path):
+        """
+        Verify a sweep panel adds one row per run and draws only the best max_curves.
+
+        Expected: 4 summary rows; 2 curves per chart; trade stats per run; file written
+        """
+        prices = volatile_prices.to_numpy()
+        results = [Backtester(VolatilityBreakoutStrategy(lb), Broker(1_000)).run_array(prices)
+                   for lb in (3, 5, 8, 13)]
+        equity = np.column_stack([r['equity'] for r in results])
+        positions = np.column_stack([r['position'] for r in results])
+        report = Report(max_curves=2)
+        report.add_panel(equity, positions, prices, names=['a', 'b', 'c', 'd'])
+        summary = report.summary()
+        assert list(summary.index) == ['a', 'b', 'c', 'd']
+        expected = summarize(extract_trades(positions, prices), 4)
+        np.testing.assert_array_equal(summary['total_pnl'], expected['total_pnl'])
+        assert report.to_svg().count('<polyline') == 2
+        path = tmp_path / "report.html"
+        report.to_html(str(path))
+        assert path.read_text().count('<svg') == 2
+        with pytest.raises(ValueError):
+            report.add_panel(equity, positions[:, :2])
+
+    def test_png(self, volatile_prices, tmp_path):
+        """
+        Verify PNG output with matplotlib, or a clear ImportError without it.
+
+        Expected: a PNG file, or ImportError mentioning matplotlib
+        """
+        report = Report()
+        report.add("run", Backtester(VolatilityBreakoutStrategy(5), Broker()).run_array(volatile_prices.to_numpy()))
+        path = tmp_path / "report.png"
+        if importlib.util.find_spec('matplotlib') is None:
+            with pytest.raises(ImportError, match='matplotlib'):
+                report.to_png(str(path))
+        else:
+            report.to_png(str(path))
+            assert path.read_bytes()[:4] == b'\x89PNG'
@@ -0,0 +1,108 @@
+"""
+Unit tests for the lazy BacktestResult.
+
+Tests should verify:
+- run_result() produces the same numbers as run_array() and run()
+- Equity is only computed when asked for, and cached
+- Field access, DataFrame building and validation
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.result import BacktestResult
+from backtester.search import sharpe
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+@pytest.fixture
+def backtester():
+    """Factory for a fresh Backtester with a lookback-5 strategy."""
+    return lambda: Backtester(VolatilityBreakoutStrategy(lookback=5), Broker(1_000_000))
+
+
+class TestRunResult:
+    """Test the engine entry point."""
+
+    def test_matches_run_array(self, backtester, volatile_prices):
+        """
+        Verify run_result() holds exactly what run_array() returns.
+
+        Expected: identical structured arrays and final equity
+        """
+        prices = volatile_prices.to_numpy()
+        expected = backtester().run_array(prices)
+        result = backtester().run_result(prices)
+        np.testing.assert_array_equal(result.to_array(), expected)
+        assert result.final_equity == expected['equity'][-1]
+        assert result.final_position == expected['position'][-1]
+        assert len(result) == len(prices)
+
+    def test_matches_run(self, backtester, volatile_prices):
+        """
+        Verify to_frame() on a Series run equals run()'s DataFrame.
+
+        Expected: same columns, values and date index
+        """
+        frame = backtester().run_result(volatile_prices).to_frame()
+        pd.testing.assert_frame_equal(frame, backtester().run(volatile_prices))
+
+    def test_equity_is_lazy(self, backtester, volatile_prices):
+        """
+        Verify equity is not materialized until first accessed, then cached.
+
+        Expected: no equity array after final_equity; same object on repeated access
+        """
+        result = backtester().run_result(volatile_prices.to_numpy())
+        result.final_equity
+        assert result._equity is None
+        first = result.equity_array
+        assert result.equity_array is first
+        assert result['equity'] is first
+
+    def test_scoring_functions_accept_it(self, backtester, volatile_prices):
+        """
+        Verify functions written for run_array() results work unchanged.
+
+        Expected: equal Sharpe ratio from either result type
+        """
+        prices = volatile_prices.to_numpy()
+        assert sharpe(backtester().run_result(prices)) == sharpe(backtester().run_array(prices))
+
+
+class TestBacktestResult:
+    """Test the result object itself."""
+
+    def test_fields_and_frame(self):
+        """
+        Verify field access and the DataFrame index choice.
+
+        Expected: timestamps index the frame as dates; unknown fields raise KeyError
+        """
+        times = pd.date_range('2024-01-01', periods=3).as_unit('ns').asi8
+        result = BacktestResult(np.array([100.0, 90.0, 90.0]), np.array([0, 1, 1]), np.array([10.0, 10.0, 12.0]),
+                                timestamps=times)
+        assert result['equity'].tolist() == [100.0, 100.0, 102.0]
+        assert result.positions.tolist() == [0, 1, 1]
+        assert result['timestamp'] is times
+        frame = result.to_frame()
+        assert frame.index.equals(pd.date_range('2024-01-01', periods=3))
+        assert result.to_array()['timestamp'].tolist() == times.tolist()
+        with pytest.raises(KeyError):
+            result['returns']
+        plain = BacktestResult(np.ones(2), np.zeros(2, dtype=np.int64), np.ones(2))
+        assert plain.to_frame().index.equals(pd.RangeIndex(2))
+        with pytest.raises(KeyError):
+            plain['timestamp']
+
+    def test_float32_and_validation(self):
+        """
+        Verify equity keeps the cash dtype, and mismatched arrays are rejected.
+
+        Expected: float32 equity; ValueError on different lengths
+        """
+        result = BacktestResult(np.ones(3, dtype=np.float32), np.ones(3, dtype=np.int64), np.full(3, 2.0))
+        assert result.equity_array.dtype == np.float32
+        with pytest.raises(ValueError):
+            BacktestResult(np.ones(3), np.ones(2, dtype=np.int64), np.ones(3))
@@ -0,0 +1,237 @@
+"""
+Unit tests for pre-trade risk limits.
+
+Tests should verify:
+- Each limit rejects breaching orders and lets risk-reducing ones through
+- The daily turnover count resets per day and the kill switch latches
+- The vectorized path check agrees with per-order checks
+- Broker, Backtester and UniverseBacktester enforce the limits
+"""
+import numpy as np
+import pytest
+from backtester.broker import Broker, FixedPointBroker
+from backtester.engine import Backtester
+from backtester.risk import DAILY_TURNOVER, DRAWDOWN, GROSS_EXPOSURE, ORDER_NOTIONAL, RiskLimitError, RiskLimits
+from backtester.strategy import VolatilityBreakoutStrategy
+from backtester.universe import UniverseBacktester
+
+
+class TestCheckOrder:
+    """Test single-order checks."""
+
+    def test_order_notional(self):
+        """
+        Verify orders above max_order_notional are rejected with the limit named.
+
+        Expected: 10 @ $100 passes a $1,000 cap; 11 raises RiskLimitError (a ValueError)
+        """
+        limits = RiskLimits(max_order_notional=1_000)
+        limits.check_order(10, 100.0, 0, 10_000)
+        with pytest.raises(ValueError) as info:
+            limits.check_order(-11, 100.0, 0, 10_000)
+        assert isinstance(info.value, RiskLimitError)
+        assert info.value.limit == 'max_order_notional'
+
+    def test_exposure_only_blocks_increases(self):
+        """
+        Verify exposure caps block growth but not reduction of an oversized book.
+
+        Expected: going to 60 shares @ $100 breaches $5,000; selling from 60 to 55 is allowed
+        """
+        limits = RiskLimits(max_gross_exposure=5_000, max_net_exposure=5_000)
+        with pytest.raises(RiskLimitError, match="max_gross_exposure"):
+            limits.check_order(60, 100.0, 0, 10_000)
+        limits.check_order(-5, 100.0, 60, 4_000)
+        with pytest.raises(RiskLimitError, match="max_gross_exposure"):
+            limits.check_order(-60, 100.0, 0, 10_000)  # shorts count too
+
+    def test_daily_turnover_resets(self):
+        """
+        Verify turnover accumulates within a day and resets on a new day.
+
+        Expected: the third $400 order of day 1 is rejected; day 2 starts from zero
+        """
+        limits = RiskLimits(max_daily_turnover=1_000)
+        limits.mark(10_000, day=1)
+        limits.check_order(4, 100.0, 0, 10_000)
+        limits.check_order(-4, 100.0, 4, 9_600)
+        with pytest.raises(RiskLimitError, match="max_daily_turnover"):
+            limits.check_order(4, 100.0, 0, 10_000)
+        limits.mark(10_000, day=2)
+        limits.check_order(4, 100.0, 0, 10_000)
+        assert limits.turnover == 400
+
+    def test_drawdown_kill_switch(self):
+        """
+        Verify the kill switch trips past max_drawdown and only allows reductions.
+
+        Expected: after a 25% drop from peak, adding raises, reducing passes, state
+        stays halted until reset()
+        """
+        limits = RiskLimits(max_drawdown=0.2)
+        limits.mark(10_000)
+        limits.check_order(10, 100.0, 0, 10_000)
+        limits.check_order(0, 75.0, 10, 6_750)  # equity 7,500: 25% below peak
+        assert limits.halted
+        with pytest.raises(RiskLimitError, match="kill switch"):
+            limits.check_order(1, 75.0, 10, 6_750)
+        limits.check_order(-10, 75.0, 10, 6_750)
+        limits.mark(20_000)
+        assert limits.halted
+        limits.reset()
+        assert not limits.halted and limits.peak == -np.inf
+
+    def test_invalid_limits(self):
+        """
+        Verify non-positive limits and drawdowns outside (0, 1) are rejected.
+
+        Expected: ValueError for each
+        """
+        with pytest.raises(ValueError):
+            RiskLimits(max_gross_exposure=0)
+        with pytest.raises(ValueError):
+            RiskLimits(max_daily_turnover=-1)
+        with pytest.raises(ValueError):
+            RiskLimits(max_drawdown=1.0)
+
+
+class TestPathCheck:
+    """Test vectorized checks over a proposed position path."""
+
+    @staticmethod
+    def _path(seed, n=300):
+        rng = np.random.default_rng(seed)
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.05, n)))
+        positions = np.cumsum(rng.integers(-5, 6, n) * (rng.random(n) < 0.5))
+        cash = 10_000 - np.cumsum(np.diff(positions, prepend=0) * prices)
+        return positions, prices, cash
+
+    def test_matches_sequential(self):
+        """
+        Verify check_path fails at the same bar and limit as per-order checks.
+
+        Expected: equal (bar, limit) of the first breach over many random paths
+        """
+        for seed in range(40):
+            positions, prices, cash = self._path(seed)
+            config = dict(max_gross_exposure=2_500, max_order_notional=700,
+                          max_daily_turnover=800, max_drawdown=0.5)
+            sequential, batch = RiskLimits(**config), RiskLimits(**config)
+            expected = None
+            previous, previous_cash = 0, 10_000.0
+            for t in range(len(prices)):
+                sequential.mark(previous_cash + previous * prices[t], day=t)
+                try:
+                    sequential.check_order(int(positions[t] - previous), prices[t], previous, previous_cash)
+                except RiskLimitError as error:
+                    expected = (t, error.limit)
+                    break
+                previous, previous_cash = int(positions[t]), cash[t]
+            try:
+                batch.check_path(positions, prices, cash)
+                found = None
+            except RiskLimitError as error:
+                found = (error.index, error.limit)
+            assert found == expected, seed
+
+    def test_violation_flags(self):
+        """
+        Verify violations() reports every breached limit per bar without changing state.
+
+        Expected: bar 1 breaches order notional and gross; adding after the 12% drop
+        at bar 2 trips the kill switch
+        """
+        limits = RiskLimits(max_gross_exposure=1_500, max_order_notional=1_000, max_drawdown=0.1)
+        positions = np.array([5, 20, 20, 21])
+        prices = np.array([100.0, 100.0, 40.0, 40.0])
+        cash = np.array([9_500.0, 8_000.0, 8_000.0, 7_960.0])
+        flags = limits.violations(positions, prices, cash)
+        assert flags[0] == 0
+        assert flags[1] == ORDER_NOTIONAL | GROSS_EXPOSURE
+        assert flags[2] == 0
+        assert flags[3] == DRAWDOWN
+        assert limits.peak == -np.inf
+
+    def test_state_carried_between_batches(self):
+        """
+        Verify a passing batch advances peak, day and turnover for the next one.
+
+        Expected: same-day turnover from the first batch counts against the second
+        """
+        limits = RiskLimits(max_daily_turnover=1_000)
+        limits.check_path([5], [100.0], [9_500.0], days=[7])
+        assert (limits.day, limits.turnover, limits.peak) == (7, 500.0, 10_000.0)
+        with pytest.raises(RiskLimitError) as info:
+            limits.check_path([11, 11], [100.0, 100.0], [8_900.0, 8_900.0], days=[7, 8], initial=[5])
+        assert info.value.limit == 'max_daily_turnover' and info.value.index == 0
+        flags = limits.violations([11], [100.0], [8_900.0], days=[8], initial=[5])
+        assert flags[0] == 0
+
+    def test_panel_net_vs_gross(self):
+        """
+        Verify gross and net exposure differ on a hedged panel.
+
+        Expected: long/short pair passes the net cap but breaches the gross cap
+        """
+        positions = np.array([[10, -10]])
+        prices = np.array([[100.0, 100.0]])
+        cash = np.array([10_000.0])
+        assert RiskLimits(max_net_exposure=500).violations(positions, prices, cash)[0] == 0
+        assert RiskLimits(max_gross_exposure=500).violations(positions, prices, cash)[0] == GROSS_EXPOSURE
+        with pytest.raises(ValueError):
+            RiskLimits().violations(positions, prices, cash[:0])
+        assert RiskLimits(max_daily_turnover=1).violations(np.empty(0), np.empty(0), np.empty(0)).size == 0
+        assert DAILY_TURNOVER & RiskLimits(max_daily_turnover=1).violations(positions, prices, cash)[0]
+
+
+class TestEnforcement:
+    """Test limits wired into brokers and engines."""
+
+    def test_broker_rejects_and_keeps_state(self):
+        """
+        Verify a rejected order leaves the broker untouched; risk state is checkpointed.
+
+        Expected: RiskLimitError, cash/position unchanged; get_state carries 'risk'
+        """
+        for broker in (Broker(cash=10_000, risk=RiskLimits(max_gross_exposure=1_000)),
+                       FixedPointBroker(cash=10_000, risk=RiskLimits(max_gross_exposure=1_000))):
+            broker.market_order("BUY", 10, 100.0)
+            with pytest.raises(RiskLimitError):
+                broker.market_order("SELL", 25, 100.0)
+            assert (broker.cash, broker.position) == (9_000, 10)
+            state = broker.get_state()
+            assert state['risk']['turnover'] == 1_000
+            broker.risk.reset()
+            broker.set_state(state)
+            assert broker.risk.turnover == 1_000
+
+    def test_backtester(self, volatile_prices):
+        """
+        Verify the engine marks risk per bar and surfaces breaches.
+
+        Expected: generous limits give the unrestricted result; a tiny order cap raises
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        plain = Backtester(strategy, Broker()).run_array(volatile_prices.to_numpy())
+        limited = Backtester(strategy, Broker(risk=RiskLimits(max_gross_exposure=1e6))).run_array(
+            volatile_prices.to_numpy())
+        np.testing.assert_array_equal(plain, limited)
+        with pytest.raises(RiskLimitError):
+            Backtester(strategy, Broker(risk=RiskLimits(max_order_notional=1.0))).run_array(
+                volatile_prices.to_numpy())
+
+    def test_universe_backtester(self):
+        """
+        Verify UniverseBacktester checks the whole target path in one pass.
+
+        Expected: the unlimited run passes the path check; a low gross cap raises with the bar
+        """
+        rng = np.random.default_rng(3)
+        panel = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, (400, 6)), axis=0))
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        ub = UniverseBacktester(strategy, cash=1e6, risk=RiskLimits(max_gross_exposure=1e5))
+        ub.run_array(panel)
+        assert ub.risk.peak > 0
+        with pytest.raises(RiskLimitError) as info:
+            UniverseBacktester(strategy, cash=1e6, risk=RiskLimits(max_gross_exposure=150)).run_array(panel)
+        assert info.value.index >= 1
@@ -0,0 +1,218 @@
+"""
+Unit tests for the rolling-statistics kernels.
+
+Tests should verify:
+- Agreement with pandas rolling()/ewm() within tolerance
+- NaN/inf handling and min_periods
+- 2-D inputs and several windows at once
+- Numerical stability on series with a large level
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from backtester import rolling
+
+
+@pytest.fixture
+def returns():
+    """
+    Seeded daily returns with a few missing/bad values.
+
+    Returns:
+        np.ndarray: 10,000 returns with NaN and inf entries
+    """
+    np.random.seed(42)
+    x = np.random.normal(0, 0.02, 10_000)
+    x[[10, 11, 500]] = np.nan
+    x[2_000] = np.inf
+    return x
+
+
+KERNELS = [
+    (rolling.rolling_sum, 'sum'),
+    (rolling.rolling_mean, 'mean'),
+    (rolling.rolling_var, 'var'),
+    (rolling.rolling_std, 'std'),
+    (rolling.rolling_max, 'max'),
+    (rolling.rolling_min, 'min'),
+]
+
+
+class TestMatchesPandas:
+    """Test agreement with pandas rolling windows."""
+
+    @pytest.mark.parametrize("kernel,name", KERNELS)
+    @pytest.mark.parametrize("window", [1, 2, 20, 250])
+    def test_default_min_periods(self, returns, kernel, name, window):
+        """
+        Verify each kernel against pandas for several window lengths.
+
+        Expected: equal values and equal NaN positions
+        """
+        expected = getattr(pd.Series(returns).rolling(window), name)().to_numpy()
+        np.testing.assert_allclose(kernel(returns, window), expected, rtol=1e-7, atol=1e-9)
+
+    @pytest.mark.parametrize("kernel,name", KERNELS)
+    def test_min_periods(self, returns, kernel, name):
+        """
+        Verify partial windows with min_periods < window.
+
+        Expected: values from the first bar on, like pandas
+        """
+        expected = getattr(pd.Series(returns).rolling(20, min_periods=2), name)().to_numpy()
+        np.testing.assert_allclose(kernel(returns, 20, 2), expected, rtol=1e-7, atol=1e-9)
+
+    @pytest.mark.parametrize("adjust", [False, True])
+    @pytest.mark.parametrize("alpha", [0.05, 0.5, 1.0])
+    def test_ewma(self, alpha, adjust):
+        """
+        Verify ewma() against pandas ewm().mean().
+
+        Expected: agreement to ~1e-12
+        """
+        np.random.seed(0)
+        x = np.cumsum(np.random.normal(0, 1, 5_000)) + 100
+        expected = pd.Series(x).ewm(alpha=alpha, adjust=adjust).mean().to_numpy()
+        np.testing.assert_allclose(rolling.ewma(x, alpha=alpha, adjust=adjust), expected, rtol=1e-12)
+
+    def test_ewma_span(self):
+        """
+        Verify the span parametrization.
+
+        Expected: same as alpha = 2 / (span + 1)
+        """
+        x = np.arange(50.0)
+        np.testing.assert_allclose(rolling.ewma(x, span=9), rolling.ewma(x, alpha=0.2))
+
+
+class TestShapes:
+    """Test 2-D inputs and multiple windows."""
+
+    def test_two_dimensional_is_column_wise(self):
+        """
+        Verify that each column of a 2-D input is an independent series.
+
+        Expected: column j equals the 1-D result on column j
+        """
+        np.random.seed(1)
+        panel = np.random.normal(0, 1, (300, 4))
+        for kernel, _ in KERNELS:
+            result = kernel(panel, 10)
+            assert result.shape == panel.shape
+            for j in range(panel.shape[1]):
+                np.testing.assert_allclose(result[:, j], kernel(panel[:, j], 10), rtol=1e-10)
+        ema = rolling.ewma(panel, alpha=0.3)
+        np.testing.assert_allclose(ema[:, 2], rolling.ewma(panel[:, 2], alpha=0.3))
+
+    def test_several_windows_at_once(self, returns):
+        """
+        Verify that a sequence of windows adds a trailing axis.
+
+        Expected: shape (n, 3) for 1-D input, (n, k, 3) for 2-D input
+        """
+        result = rolling.rolling_std(returns, [5, 20, 60])
+        assert result.shape == (len(returns), 3)
+        np.testing.assert_allclose(result[:, 1], rolling.rolling_std(returns, 20), rtol=1e-10)
+        panel = np.column_stack([returns, returns[::-1]])
+        assert rolling.rolling_mean(panel, [5, 20, 60]).shape == (len(returns), 2, 3)
+
+    def test_series_longer_than_one_chunk(self):
+        """
+        Verify continuity across the internal chunk boundaries.
+
+        Expected: matches pandas over 3 chunks
+        """
+        np.random.seed(2)
+        x = np.random.normal(0, 1, 3 * rolling.CHUNK + 17)
+        expected = pd.Series(x).rolling(30).var().to_numpy()
+        np.testing.assert_allclose(rolling.rolling_var(x, 30), expected, rtol=1e-8)
+
+    def test_empty_input(self):
+        """
+        Verify that empty arrays produce empty results.
+
+        Expected: zero-length outputs
+        """
+        for kernel, _ in KERNELS:
+            assert len(kernel(np.array([]), 5)) == 0
+        assert len(rolling.ewma(np.array([]), alpha=0.5)) == 0
+
+
+    @pytest.mark.parametrize("kernel, name", KERNELS)
+    def test_float32_in_float32_out(self, returns, kernel, name):
+        """
+        Verify float32 input keeps its dtype and stays close to float64.
+
+        Expected: float32 result within float32 rounding of the float64 result
+        """
+        result = kernel(returns.astype(np.float32), 20)
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result, kernel(returns, 20), rtol=1e-5, atol=1e-7)
+
+    @pytest.mark.parametrize("adjust", [False, True])
+    def test_ewma_float32(self, returns, adjust):
+        """
+        Verify ewma() returns float32 for float32 input, like the window kernels.
+
+        Expected: float32 result equal to the float64 result rounded to float32
+        """
+        result = rolling.ewma(returns.astype(np.float32), alpha=0.1, adjust=adjust)
+        assert result.dtype == np.float32
+        expected = rolling.ewma(returns.astype(np.float32).astype(np.float64), alpha=0.1, adjust=adjust)
+        np.testing.assert_array_equal(result, expected.astype(np.float32))
+
+
+class TestStability:
+    """Test numerical behaviour."""
+
+    def test_large_level_variance(self):
+        """
+        Verify variance of a random walk around 1e9 against an exact two-pass result.
+
+        Expected: relative error well below 1e-6
+        """
+        np.random.seed(3)
+        x = 1e9 + np.cumsum(np.random.normal(0, 1, 20_000))
+        windows = np.lib.stride_tricks.sliding_window_view(x, 20)
+        exact = windows.var(axis=-1, ddof=1)
+        result = rolling.rolling_var(x, 20)[19:]
+        assert np.max(np.abs(result - exact) / exact) < 1e-6
+
+    def test_constant_series_has_zero_variance(self):
+        """
+        Verify that flat data gives exactly zero variance, never negative.
+
+        Expected: all zeros once the window is full
+        """
+        result = rolling.rolling_var(np.full(100, 123.456), 10)
+        assert np.all(result[9:] == 0.0)
+
+
+class TestValidation:
+    """Test argument checks."""
+
+    def test_invalid_windows_raise(self):
+        """
+        Verify that non-positive windows are rejected.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            rolling.rolling_sum(np.ones(5), 0)
+        with pytest.raises(ValueError):
+            rolling.rolling_std(np.ones(5), [])
+        with pytest.raises(ValueError):
+            rolling.rolling_max(np.ones(5), 0)
+
+    def test_invalid_ewma_arguments_raise(self):
+        """
+        Verify that ewma() needs exactly one valid smoothing parameter.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            rolling.ewma(np.ones(5))
+        with pytest.raises(ValueError):
+            rolling.ewma(np.ones(5), alpha=0.5, span=3)
+        with pytest.raises(ValueError):
+            rolling.ewma(np.ones(5), alpha=1.5)
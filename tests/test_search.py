@@ -0,0 +1,143 @@
+"""
+Unit tests for successive-halving parameter search.
+
+Tests should verify:
+- Candidates are pruned rung by rung and survivors reach the full series
+- Carried-forward engine state gives the same result as a full run
+- Bars simulated are counted against the full grid
+"""
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.search import SuccessiveHalving, param_grid, sharpe, total_return
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+pytestmark = pytest.mark.walk(n=1_600, seed=3)
+
+
+class TestParamGrid:
+    """Test grid expansion."""
+
+    def test_product(self):
+        """
+        Verify the grid is the cartesian product in order.
+
+        Expected: 2 x 2 dicts, last parameter varying fastest
+        """
+        assert param_grid({'a': [1, 2], 'b': [3, 4]}) == [
+            {'a': 1, 'b': 3}, {'a': 1, 'b': 4}, {'a': 2, 'b': 3}, {'a': 2, 'b': 4}]
+
+
+class TestSuccessiveHalving:
+    """Test the search driver."""
+
+    def test_rungs_and_bars(self, walk):
+        """
+        Verify the halving schedule and the bars-simulated accounting.
+
+        Expected: rungs 100x16, 200x8, 400x4, 800x2, 1600x1 and 4,800 of 25,600 bars
+        """
+        search = SuccessiveHalving(param_grid({'lookback': range(2, 34, 2)}), min_bars=100)
+        ranking = search.run(walk)
+        assert search.rungs == [(100, 16), (200, 8), (400, 4), (800, 2), (1_600, 1)]
+        assert search.bars_simulated == 4_800
+        assert search.full_grid_bars == 25_600
+        assert ranking['bars'].iloc[0] == 1_600
+        assert sorted(ranking['bars'].tolist()) == sorted([100] * 8 + [200] * 4 + [400] * 2 + [800] + [1_600])
+
+    def test_carried_state_matches_full_run(self, walk):
+        """
+        Verify a survivor's score equals scoring a from-scratch full run.
+
+        Expected: identical score for the winner
+        """
+        search = SuccessiveHalving(param_grid({'lookback': [5, 10, 20, 40]}), min_bars=200, score=total_return)
+        best = search.run(walk).iloc[0]
+        full = Backtester(VolatilityBreakoutStrategy(int(best['lookback'])), Broker(1_000_000)).run_array(walk)
+        assert best['score'] == total_return(full)
+
+    def test_strategy_evaluated_once(self, walk):
+        """
+        Verify each candidate's signals are computed once, over the full series.
+
+        Expected: one full-length signals_array() call per candidate, however many rungs
+        """
+        calls = []
+
+        class Counting(VolatilityBreakoutStrategy):
+            def signals_array(self, prices, adjustments=None):
+                calls.append((self.lookback, len(prices)))
+                return super().signals_array(prices, adjustments)
+
+        search = SuccessiveHalving(param_grid({'lookback': [5, 10, 20, 40]}), min_bars=200, strategy_cls=Counting)
+        search.run(walk)
+        assert len(search.rungs) > 2
+        assert sorted(calls) == [(lb, len(walk)) for lb in (5, 10, 20, 40)]
+
+    def test_survivors_are_the_best(self, walk):
+        """
+        Verify only the top 1/eta by score move on from the first rung.
+
+        Expected: with eta=3, the 3 best of 9 first-rung scores reach rung 1
+        """
+        candidates = param_grid({'lookback': range(2, 20, 2)})
+        search = SuccessiveHalving(candidates, min_bars=300, eta=3)
+        ranking = search.run(walk)
+        first = [sharpe(Backtester(VolatilityBreakoutStrategy(**c), Broker(1_000_000)).run_array(walk[:300]))
+                 for c in candidates]
+        top = {candidates[i]['lookback'] for i in np.argsort(first)[::-1][:3]}
+        assert set(ranking.loc[ranking['rung'] >= 1, 'lookback']) == top
+
+    def test_short_series_is_full_grid(self, walk):
+        """
+        Verify that min_bars beyond the data degenerates to a full grid.
+
+        Expected: one rung, bars simulated == full grid
+        """
+        search = SuccessiveHalving(param_grid({'lookback': [5, 10]}), min_bars=5_000)
+        search.run(walk)
+        assert search.rungs == [(1_600, 2)]
+        assert search.bars_simulated == search.full_grid_bars
+
+    def test_nan_scores_eliminated(self, walk):
+        """
+        Verify candidates with a non-finite score are dropped first.
+
+        Expected: the NaN-scoring candidate does not reach rung 1
+        """
+        def score(result):
+            return np.nan if result['position'].max() > 0 and len(result) == 100 else total_return(result)
+
+        search = SuccessiveHalving([{'lookback': 5}, {'lookback': 1}], min_bars=100, score=score)
+        ranking = search.run(walk)
+        assert ranking['rung'].tolist() == [1, 0]
+
+    def test_validation(self, walk):
+        """
+        Verify invalid settings and inputs raise ValueError.
+
+        Expected: ValueError for empty candidates, small min_bars/eta, bad prices
+        """
+        with pytest.raises(ValueError):
+            SuccessiveHalving([])
+        with pytest.raises(ValueError):
+            SuccessiveHalving([{}], min_bars=1)
+        with pytest.raises(ValueError):
+            SuccessiveHalving([{}], eta=1)
+        with pytest.raises(ValueError, match="1-D"):
+            SuccessiveHalving([{}]).run(np.ones((2, 2)))
+        with pytest.raises(ValueError, match="empty"):
+            SuccessiveHalving([{}]).run(np.array([]))
+
+    def test_sharpe_edge_cases(self):
+        """
+        Verify sharpe() on flat or very short equity curves.
+
+        Expected: 0.0
+        """
+        flat = np.zeros(5, dtype=[('equity', float)])
+        flat['equity'] = 100.0
+        assert sharpe(flat) == 0.0
+        assert sharpe(flat[:2]) == 0.0
@@ -0,0 +1,142 @@
+"""
+Unit tests for the persistent signal store.
+
+Tests should verify:
+- Signals are computed once, then memory-mapped from disk
+- Keys separate symbols, strategy parameters and data versions
+- Changed prices invalidate stored signals
+- The engine runs on stored signals exactly as on its own
+"""
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.signal_store import SignalStore, data_version
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+class CountingStrategy(VolatilityBreakoutStrategy):
+    """Breakout strategy that counts signals_array() calls."""
+
+    calls = 0
+
+    def signals_array(self, prices):
+        CountingStrategy.calls += 1
+        return super().signals_array(prices)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SignalStore(str(tmp_path / 'signals'))
+
+
+@pytest.fixture
+def prices(volatile_prices):
+    return volatile_prices.to_numpy()
+
+
+class TestSignalStore:
+    """Test storing and reading signals."""
+
+    def test_computes_once_then_maps(self, store, prices):
+        """
+        Verify a miss computes and stores, and a hit reads the file.
+
+        Expected: one strategy call for two gets; read-only int8 memmap equal to the signals
+        """
+        CountingStrategy.calls = 0
+        strategy = CountingStrategy(lookback=5)
+        first = store.get('AAPL', strategy, prices)
+        second = store.get('AAPL', strategy, prices)
+        assert CountingStrategy.calls == 1
+        assert isinstance(second, np.memmap)
+        assert second.dtype == np.int8 and not second.flags.writeable
+        np.testing.assert_array_equal(first, VolatilityBreakoutStrategy(5).signals_array(prices))
+        np.testing.assert_array_equal(second, first)
+
+    def test_keys(self, store, prices):
+        """
+        Verify symbols and parameters are stored separately.
+
+        Expected: different lookbacks give different signals; other symbols are misses
+        """
+        short = store.get('AAPL', VolatilityBreakoutStrategy(5), prices)
+        long = store.get('AAPL', VolatilityBreakoutStrategy(10), prices)
+        assert not np.array_equal(short, long)
+        version = data_version(prices)
+        np.testing.assert_array_equal(store.load('AAPL', VolatilityBreakoutStrategy(5), version), short)
+        with pytest.raises(KeyError):
+            store.load('MSFT', VolatilityBreakoutStrategy(5), version)
+        with pytest.raises(KeyError):
+            store.load('AAPL', VolatilityBreakoutStrategy(5, dtype=np.float32), version)
+
+    def test_new_prices_replace_old_version(self, store, prices):
+        """
+        Verify a data update recomputes and drops the stale version.
+
+        Expected: one stored version, matching the new prices
+        """
+        strategy = VolatilityBreakoutStrategy(5)
+        store.get('AAPL', strategy, prices)
+        updated = prices.copy()
+        updated[-1] *= 1.5
+        signals = store.get('AAPL', strategy, updated)
+        assert store.versions('AAPL', strategy) == [data_version(updated)]
+        np.testing.assert_array_equal(signals, strategy.signals_array(updated))
+        assert data_version(updated) != data_version(prices)
+
+    def test_invalidate_and_explicit_versions(self, store, prices):
+        """
+        Verify invalidate() drops a symbol and named versions are honoured.
+
+        Expected: no versions after invalidate; the given version name is stored
+        """
+        strategy = VolatilityBreakoutStrategy(5)
+        store.get('AAPL', strategy, prices, version='2024-06-30')
+        assert store.versions('AAPL', strategy) == ['2024-06-30']
+        store.invalidate('AAPL')
+        assert store.versions('AAPL', strategy) == []
+
+    def test_rejects_bad_input(self, store, prices):
+        """
+        Verify malformed signals and unsafe names are rejected.
+
+        Expected: ValueError for wrong length, out-of-range values, path-like symbol or version
+        """
+        strategy = VolatilityBreakoutStrategy(5)
+        with pytest.raises(ValueError):
+            store.put('AAPL', strategy, prices, signals=np.zeros(len(prices) - 1))
+        with pytest.raises(ValueError):
+            store.put('AAPL', strategy, prices, signals=np.full(len(prices), 2))
+        with pytest.raises(ValueError):
+            store.get('../AAPL', strategy, prices)
+        with pytest.raises(ValueError):
+            store.get('AAPL', strategy, prices, version='a/b')
+
+
+class TestEngineSignals:
+    """Test running the engine on stored signals."""
+
+    def test_run_on_stored_signals(self, store, prices):
+        """
+        Verify run_array/run_result on stored signals match a normal run.
+
+        Expected: identical structured arrays
+        """
+        strategy = VolatilityBreakoutStrategy(5)
+        expected = Backtester(strategy, Broker(1_000_000)).run_array(prices)
+        signals = store.get('AAPL', strategy, prices)
+        result = Backtester(strategy, Broker(1_000_000)).run_array(prices, signals=signals)
+        np.testing.assert_array_equal(result, expected)
+        lazy = Backtester(strategy, Broker(1_000_000)).run_result(prices, signals=signals)
+        np.testing.assert_array_equal(lazy.to_array(), expected)
+
+    def test_signals_validated(self, prices):
+        """
+        Verify the engine rejects mismatched signals.
+
+        Expected: ValueError on a length mismatch
+        """
+        backtester = Backtester(VolatilityBreakoutStrategy(5), Broker(1_000_000))
+        with pytest.raises(ValueError):
+            backtester.run_array(prices, signals=np.zeros(3, dtype=np.int8))
@@ -0,0 +1,133 @@
+"""
+Unit tests for VolTargetSizer and sized backtests.
+
+Tests should verify:
+- Each sizing rule (vol target, fixed fraction, max notional) and their combination
+- Zero/undefined volatility gives no position
+- Backtester trades share targets and reuses the strategy's volatility
+"""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from backtester.sizing import VolTargetSizer
+from backtester.engine import Backtester
+from backtester.broker import Broker
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+class TestSizingRules:
+    """Test the array sizing rules."""
+
+    def test_default_is_one_share(self):
+        """
+        Verify that a sizer without rules keeps the ±1 behaviour.
+
+        Expected: targets == signals
+        """
+        signals = np.array([0, 1, -1, 1])
+        targets = VolTargetSizer().size(signals, np.full(4, 50.0), np.full(4, 0.01), 1_000)
+        np.testing.assert_array_equal(targets, signals)
+
+    def test_vol_target(self):
+        """
+        Verify shares = target_vol * capital / (vol * sqrt(252) * price).
+
+        Given: 10% target, $1M capital, 1% daily vol, $100 price
+        Expected: floor(0.10 * 1e6 / (0.01 * sqrt(252) * 100)) = 6299 shares
+        """
+        sizer = VolTargetSizer(target_vol=0.10)
+        targets = sizer.size(np.array([1, -1]), np.array([100.0, 100.0]), np.array([0.01, 0.01]), 1_000_000)
+        assert targets.tolist() == [6299, -6299]
+        assert targets.dtype == np.int64
+
+    def test_zero_vol_gives_no_position(self):
+        """
+        Verify warm-up bars (vol = 0) are not sized to infinity.
+
+        Expected: 0 shares
+        """
+        sizer = VolTargetSizer(target_vol=0.10)
+        assert sizer.size(np.array([1]), np.array([100.0]), np.array([0.0]), 1_000_000).tolist() == [0]
+
+    def test_fraction_and_notional_caps(self):
+        """
+        Verify the smallest of all rules wins.
+
+        Given: fraction 50% of $10k at $20 (250 shares), notional cap $3k (150 shares)
+        Expected: 150 shares
+        """
+        sizer = VolTargetSizer(fraction=0.5, max_notional=3_000, capital=10_000)
+        assert sizer.size(np.array([1]), np.array([20.0]), np.array([0.01]), capital=1).tolist() == [150]
+        both = VolTargetSizer(target_vol=0.10, fraction=0.01)
+        assert both.size(np.array([1]), np.array([100.0]), np.array([0.01]), 1_000_000).tolist() == [100]
+
+    def test_fraction_is_of_initial_capital(self, volatile_prices):
+        """
+        Verify fixed-fraction sizes use the starting cash, not current equity.
+
+        Given: fraction 10% of a $1M broker
+        Expected: every held position is floor($100k / signal-bar price)
+        in size, while the equity has moved away from $1M
+        """
+        prices = volatile_prices.to_numpy()
+        result = Backtester(VolatilityBreakoutStrategy(lookback=5), Broker(cash=1_000_000),
+                            sizer=VolTargetSizer(fraction=0.1)).run_array(prices)
+        held = np.flatnonzero(result['position'][1:]) + 1
+        assert len(held) > 0
+        expected = np.floor(100_000 / prices[held - 1]).astype(np.int64)
+        np.testing.assert_array_equal(np.abs(result['position'][held]), expected)
+        assert not np.allclose(result['equity'][held], 1_000_000)
+
+    def test_invalid_parameters_raise(self):
+        """
+        Verify non-positive parameters are rejected.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            VolTargetSizer(target_vol=0)
+        with pytest.raises(ValueError):
+            VolTargetSizer(max_notional=-1)
+
+
+class TestSizedBacktest:
+    """Test the sizer inside Backtester."""
+
+    def test_positions_follow_sized_targets(self, volatile_prices):
+        """
+        Verify positions equal the lagged sized targets.
+
+        Expected: position[t] == targets[t-1] for t >= 1
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        sizer = VolTargetSizer(fraction=0.01)
+        prices = volatile_prices.to_numpy()
+        result = Backtester(strategy, Broker(cash=1_000_000), sizer=sizer).run_array(prices)
+        signals, vol = strategy.signals_with_vol(prices)
+        targets = sizer.size(signals, prices, vol, 1_000_000)
+        np.testing.assert_array_equal(result['position'][1:], targets[:-1])
+        assert np.abs(result['position']).max() > 1
+
+    def test_dataframe_run_uses_sizer(self, volatile_prices):
+        """
+        Verify run() and run_array() agree when sizing.
+
+        Expected: identical position columns
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        sizer = VolTargetSizer(target_vol=0.2, max_notional=100_000)
+        frame = Backtester(strategy, Broker(cash=1_000_000), sizer=sizer).run(volatile_prices)
+        array = Backtester(strategy, Broker(cash=1_000_000), sizer=sizer).run_array(volatile_prices.to_numpy())
+        np.testing.assert_array_equal(frame['position'].to_numpy(), array['position'])
+
+    def test_volatility_is_not_recomputed(self, volatile_prices):
+        """
+        Verify sizing reuses the strategy's volatility (one rolling pass per run).
+
+        Expected: _volatility called exactly once
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        bt = Backtester(strategy, Broker(cash=1_000_000), sizer=VolTargetSizer(target_vol=0.1))
+        with patch.object(strategy, '_volatility', wraps=strategy._volatility) as spy:
+            bt.run_array(volatile_prices.to_numpy())
+        assert spy.call_count == 1
@@ -229,3 +229,84 @@ class TestDeterminism:
         # Hint: Use pd.Series.equals() or assert (s1 == s2).all()
         assert signals1.eq(signals2).all(), f"Expected signals to be equal, got {signals1} != {signals2}"
         # YOUR CODE ENDS HERE
+
+
+class TestArraySignals:
+    """Test the NumPy-native signals_array() entry point."""
+
+    def test_matches_pandas_signals(self, strategy, volatile_prices):
+        """
+        Verify that signals_array() agrees with signals() on the same data.
+
+        Expected: identical signal values
+        """
+        expected = strategy.signals(volatile_prices).to_numpy()
+        result = strategy.signals_array(volatile_prices.to_numpy())
+        np.testing.assert_array_equal(result, expected)
+
+    def test_returns_int8_ndarray(self, strategy, long_prices):
+        """
+        Verify output type and shape.
+
+        Expected: int8 ndarray with one signal per price
+        """
+        result = strategy.signals_array(long_prices.to_numpy())
+        assert isinstance(result, np.ndarray)
+        assert result.dtype == np.int8
+        assert result.shape == (len(long_prices),)
+
+    def test_public_returns_match_pct_change(self, volatile_prices):
+        """
+        Verify returns() is the pct_change().fillna(0) series, in the strategy dtype.
+
+        Expected: values match pandas; float32 strategy returns float32
+        """
+        expected = volatile_prices.pct_change().fillna(0).to_numpy()
+        np.testing.assert_allclose(VolatilityBreakoutStrategy().returns(volatile_prices.to_numpy()), expected)
+        fast = VolatilityBreakoutStrategy(dtype=np.float32)
+        assert fast.returns(volatile_prices.to_numpy()).dtype == np.float32
+
+    def test_two_dimensional_input_is_column_wise(self, short_lookback_strategy, volatile_prices, long_prices):
+        """
+        Verify that a (bars x series) array is processed column by column.
+
+        Expected: each column equals the 1-D result for that series
+        """
+        panel = np.column_stack([volatile_prices.to_numpy(), long_prices.to_numpy()[:50]])
+        result = short_lookback_strategy.signals_array(panel)
+        assert result.shape == panel.shape
+        for j in range(panel.shape[1]):
+            np.testing.assert_array_equal(result[:, j], short_lookback_strategy.signals_array(panel[:, j]))
+
+    def test_empty_prices_raises_error(self, strategy):
+        """
+        Verify that an empty array is rejected like an empty Series.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError, match="empty"):
+            strategy.signals_array(np.array([]))
+
+    def test_short_series_and_lookback_of_one(self, simple_prices):
+        """
+        Verify edge cases where the rolling window never fills or has one point.
+
+        Expected: same output as signals()
+        """
+        for lookback in (1, 50):
+            strategy = VolatilityBreakoutStrategy(lookback=lookback)
+            expected = strategy.signals(simple_prices).to_numpy()
+            np.testing.assert_array_equal(strategy.signals_array(simple_prices.to_numpy()), expected)
+
+    def test_float32_mode(self, volatile_prices):
+        """
+        Verify the opt-in float32 mode computes in float32 with the same signals.
+
+        Expected: float32 volatility, identical signals; other dtypes raise ValueError
+        """
+        prices = volatile_prices.to_numpy()
+        signals, vol = VolatilityBreakoutStrategy(lookback=5, dtype=np.float32).signals_with_vol(prices)
+        assert vol.dtype == np.float32
+        np.testing.assert_array_equal(signals, VolatilityBreakoutStrategy(lookback=5).signals_array(prices))
+        with pytest.raises(ValueError):
+            VolatilityBreakoutStrategy(dtype=np.int32)
@@ -0,0 +1,165 @@
+"""
+Unit tests for the int64 epoch TimeIndex.
+
+Tests should verify:
+- Construction from DatetimeIndex, datetime64, strings and int ns
+- Inclusive range slicing and date-to-bar mapping match pandas
+- Calendar alignment across several series
+- Round trip to a DatetimeIndex at the output boundary
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.timeindex import TimeIndex, align, take
+
+
+@pytest.fixture
+def business_days():
+    """A 2023 business-day calendar."""
+    return pd.bdate_range("2023-01-02", "2023-12-29")
+
+
+class TestConstruction:
+    """Test building a TimeIndex."""
+
+    def test_sources_agree(self, business_days):
+        """
+        Verify all supported inputs give the same int64 values.
+
+        Expected: DatetimeIndex, datetime64, strings and int ns are equal
+        """
+        ti = TimeIndex(business_days)
+        assert ti.values.dtype == np.int64
+        assert ti == TimeIndex(business_days.to_numpy())
+        assert ti == TimeIndex(business_days.strftime("%Y-%m-%d").to_numpy())
+        assert ti == TimeIndex(business_days.as_unit("ns").asi8)
+        assert ti == TimeIndex(ti)
+        assert ti != business_days
+
+    def test_tz_aware_is_utc(self):
+        """
+        Verify tz-aware times are stored in UTC and converted back on request.
+
+        Expected: values equal the UTC instants; to_datetimeindex(tz) round-trips
+        """
+        local = pd.date_range("2023-01-02 09:30", periods=3, freq="D", tz="America/New_York")
+        ti = TimeIndex(local)
+        np.testing.assert_array_equal(ti.values, local.tz_convert("UTC").as_unit("ns").asi8)
+        assert ti.to_datetimeindex(tz="America/New_York").equals(local)
+
+    def test_must_be_increasing(self):
+        """
+        Verify unsorted, duplicate or 2-D input raises ValueError.
+
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            TimeIndex([3, 1, 2])
+        with pytest.raises(ValueError):
+            TimeIndex([1, 1, 2])
+        with pytest.raises(ValueError):
+            TimeIndex(np.zeros((2, 2), dtype=np.int64))
+
+
+class TestLookups:
+    """Test slicing and date-to-bar mapping."""
+
+    def test_loc_matches_pandas(self, business_days):
+        """
+        Verify loc() selects the same bars as pandas label slicing.
+
+        Expected: same positions for on-calendar, off-calendar and open bounds
+        """
+        series = pd.Series(np.arange(len(business_days)), index=business_days)
+        ti = TimeIndex(business_days)
+        values = series.to_numpy()
+        for start, stop in [("2023-03-01", "2023-03-31"), ("2023-03-04", "2023-03-05"),
+                            (None, "2023-02-01"), ("2023-12-01", None), ("2024-01-01", "2024-02-01")]:
+            np.testing.assert_array_equal(values[ti.loc(start, stop)], series.loc[start:stop].to_numpy())
+
+    def test_bar_of_methods(self, business_days):
+        """
+        Verify exact, forward-fill and back-fill mapping on a weekend date.
+
+        Expected: Saturday -> -1 exact, Friday's bar ffill, Monday's bar bfill
+        """
+        ti = TimeIndex(business_days)
+        friday = ti.bar_of("2023-01-06")
+        assert ti.bar_of("2023-01-07") == -1
+        assert ti.bar_of("2023-01-07", method="ffill") == friday
+        assert ti.bar_of("2023-01-07", method="bfill") == friday + 1
+        assert ti.bar_of("2022-12-01", method="ffill") == -1
+        assert ti.bar_of("2024-06-01", method="bfill") == -1
+        assert ti.bar_of("2024-06-01") == -1
+        np.testing.assert_array_equal(ti.bar_of(business_days[[5, 10]]), [5, 10])
+        with pytest.raises(ValueError):
+            ti.bar_of("2023-01-06", method="nearest")
+
+    def test_slicing_returns_views(self, business_days):
+        """
+        Verify slicing shares memory and integer indexing returns ns.
+
+        Expected: slice is a TimeIndex view; ti[0] is the first timestamp
+        """
+        ti = TimeIndex(business_days)
+        part = ti[ti.loc("2023-06-01", "2023-06-30")]
+        assert isinstance(part, TimeIndex)
+        assert np.shares_memory(part.values, ti.values)
+        assert ti[0] == business_days[0].value
+        assert len(part) == 22
+
+
+class TestAlign:
+    """Test calendar alignment."""
+
+    def test_inner_and_outer(self):
+        """
+        Verify inner keeps common times and outer the union, with -1 for gaps.
+
+        Expected: inner [2, 3]; outer [1, 2, 3, 4] with per-input positions
+        """
+        a, b = TimeIndex([1, 2, 3]), TimeIndex([2, 3, 4])
+        common, (pa, pb) = align([a, b])
+        np.testing.assert_array_equal(common.values, [2, 3])
+        np.testing.assert_array_equal(pa, [1, 2])
+        np.testing.assert_array_equal(pb, [0, 1])
+        union, (pa, pb) = align([a, b], how="outer")
+        np.testing.assert_array_equal(union.values, [1, 2, 3, 4])
+        np.testing.assert_array_equal(pa, [0, 1, 2, -1])
+        np.testing.assert_array_equal(take(np.array([10.0, 20.0, 30.0]), pa), [10.0, 20.0, 30.0, np.nan])
+        np.testing.assert_array_equal(take(np.array([7, 8, 9]), pb, fill=0), [0, 7, 8, 9])
+        with pytest.raises(ValueError):
+            align([a, b], how="left")
+        with pytest.raises(ValueError):
+            align([])
+
+    def test_matches_pandas_join(self, business_days):
+        """
+        Verify inner alignment of two irregular calendars matches pandas.
+
+        Expected: same dates as DataFrame inner concat
+        """
+        rng = np.random.default_rng(0)
+        a = business_days[rng.random(len(business_days)) < 0.8]
+        b = business_days[rng.random(len(business_days)) < 0.8]
+        common, _ = align([TimeIndex(a), TimeIndex(b)])
+        assert common.to_datetimeindex().equals(a.intersection(b))
+
+
+class TestEngineBoundary:
+    """Test TimeIndex with Backtester.run_array."""
+
+    def test_timestamps_from_index(self, strategy, business_days):
+        """
+        Verify a TimeIndex slice can be passed as run_array timestamps.
+
+        Expected: the output timestamps convert back to the sliced dates
+        """
+        ti = TimeIndex(business_days)
+        prices = np.linspace(100, 120, len(ti))
+        window = ti.loc("2023-02-01", "2023-04-28")
+        result = Backtester(strategy, Broker(1_000_000)).run_array(prices[window], timestamps=ti[window])
+        dates = TimeIndex(result['timestamp']).to_datetimeindex()
+        assert dates.equals(business_days[(business_days >= "2023-02-01") & (business_days <= "2023-04-28")])
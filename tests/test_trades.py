@@ -0,0 +1,144 @@
+"""
+Unit tests for round-trip trade extraction.
+
+Tests should verify:
+- Entries, exits, flips and open trades are found at the right bars
+- P&L (with scaling in/out), MAE and MFE match a bar-by-bar walk
+- Trade P&L adds up to the backtest's equity change
+- Panels of runs and per-run summaries
+"""
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.strategy import VolatilityBreakoutStrategy
+from backtester.trades import extract_trades, summarize
+
+
+def walk_trades(positions, prices):
+    """Reference: walk the bars one at a time and collect (entry, exit, pnl, mae, mfe, size)."""
+    trades, current = [], None
+    for t in range(len(positions)):
+        if current is not None:
+            current['pnl'] += positions[t - 1] * (prices[t] - prices[t - 1])
+            current['mae'] = min(current['mae'], current['pnl'])
+            current['mfe'] = max(current['mfe'], current['pnl'])
+            if np.sign(positions[t]) != current['side']:
+                trades.append((current['entry'], t, current['pnl'], current['mae'], current['mfe'], current['size']))
+                current = None
+            else:
+                current['size'] = max(current['size'], abs(positions[t]))
+        if current is None and positions[t] != 0:
+            current = {'entry': t, 'side': np.sign(positions[t]), 'pnl': 0.0, 'mae': 0.0, 'mfe': 0.0,
+                       'size': abs(positions[t])}
+    if current is not None:
+        trades.append((current['entry'], len(positions) - 1, current['pnl'], current['mae'], current['mfe'],
+                       current['size']))
+    return trades
+
+
+class TestExtractTrades:
+    """Test trade reconstruction on single runs."""
+
+    def test_entries_exits_and_flip(self):
+        """
+        Verify a long, a direct flip to short, and a scaled-in open long.
+
+        Expected: three trades with entry/exit bars (1,3), (3,5), (6,8); last one open
+        """
+        positions = np.array([0, 1, 1, -1, -1, 0, 2, 3, 3])
+        prices = np.array([10, 11, 12, 11, 9, 10, 10, 12, 11.0])
+        trades = extract_trades(positions, prices)
+        assert trades['entry_bar'].tolist() == [1, 3, 6]
+        assert trades['exit_bar'].tolist() == [3, 5, 8]
+        assert trades['side'].tolist() == [1, -1, 1]
+        assert trades['open'].tolist() == [False, False, True]
+        assert trades['pnl'].tolist() == [0.0, 1.0, 1.0]
+        assert trades['size'].tolist() == [1, 1, 3]
+        assert trades['mfe'].tolist() == [1.0, 2.0, 4.0]
+        assert trades['entry_price'].tolist() == [11.0, 11.0, 10.0]
+        assert trades['exit_price'].tolist() == [11.0, 10.0, 11.0]
+
+    def test_matches_walk(self):
+        """
+        Verify extraction matches a bar-by-bar walk on random position paths.
+
+        Expected: identical bars and sizes; P&L, MAE and MFE within float tolerance
+        """
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            positions = np.cumsum(rng.integers(-2, 3, 200) * (rng.random(200) < 0.3))
+            prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 200)))
+            trades = extract_trades(positions, prices)
+            expected = walk_trades(positions, prices)
+            assert len(trades) == len(expected)
+            for trade, (entry, exit_, pnl, mae, mfe, size) in zip(trades, expected):
+                assert (trade['entry_bar'], trade['exit_bar'], trade['size']) == (entry, exit_, size)
+                assert trade['pnl'] == pytest.approx(pnl)
+                assert trade['mae'] == pytest.approx(mae)
+                assert trade['mfe'] == pytest.approx(mfe)
+
+    def test_pnl_adds_up_to_equity(self, volatile_prices):
+        """
+        Verify the trades' P&L sums to the backtest's equity change.
+
+        Expected: sum of pnl == final equity - initial equity
+        """
+        prices = volatile_prices.to_numpy()
+        result = Backtester(VolatilityBreakoutStrategy(lookback=5), Broker()).run_array(prices)
+        trades = extract_trades(result['position'], prices)
+        assert len(trades) > 0
+        assert trades['pnl'].sum() == pytest.approx(result['equity'][-1] - result['equity'][0])
+
+    def test_no_trades(self):
+        """
+        Verify flat or empty inputs give no trades, and bad shapes raise.
+
+        Expected: empty arrays; ValueError on mismatched lengths
+        """
+        assert len(extract_trades(np.zeros(10, dtype=int), np.ones(10))) == 0
+        assert len(extract_trades(np.zeros(0, dtype=int), np.ones(0))) == 0
+        with pytest.raises(ValueError):
+            extract_trades(np.zeros(10, dtype=int), np.ones(9))
+        with pytest.raises(ValueError):
+            extract_trades(np.zeros((10, 2), dtype=int), np.ones((10, 3)))
+
+
+class TestPanel:
+    """Test sweep panels and summaries."""
+
+    def test_panel_matches_columns(self):
+        """
+        Verify a (bars x runs) panel gives each column's trades, tagged by run.
+
+        Expected: panel trades of run j equal extract_trades on column j alone
+        """
+        rng = np.random.default_rng(1)
+        positions = np.cumsum(rng.integers(-1, 2, (300, 8)) * (rng.random((300, 8)) < 0.2), axis=0)
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+        trades = extract_trades(positions, prices)
+        assert np.all(np.diff(trades['run']) >= 0)
+        for j in range(8):
+            single = extract_trades(positions[:, j], prices)
+            np.testing.assert_array_equal(trades[trades['run'] == j][['entry_bar', 'exit_bar', 'size']],
+                                          single[['entry_bar', 'exit_bar', 'size']])
+            np.testing.assert_allclose(trades[trades['run'] == j]['pnl'], single['pnl'])
+
+    def test_summarize(self):
+        """
+        Verify per-run statistics, including a run without trades.
+
+        Expected: run 0 has 3 trades, 2 winners, profit factor inf; run 1 has none
+        """
+        positions = np.array([0, 1, 1, -1, -1, 0, 2, 3, 3])
+        prices = np.array([10, 11, 12, 11, 9, 10, 10, 12, 11.0])
+        panel = np.column_stack([positions, np.zeros_like(positions)])
+        summary = summarize(extract_trades(panel, prices), runs=2)
+        assert summary.loc[0, 'trades'] == 3
+        assert summary.loc[0, 'win_rate'] == pytest.approx(2 / 3)
+        assert summary.loc[0, 'total_pnl'] == 2.0
+        assert summary.loc[0, 'profit_factor'] == np.inf
+        assert summary.loc[0, 'max_mfe'] == 4.0
+        assert summary.loc[1, 'trades'] == 0
+        assert np.isnan(summary.loc[1, 'win_rate'])
+        assert len(summarize(extract_trades(np.zeros(5, dtype=int), np.ones(5)))) == 0
@@ -0,0 +1,161 @@
+"""
+Unit tests for UniverseBacktester and SignalEvents.
+
+Tests should verify:
+- Single-symbol universe reproduces Backtester exactly
+- Sparse events only record bars/symbols where the position changes
+- Shared cash account and equity across symbols
+- Validation (shape, empty input, insufficient cash)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.universe import SignalEvents, UniverseBacktester
+from backtester.engine import Backtester
+from backtester.broker import Broker
+from backtester.strategy import VolatilityBreakoutStrategy
+
+
+@pytest.fixture
+def panel():
+    """
+    A seeded (60 bars x 4 symbols) random-walk price panel.
+
+    Returns:
+        pd.DataFrame: one column per symbol
+    """
+    np.random.seed(3)
+    returns = np.random.normal(0, 0.02, (60, 4))
+    return pd.DataFrame(
+        100 * np.exp(np.cumsum(returns, axis=0)),
+        index=pd.date_range('2023-01-01', periods=60),
+        columns=['A', 'B', 'C', 'D'],
+    )
+
+
+class TestSignalEvents:
+    """Test the CSR-like event index."""
+
+    def test_only_changes_are_stored(self):
+        """
+        Verify that unchanged targets produce no events.
+
+        Given: targets for 2 symbols where only a few entries change
+        Expected: 3 events at the expected bars, with signed quantities
+        """
+        targets = np.array([[0, 0], [1, 0], [1, 0], [1, -1], [0, -1]])
+        events = SignalEvents.from_targets(targets)
+        assert len(events) == 3
+        np.testing.assert_array_equal(events.indptr, [0, 0, 1, 1, 2, 3])
+        symbols, qty = events.at(3)
+        assert symbols.tolist() == [1] and qty.tolist() == [-1]
+        np.testing.assert_array_equal(events.bars, [1, 3, 4])
+
+    def test_positions_round_trip(self):
+        """
+        Verify that densifying the events recovers the target matrix.
+
+        Expected: events.positions() == targets
+        """
+        np.random.seed(0)
+        targets = np.random.randint(-1, 2, size=(30, 5))
+        events = SignalEvents.from_targets(targets)
+        np.testing.assert_array_equal(events.positions(), targets)
+
+
+class TestUniverseRun:
+    """Test the universe runner."""
+
+    def test_single_symbol_matches_backtester(self, panel):
+        """
+        Verify that a one-column universe is bit-identical to Backtester.
+
+        Expected: equal equity and cash arrays
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        prices = panel['A'].to_numpy()
+        expected = Backtester(strategy, Broker(cash=10_000)).run_array(prices)
+        result = UniverseBacktester(strategy, cash=10_000).run_array(prices[:, None])
+        np.testing.assert_array_equal(result['equity'], expected['equity'])
+        np.testing.assert_array_equal(result['cash'], expected['cash'])
+
+    def test_equity_is_sum_of_independent_books(self, panel):
+        """
+        Verify that the shared account equals the sum of per-symbol P&L.
+
+        Expected: universe equity - start == sum over symbols of (equity - start)
+        """
+        strategy = VolatilityBreakoutStrategy(lookback=5)
+        result = UniverseBacktester(strategy, cash=10_000).run(panel)
+        pnl = sum(
+            Backtester(strategy, Broker(cash=10_000)).run(panel[col])['equity'] - 10_000
+            for col in panel.columns
+        )
+        np.testing.assert_allclose(result['equity'] - 10_000, pnl, atol=1e-9)
+        assert list(result.columns) == ['equity', 'cash']
+        assert result.index.equals(panel.index)
+
+    def test_precomputed_signals_and_events(self, panel):
+        """
+        Verify that explicit signals drive trades on the following bar.
+
+        Given: symbol 0 goes long on bar 1, symbol 1 short on bar 2
+        Expected: events at bars 2 and 3, equity marked at each bar
+        """
+        prices = panel.to_numpy()[:5, :2]
+        signals = np.zeros((5, 2), dtype=np.int8)
+        signals[1:, 0] = 1
+        signals[2:, 1] = -1
+        ub = UniverseBacktester(strategy=None, cash=1_000)
+        result = ub.run_array(prices, signals)
+        assert ub.events.bars.tolist() == [2, 3]
+        expected_cash = 1_000 - prices[2, 0] + prices[3, 1]
+        assert result['cash'][-1] == pytest.approx(expected_cash)
+        assert result['equity'][-1] == pytest.approx(expected_cash + prices[4, 0] - prices[4, 1])
+
+    def test_insufficient_cash_raises(self, panel):
+        """
+        Verify the Broker cash rule on BUYs across the whole universe.
+
+        Expected: ValueError about insufficient cash
+        """
+        signals = np.ones(panel.shape, dtype=np.int8)
+        with pytest.raises(ValueError, match="Insufficient"):
+            UniverseBacktester(strategy=None, cash=150).run_array(panel.to_numpy(), signals)
+
+    def test_invalid_inputs_raise(self):
+        """
+        Verify shape and emptiness checks.
+
+        Expected: ValueError for 1-D and empty inputs
+        """
+        ub = UniverseBacktester(VolatilityBreakoutStrategy())
+        with pytest.raises(ValueError):
+            ub.run_array(np.ones(5))
+        with pytest.raises(ValueError):
+            ub.run_array(np.ones((0, 3)))
+
+    def test_non_finite_prices_raise(self, panel):
+        """
+        Verify a NaN price is rejected instead of turning cash into NaN.
+
+        Expected: ValueError about finite prices
+        """
+        prices = panel.to_numpy().copy()
+        prices[10, 2] = np.nan
+        signals = np.ones(prices.shape, dtype=np.int8)
+        with pytest.raises(ValueError, match="finite"):
+            UniverseBacktester(strategy=None).run_array(prices, signals)
+
+    def test_sells_fund_same_bar_buys(self):
+        """
+        Verify the sells on a bar execute before its buys.
+
+        Expected: a buy costing more than the spare cash passes when the
+        same bar's sell covers it
+        """
+        prices = np.full((4, 2), 100.0)
+        signals = np.array([[1, 0], [0, 1], [0, 1], [0, 1]], dtype=np.int8)
+        result = UniverseBacktester(strategy=None, cash=150).run_array(prices, signals)
+        assert result['cash'][-1] == pytest.approx(50)
+        assert result['equity'][-1] == pytest.approx(150)